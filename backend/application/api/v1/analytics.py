@@ -0,0 +1,100 @@
+import uuid
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.database.session import get_db
+from infrastructure.database.repositories.field_rollup_repo import field_rollup_repo
+from application.schemas.analytics import FieldRollupRead, FieldRollupSummary
+from domain.exceptions import ValidationError
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Rango por defecto y máximo de las consultas (días)
+DEFAULT_RANGE_DAYS = 30
+MAX_RANGE_DAYS = 3660
+
+
+def _date_range(
+    date_from: Optional[date], date_to: Optional[date]
+) -> Tuple[date, date]:
+    date_to = date_to or datetime.now(timezone.utc).date()
+    date_from = date_from or date_to - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if date_from > date_to:
+        raise ValidationError("date_from must be on or before date_to.")
+    if (date_to - date_from).days >= MAX_RANGE_DAYS:
+        raise ValidationError(f"Date range cannot exceed {MAX_RANGE_DAYS} days.")
+    return date_from, date_to
+
+
+@router.get("/fields", response_model=List[FieldRollupRead])
+async def read_field_rollups(
+    db: AsyncSession = Depends(get_db),
+    config_id: Optional[uuid.UUID] = None,
+    site_name: Optional[str] = None,
+    field: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+):
+    """
+    Serie diaria de matches por campo y config (site_name), leída de los agregados
+    de field_rollup. Por defecto, los últimos 30 días.
+
+    Solo cuenta extracciones de contenido nuevo: las páginas que no cambiaron
+    (304 o mismo content_hash) no se vuelven a extraer y no suman matches.
+    """
+    date_from, date_to = _date_range(date_from, date_to)
+    logger.info(
+        "Received request for field rollups (config_id=%s, site_name=%s, field=%s, "
+        "%s..%s)",
+        config_id,
+        site_name,
+        field,
+        date_from,
+        date_to,
+    )
+    return await field_rollup_repo.get_daily(
+        db,
+        date_from=date_from,
+        date_to=date_to,
+        config_id=config_id,
+        site_name=site_name,
+        field=field,
+    )
+
+
+@router.get("/fields/summary", response_model=List[FieldRollupSummary])
+async def read_field_rollup_summary(
+    db: AsyncSession = Depends(get_db),
+    config_id: Optional[uuid.UUID] = None,
+    site_name: Optional[str] = None,
+    field: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+):
+    """
+    Totales por campo y config en el rango (por defecto, los últimos 30 días).
+    Como /fields, no incluye las páginas sin cambios.
+    """
+    date_from, date_to = _date_range(date_from, date_to)
+    logger.info(
+        "Received request for field rollup summary (config_id=%s, site_name=%s, "
+        "field=%s, %s..%s)",
+        config_id,
+        site_name,
+        field,
+        date_from,
+        date_to,
+    )
+    return await field_rollup_repo.get_totals(
+        db,
+        date_from=date_from,
+        date_to=date_to,
+        config_id=config_id,
+        site_name=site_name,
+        field=field,
+    )
@@ -1,49 +1,85 @@
 import uuid
 import logging
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from infrastructure.database.session import get_db
+from infrastructure.database.repositories.base_repo import MAX_PAGE_SIZE
 from infrastructure.database.repositories.config_repo import config_repo
-from application.schemas.config import ConfigCreate, ConfigRead, ConfigUpdate
+from application.schemas.config import (
+    ConfigCreate,
+    ConfigRead,
+    ConfigUpdate,
+    PolitenessSettings,
+)
+from application.schemas.pagination import Page
+from application.services.export import NDJSON_MEDIA_TYPE, export_ndjson
+from application.services.json_response import OrjsonResponse
 from domain.exceptions import ResourceNotFound
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# politeness se guarda sin los campos nulos; ConfigRead los devuelve como null
+_POLITENESS_FIELDS = dict.fromkeys(PolitenessSettings.model_fields)
+
 
 @router.post("/", response_model=ConfigRead, status_code=status.HTTP_201_CREATED)
 async def create_scrape_config(
     *, db: AsyncSession = Depends(get_db), config_in: ConfigCreate
 ):
     """Crea una nueva configuración de scraping."""
-    logger.info(f"Received request to create config: {config_in.site_name}")
+    logger.info("Received request to create config: %s", config_in.site_name)
     created_config = await config_repo.create(db=db, obj_in=config_in)
     return created_config
 
 
+@router.get("/export")
+async def export_scrape_configs(site_name: Optional[str] = None):
+    """Exporta todas las configuraciones como NDJSON en streaming."""
+    logger.info("Received request to export configs (site_name=%s)", site_name)
+    return StreamingResponse(
+        export_ndjson(config_repo, ConfigRead, {"site_name": site_name}),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
 @router.get("/{config_id}", response_model=ConfigRead)
 async def read_scrape_config(config_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
     """Obtiene una configuración por su ID."""
-    logger.info(f"Received request to read config with ID: {config_id}")
+    logger.info("Received request to read config with ID: %s", config_id)
     try:
         db_config = await config_repo.get_or_404(db=db, id=config_id)
         return db_config
     except ResourceNotFound as e:
-        logger.warning(f"Config not found: {e}")
+        logger.warning("Config not found: %s", e)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
 
-@router.get("/", response_model=List[ConfigRead])
+@router.get("/", response_model=Page[ConfigRead])
 async def read_scrape_configs(
-    db: AsyncSession = Depends(get_db), skip: int = 0, limit: int = 100
+    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
 ):
-    """Obtiene una lista de configuraciones."""
-    logger.info(f"Received request to read configs list (skip={skip}, limit={limit})")
-    configs = await config_repo.get_multi(db=db, skip=skip, limit=limit)
-    return configs
+    """
+    Obtiene una página de configuraciones, ordenadas por (created_at, id).
+    Para la página siguiente, enviar el `next_cursor` recibido como `cursor`.
+    """
+    logger.info(
+        "Received request to read configs list (cursor=%s, limit=%s)", cursor, limit
+    )
+    # Filas planas directas a orjson: sin objetos ORM ni revalidación con ConfigRead
+    configs, next_cursor = await config_repo.get_page_rows(
+        db=db, schema=ConfigRead, cursor=cursor, limit=limit
+    )
+    for config in configs:
+        if config["politeness"] is not None:
+            config["politeness"] = {**_POLITENESS_FIELDS, **config["politeness"]}
+    return OrjsonResponse({"items": configs, "next_cursor": next_cursor})
 
 
 @router.put("/{config_id}", response_model=ConfigRead)
@@ -51,15 +87,18 @@ async def update_scrape_config(
     config_id: uuid.UUID, *, db: AsyncSession = Depends(get_db), config_in: ConfigUpdate
 ):
     """Actualiza una configuración existente."""
-    logger.info(f"Received request to update config with ID: {config_id}")
+    logger.info("Received request to update config with ID: %s", config_id)
     try:
-        db_config = await config_repo.get_or_404(db=db, id=config_id)
+        # Sin caché: el objeto se modifica y se vincula a esta sesión
+        db_config = await config_repo.get_or_404(db=db, id=config_id, use_cache=False)
         updated_config = await config_repo.update(
             db=db, db_obj=db_config, obj_in=config_in
         )
+        # Los selectores compilados se cachean por (id, updated_at) en los procesos
+        # de extracción: la nueva versión deja de coincidir sin invalidar nada aquí
         return updated_config
     except ResourceNotFound as e:
-        logger.warning(f"Config not found for update: {e}")
+        logger.warning("Config not found for update: %s", e)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
 
@@ -68,12 +107,12 @@ async def delete_scrape_config(
     config_id: uuid.UUID, db: AsyncSession = Depends(get_db)
 ):
     """Elimina una configuración."""
-    logger.info(f"Received request to delete config with ID: {config_id}")
+    logger.info("Received request to delete config with ID: %s", config_id)
     try:
         # Usamos get_or_404 para asegurar que existe antes de intentar borrar
-        await config_repo.get_or_404(db=db, id=config_id)
+        await config_repo.get_or_404(db=db, id=config_id, use_cache=False)
         await config_repo.remove(db=db, id=config_id)
         # No retornamos contenido en un 204
     except ResourceNotFound as e:
-        logger.warning(f"Config not found for delete: {e}")
+        logger.warning("Config not found for delete: %s", e)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
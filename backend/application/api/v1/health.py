@@ -0,0 +1,27 @@
+import logging
+from fastapi import APIRouter
+
+from infrastructure.database.pool import pool_status
+from infrastructure.database.session import async_engine
+from infrastructure.database.statement_cache import statement_cache_status
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.get("/db-pool")
+async def read_db_pool_status():
+    """
+    Estado del pool de conexiones de este proceso: conexiones en uso, overflow,
+    histograma de espera en checkout y fallos de pre-ping / health check.
+    """
+    return pool_status(async_engine)
+
+
+@router.get("/db-statements")
+async def read_db_statement_cache_status():
+    """
+    Aciertos de las cachés de sentencias de este proceso: SQL compilado por
+    SQLAlchemy y sentencias preparadas por asyncpg en cada conexión.
+    """
+    return statement_cache_status()
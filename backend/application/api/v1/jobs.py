@@ -1,12 +1,19 @@
 import uuid
 import logging
-from fastapi import APIRouter, Depends, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from infrastructure.database.session import get_db
-from infrastructure.database.repositories.url_repo import url_repo
-from application.schemas.url import UrlCreate, UrlRead
+from infrastructure.database.repositories.base_repo import MAX_PAGE_SIZE
+from infrastructure.database.repositories.url_repo import FINISHED_STATUSES, url_repo
+from application.schemas.pagination import Page
+from application.schemas.url import UrlBulkResult, UrlCreate, UrlRead
+from application.services.export import NDJSON_MEDIA_TYPE, export_ndjson
+from application.services.json_response import OrjsonResponse
+from application.services.url_ingestion import ingest_urls
 
 
 logger = logging.getLogger(__name__)
@@ -19,20 +26,95 @@ async def create_scrape_url(*, db: AsyncSession = Depends(get_db), url_in: UrlCr
     """
     Crea una nueva URL para scrapear.
 
+    La URL se guarda tal como llega (sin fragmento); si su forma normalizada ya
+    existe para la misma config se devuelve la fila existente (con la prioridad
+    elevada si la nueva es mayor) en lugar de encolarla de nuevo.
+
     Puede lanzar errores:
     - 422 Unprocessable Entity: Si los datos de entrada no son válidos.
     - 503 Service Unavailable: Si hay un error de base de datos al crear.
     - 500 Internal Server Error: Para otros errores inesperados.
     """
-    logger.info(f"Received request to create URL: {url_in.url}")
+    logger.info("Received request to create URL: %s", url_in.url)
     created_url = await url_repo.create(db=db, obj_in=url_in)
     return created_url
 
 
+@router.post(
+    "/urls/bulk", response_model=UrlBulkResult, status_code=status.HTTP_201_CREATED
+)
+async def create_scrape_urls_bulk(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Crea muchas URLs en una sola transacción mediante INSERTs multi-fila.
+
+    El cuerpo puede ser una lista JSON (application/json), un objeto por línea
+    (application/x-ndjson) o un CSV con cabecera (text/csv); los dos últimos se
+    procesan en streaming. Cada fila se valida como UrlCreate: las inválidas se
+    devuelven en `errors` con su índice y no abortan el resto del lote.
+
+    Puede lanzar errores:
+    - 422 Unprocessable Entity: Si el cuerpo no tiene un formato soportado.
+    - 503 Service Unavailable: Si hay un error de base de datos al insertar.
+    """
+    logger.info("Received request to bulk create URLs")
+    return await ingest_urls(db, request)
+
+
+@router.get("/urls/", response_model=Page[UrlRead])
+async def read_scrape_urls(
+    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+):
+    """Obtiene una página de URLs, ordenadas por (created_at, id)."""
+    logger.info(
+        "Received request to read URLs list (cursor=%s, limit=%s)", cursor, limit
+    )
+    urls, next_cursor = await url_repo.get_page_rows(
+        db=db, schema=UrlRead, cursor=cursor, limit=limit
+    )
+    return OrjsonResponse({"items": urls, "next_cursor": next_cursor})
+
+
+@router.get("/urls/export")
+async def export_scrape_urls(
+    status: Optional[str] = None,
+    job_id: Optional[uuid.UUID] = None,
+    config_id: Optional[uuid.UUID] = None,
+):
+    """Exporta las URLs (filtradas por status, job_id y/o config_id) como NDJSON en streaming."""
+    logger.info(
+        "Received request to export URLs (status=%s, job_id=%s, config_id=%s)",
+        status,
+        job_id,
+        config_id,
+    )
+    filters = {"status": status, "job_id": job_id, "config_id": config_id}
+    return StreamingResponse(
+        export_ndjson(url_repo, UrlRead, filters), media_type=NDJSON_MEDIA_TYPE
+    )
+
+
 @router.get("/urls/{url_id}", response_model=UrlRead)
 async def read_scrape_url(url_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
-    logger.info(f"Received request to read URL with ID: {url_id}")
+    logger.info("Received request to read URL with ID: %s", url_id)
     # Usa get_or_404 para que lance ResourceNotFound si no existe,
     # el manejador global lo convertirá en un 404 Not Found.
+    db_url = await url_repo.get_row_or_404(db=db, id=url_id, schema=UrlRead)
+    return OrjsonResponse(db_url)
+
+
+@router.post("/urls/{url_id}/retry", response_model=UrlRead)
+async def retry_scrape_url(url_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """
+    Vuelve a encolar una URL terminada (p. ej. en 'dead_letter') con el contador
+    de intentos a cero. 409 si la URL sigue en cola, en curso o esperando reintento.
+    """
+    logger.info("Received request to retry URL with ID: %s", url_id)
     db_url = await url_repo.get_or_404(db=db, id=url_id)
-    return db_url
+    if db_url.status not in FINISHED_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"URL {url_id} is not finished (status '{db_url.status}')",
+        )
+    return await url_repo.update(db=db, db_obj=db_url, obj_in={"status": "pending"})
@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def read_metrics():
+    """Métricas del proceso en formato de texto de Prometheus."""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
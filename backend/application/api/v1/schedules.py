@@ -0,0 +1,91 @@
+import uuid
+import logging
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.database.session import get_db
+from infrastructure.database.repositories.base_repo import MAX_PAGE_SIZE
+from infrastructure.database.repositories.schedule_repo import schedule_repo
+from application.schemas.pagination import Page
+from application.schemas.schedule import ScheduleCreate, ScheduleRead, ScheduleUpdate
+from domain.exceptions import ResourceNotFound
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.post("/", response_model=ScheduleRead, status_code=status.HTTP_201_CREATED)
+async def create_schedule(
+    *, db: AsyncSession = Depends(get_db), schedule_in: ScheduleCreate
+):
+    """
+    Crea una programación. El scheduler (python -m worker.scheduler) la recibe por
+    NOTIFY y, en cada disparo, crea un job con sus URLs.
+    """
+    logger.info(
+        "Received request to create schedule %s with %s URLs",
+        schedule_in.name,
+        len(schedule_in.urls),
+    )
+    return await schedule_repo.create(db=db, obj_in=schedule_in)
+
+
+@router.get("/", response_model=Page[ScheduleRead])
+async def read_schedules(
+    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+):
+    """Obtiene una página de programaciones, ordenadas por (created_at, id)."""
+    logger.info(
+        "Received request to read schedules list (cursor=%s, limit=%s)", cursor, limit
+    )
+    schedules, next_cursor = await schedule_repo.get_page(
+        db=db, cursor=cursor, limit=limit
+    )
+    return Page[ScheduleRead](items=schedules, next_cursor=next_cursor)
+
+
+@router.get("/{schedule_id}", response_model=ScheduleRead)
+async def read_schedule(schedule_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """Obtiene una programación por su ID."""
+    logger.info("Received request to read schedule with ID: %s", schedule_id)
+    try:
+        return await schedule_repo.get_or_404(db=db, id=schedule_id)
+    except ResourceNotFound as e:
+        logger.warning("Schedule not found: %s", e)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.put("/{schedule_id}", response_model=ScheduleRead)
+async def update_schedule(
+    schedule_id: uuid.UUID,
+    *,
+    db: AsyncSession = Depends(get_db),
+    schedule_in: ScheduleUpdate,
+):
+    """
+    Actualiza una programación. Si cambia la recurrencia (cron, intervalo o zona
+    horaria) se recalcula el próximo disparo, salvo que se indique scheduled_at.
+    """
+    logger.info("Received request to update schedule with ID: %s", schedule_id)
+    try:
+        db_schedule = await schedule_repo.get_or_404(db=db, id=schedule_id)
+        return await schedule_repo.update(db=db, db_obj=db_schedule, obj_in=schedule_in)
+    except ResourceNotFound as e:
+        logger.warning("Schedule not found for update: %s", e)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.delete("/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_schedule(schedule_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """Elimina una programación; sus jobs se conservan con schedule_id a NULL."""
+    logger.info("Received request to delete schedule with ID: %s", schedule_id)
+    try:
+        await schedule_repo.get_or_404(db=db, id=schedule_id)
+        await schedule_repo.remove(db=db, id=schedule_id)
+    except ResourceNotFound as e:
+        logger.warning("Schedule not found for delete: %s", e)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
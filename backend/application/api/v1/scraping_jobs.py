@@ -1,13 +1,23 @@
 import uuid
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from infrastructure.database.session import get_db
+from infrastructure.database.session import AsyncSessionFactory, get_db
+from infrastructure.database.repositories.base_repo import MAX_PAGE_SIZE
 from infrastructure.database.repositories.job_repo import job_repo
+from infrastructure.database.repositories.url_repo import url_repo
+from infrastructure.database.unit_of_work import unit_of_work
 from application.schemas.job import JobCreate, JobRead
-from domain.exceptions import ResourceNotFound
+from application.schemas.pagination import Page
+from application.services.export import NDJSON_MEDIA_TYPE, export_ndjson
+from application.services.json_response import OrjsonResponse
+from application.services.job_progress import SSE_MEDIA_TYPE, job_progress_events
+from infrastructure.config.settings import settings
+from domain.exceptions import OperationError, ResourceNotFound
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -15,19 +25,111 @@ router = APIRouter()
 
 @router.post("/", response_model=JobRead, status_code=status.HTTP_201_CREATED)
 async def create_scraping_job(*, db: AsyncSession = Depends(get_db), job_in: JobCreate):
-    """Crea un nuevo trabajo de scraping."""
-    logger.info(f"Received request to create job")
-    created_job = await job_repo.create(db=db, obj_in=job_in)
+    """
+    Crea un nuevo trabajo de scraping y, opcionalmente, encola sus URLs.
+    El job y todas sus URLs se escriben en una única transacción.
+    """
+    logger.info("Received request to create job with %s URLs", len(job_in.urls))
+    async with unit_of_work(db):
+        job_data = job_in.model_dump(exclude={"urls"})
+        job_data["total_urls"] = len(job_in.urls)
+        created_job = await job_repo.create(db=db, obj_in=job_data)
+        if job_in.urls:
+            result = await url_repo.create_bulk(
+                db,
+                objs_in=[
+                    url_in.model_copy(update={"job_id": created_job.id})
+                    for url_in in job_in.urls
+                ],
+                count_in_jobs=False,
+            )
+            if result.duplicates:
+                # Las URLs ya encoladas para su config no forman parte de este job
+                created_job = await job_repo.update(
+                    db, db_obj=created_job, obj_in={"total_urls": result.inserted}
+                )
     return created_job
 
 
+@router.get("/", response_model=Page[JobRead])
+async def read_scraping_jobs(
+    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+):
+    """Obtiene una página de trabajos, ordenados por (started_at, id)."""
+    logger.info(
+        "Received request to read jobs list (cursor=%s, limit=%s)", cursor, limit
+    )
+    jobs, next_cursor = await job_repo.get_page_rows(
+        db=db, schema=JobRead, cursor=cursor, limit=limit
+    )
+    return OrjsonResponse({"items": jobs, "next_cursor": next_cursor})
+
+
+@router.get("/export")
+async def export_scraping_jobs(status: Optional[str] = None):
+    """Exporta todos los trabajos como NDJSON en streaming."""
+    logger.info("Received request to export jobs (status=%s)", status)
+    return StreamingResponse(
+        export_ndjson(job_repo, JobRead, {"status": status}),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+# Cabeceras para que proxies (p. ej. nginx) no almacenen ni agrupen los eventos
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _ensure_progress_stream() -> None:
+    if not settings.JOB_PROGRESS_STREAM:
+        raise OperationError(
+            "Job progress stream", "is disabled (JOB_PROGRESS_STREAM)."
+        )
+
+
+@router.get("/events")
+async def stream_running_jobs():
+    """
+    Stream SSE con el estado de todos los jobs: primero los que están en
+    'running' y después cada cambio (contadores, estado) de cualquier job, en
+    cuanto Postgres lo notifica. Sustituye al polling de GET /jobs/{job_id}.
+    """
+    _ensure_progress_stream()
+    logger.info("Client subscribed to progress of all jobs")
+    return StreamingResponse(
+        job_progress_events(), media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS
+    )
+
+
+@router.get("/{job_id}/events")
+async def stream_job_progress(job_id: uuid.UUID):
+    """
+    Stream SSE con el estado de un job y cada cambio posterior; termina cuando el
+    job llega a 'completed' o 'failed' con sus contadores definitivos. El worker
+    pasa el job a 'completed' al cerrar la última de sus URLs.
+
+    Puede lanzar errores:
+    - 404 Not Found: Si el job no existe.
+    """
+    _ensure_progress_stream()
+    logger.info("Client subscribed to progress of job %s", job_id)
+    # Sesión propia y breve: con Depends(get_db) la conexión (con la transacción del
+    # SELECT abierta) seguiría retenida hasta que termine el stream
+    async with AsyncSessionFactory() as db:
+        await job_repo.get_or_404(db=db, id=job_id)
+    return StreamingResponse(
+        job_progress_events(job_id), media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS
+    )
+
+
 @router.get("/{job_id}", response_model=JobRead)
 async def read_scraping_job(job_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
     """Obtiene un trabajo de scraping por su ID."""
-    logger.info(f"Received request to read job with ID: {job_id}")
+    logger.info("Received request to read job with ID: %s", job_id)
     try:
-        db_job = await job_repo.get_or_404(db=db, id=job_id)
-        return db_job
+        db_job = await job_repo.get_row_or_404(db=db, id=job_id, schema=JobRead)
+        return OrjsonResponse(db_job)
     except ResourceNotFound as e:
-        logger.warning(f"Job not found: {e}")
+        logger.warning("Job not found: %s", e)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -0,0 +1,38 @@
+import uuid
+from datetime import date
+from typing import Optional
+
+from pydantic import BaseModel, Field, computed_field
+
+
+class FieldRollupBase(BaseModel):
+    config_id: uuid.UUID
+    site_name: str
+    field: str
+    result_count: int = Field(..., description="Resultados extraídos con la config")
+    match_count: int = Field(
+        ..., description="Resultados en los que el campo tiene valor"
+    )
+    value_count: int = Field(..., description="Valores extraídos del campo")
+
+    @computed_field
+    @property
+    def match_rate(self) -> Optional[float]:
+        if not self.result_count:
+            return None
+        return self.match_count / self.result_count
+
+
+class FieldRollupRead(FieldRollupBase):
+    day: date
+
+    model_config = {"from_attributes": True}
+
+
+class FieldRollupSummary(FieldRollupBase):
+    """Totales de un campo en el rango de días consultado."""
+
+    date_from: date
+    date_to: date
+
+    model_config = {"from_attributes": True}
@@ -1,10 +1,19 @@
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 
 from pydantic import BaseModel, Field
 
 
+class PolitenessSettings(BaseModel):
+    """Límites por host de la config; los campos omitidos usan los de settings."""
+
+    requests_per_second: Optional[float] = Field(default=None, gt=0)
+    burst: Optional[float] = Field(default=None, ge=1)
+    max_concurrency: Optional[int] = Field(default=None, ge=1)
+    respect_robots: Optional[bool] = None
+
+
 class ConfigBase(BaseModel):
     site_name: str = Field(
         ..., description="Nombre descriptivo del sitio o configuración"
@@ -12,16 +21,35 @@ class ConfigBase(BaseModel):
     selectors: Dict[str, Any] = Field(
         ..., description="Diccionario JSON con los selectores CSS/XPath"
     )
+    politeness: Optional[PolitenessSettings] = Field(
+        default=None, description="Límites de peticiones por host para esta config"
+    )
+    retry_interval: Optional[timedelta] = Field(
+        default=None,
+        description="Espera antes del primer reintento (segundos o ISO 8601); "
+        "se duplica en cada fallo. Por defecto, 1 hora",
+    )
+    max_retries: Optional[int] = Field(
+        default=None,
+        ge=0,
+        le=100,
+        description="Reintentos antes de pasar una URL a 'dead_letter'. Por defecto, 3",
+    )
 
 
 class ConfigCreate(ConfigBase):
-    pass  # Solo necesita site_name y selectors
+    # auth_settings se acepta al escribir pero ConfigRead no lo devuelve
+    auth_settings: Optional[Dict[str, Any]] = None
 
 
 class ConfigUpdate(BaseModel):
     # Solo permite actualizar los campos que quedan
     site_name: Optional[str] = None
     selectors: Optional[Dict[str, Any]] = None
+    politeness: Optional[PolitenessSettings] = None
+    retry_interval: Optional[timedelta] = None
+    max_retries: Optional[int] = Field(default=None, ge=0, le=100)
+    auth_settings: Optional[Dict[str, Any]] = None
 
 
 class ConfigRead(ConfigBase):
@@ -29,7 +57,6 @@ class ConfigRead(ConfigBase):
     id: uuid.UUID
     created_at: datetime
     updated_at: datetime
-    # Los campos retry_interval, max_retries, auth_settings no se leerán desde Python,
-    # pero existirán en la base de datos con sus valores DEFAULT.
+    # auth_settings puede contener credenciales: no se expone en las respuestas
 
     model_config = {"from_attributes": True}
@@ -1,9 +1,11 @@
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
+from .url import UrlCreate
+
 
 class JobBase(BaseModel):
     schedule_id: Optional[uuid.UUID] = Field(
@@ -18,7 +20,10 @@ class JobBase(BaseModel):
 class JobCreate(JobBase):
     # Al crear un job, quizás solo necesitemos el schedule_id (o ni eso si se crea manualmente)
     # Los contadores y timestamps se inicializan por defecto o en la lógica de negocio
-    pass
+    urls: List[UrlCreate] = Field(
+        default_factory=list,
+        description="URLs a encolar con el job; se crean en la misma transacción",
+    )
 
 
 class JobUpdate(BaseModel):
@@ -26,6 +31,8 @@ class JobUpdate(BaseModel):
     total_urls: Optional[int] = Field(default=None, ge=0)
     success_count: Optional[int] = Field(default=None, ge=0)
     error_count: Optional[int] = Field(default=None, ge=0)
+    changed_count: Optional[int] = Field(default=None, ge=0)
+    unchanged_count: Optional[int] = Field(default=None, ge=0)
     status: Optional[str] = Field(default=None, description="Nuevo estado del trabajo")
     # No permitir actualizar schedule_id o started_at usualmente
 
@@ -37,6 +44,10 @@ class JobRead(JobBase):
     total_urls: int
     success_count: int
     error_count: int
+    changed_count: int = Field(0, description="Páginas scrapeadas con contenido nuevo")
+    unchanged_count: int = Field(
+        0, description="Páginas sin cambios (304 o mismo hash): no se re-extraen"
+    )
     status: str  # En lectura, el status no es opcional
 
     model_config = {"from_attributes": True}
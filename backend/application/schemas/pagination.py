@@ -0,0 +1,15 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """Página de resultados con paginación por cursor."""
+
+    items: List[T]
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Cursor opaco para pedir la página siguiente; null si no hay más",
+    )
@@ -0,0 +1,105 @@
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, HttpUrl, field_validator, model_validator
+
+from application.services.scheduling import is_valid_cron, is_valid_timezone
+
+
+class ScheduleUrl(BaseModel):
+    url: HttpUrl
+    priority: Optional[int] = Field(
+        default=5, ge=1, le=10, description="Prioridad de scraping (1-10)"
+    )
+    config_id: Optional[uuid.UUID] = Field(
+        None, description="Config de la URL; por defecto, la de la programación"
+    )
+
+
+class ScheduleBase(BaseModel):
+    name: Optional[str] = Field(None, description="Nombre descriptivo")
+    config_id: Optional[uuid.UUID] = Field(
+        None, description="Config por defecto de las URLs"
+    )
+    cron: Optional[str] = Field(
+        None, description="Expresión cron (5 campos), p. ej. '0 */6 * * *'"
+    )
+    interval_seconds: Optional[int] = Field(
+        None, ge=1, description="Intervalo fijo entre disparos, alternativo a cron"
+    )
+    timezone: str = Field("UTC", description="Zona horaria IANA de la expresión cron")
+    urls: List[ScheduleUrl] = Field(
+        default_factory=list, description="URLs que se encolan en cada disparo"
+    )
+    is_active: bool = True
+
+    @field_validator("cron")
+    def cron_must_be_valid(cls, v):
+        if v is not None and not is_valid_cron(v):
+            raise ValueError(f"Expresión cron no válida: '{v}'")
+        return v
+
+    @field_validator("timezone")
+    def timezone_must_exist(cls, v):
+        if not is_valid_timezone(v):
+            raise ValueError(f"Zona horaria desconocida: '{v}'")
+        return v
+
+
+class ScheduleCreate(ScheduleBase):
+    user_id: Optional[uuid.UUID] = None
+    scheduled_at: Optional[datetime] = Field(
+        None,
+        description="Primer disparo; obligatorio si no hay cron ni intervalo "
+        "(programación de un solo disparo)",
+    )
+
+    @model_validator(mode="after")
+    def check_recurrence(self):
+        if self.cron and self.interval_seconds:
+            raise ValueError("Indicar cron o interval_seconds, no ambos")
+        if not self.cron and not self.interval_seconds and self.scheduled_at is None:
+            raise ValueError(
+                "Una programación sin cron ni interval_seconds necesita scheduled_at"
+            )
+        return self
+
+
+class ScheduleUpdate(BaseModel):
+    name: Optional[str] = None
+    config_id: Optional[uuid.UUID] = None
+    cron: Optional[str] = None
+    interval_seconds: Optional[int] = Field(default=None, ge=1)
+    timezone: Optional[str] = None
+    urls: Optional[List[ScheduleUrl]] = None
+    is_active: Optional[bool] = None
+    scheduled_at: Optional[datetime] = Field(
+        None, description="Fuerza el próximo disparo"
+    )
+
+    @field_validator("cron")
+    def cron_must_be_valid(cls, v):
+        if v is not None and not is_valid_cron(v):
+            raise ValueError(f"Expresión cron no válida: '{v}'")
+        return v
+
+    @field_validator("timezone")
+    def timezone_must_exist(cls, v):
+        if v is not None and not is_valid_timezone(v):
+            raise ValueError(f"Zona horaria desconocida: '{v}'")
+        return v
+
+
+class ScheduleRead(ScheduleBase):
+    id: uuid.UUID
+    user_id: Optional[uuid.UUID] = None
+    scheduled_at: datetime = Field(..., description="Próximo disparo")
+    is_processed: bool = Field(
+        False, description="Programación de un solo disparo ya ejecutada"
+    )
+    last_run_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
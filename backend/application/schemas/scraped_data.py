@@ -0,0 +1,58 @@
+import uuid
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from pydantic import BaseModel, Field
+
+
+class ScrapedDataBase(BaseModel):
+    url_id: uuid.UUID
+    job_id: Optional[uuid.UUID] = None
+    raw_payload: Dict[str, Any] = Field(
+        ..., description="Campos extraídos con los selectores de la configuración"
+    )
+    cleaned_text: Optional[str] = None
+
+
+class ScrapedDataCreate(ScrapedDataBase):
+    # Fila de scrape_result de la que procede este resultado
+    result_id: Optional[uuid.UUID] = None
+    result_scraped_at: Optional[datetime] = None
+
+
+class ScrapedDataUpdate(BaseModel):
+    raw_payload: Optional[Dict[str, Any]] = None
+    cleaned_text: Optional[str] = None
+
+
+class ScrapedDataRead(ScrapedDataBase):
+    scraped_at: datetime
+    result_id: Optional[uuid.UUID] = None
+    insights: Optional[Dict[str, Any]] = None
+
+    model_config = {"from_attributes": True}
+
+
+class ScrapeResultCreate(BaseModel):
+    url_id: uuid.UUID
+    job_id: Optional[uuid.UUID] = None
+    fields: Dict[str, Any] = Field(
+        ..., description="Campos extraídos con los selectores de la configuración"
+    )
+    content_hash: Optional[str] = None
+    html_compressed: Optional[bytes] = None
+    html_size: Optional[int] = None
+    compression: Optional[str] = None
+
+
+class ScrapeResultRead(BaseModel):
+    # El HTML comprimido no se expone; ver ScrapeResultRepository.get_html
+    id: uuid.UUID
+    url_id: uuid.UUID
+    job_id: Optional[uuid.UUID] = None
+    scraped_at: datetime
+    fields: Dict[str, Any]
+    content_hash: Optional[str] = None
+    html_size: Optional[int] = None
+
+    model_config = {"from_attributes": True}
@@ -1,9 +1,12 @@
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field, HttpUrl, field_validator
 
+# Estados de una URL en la cola (ver ck_scrape_url_status)
+URL_STATUSES = ("pending", "in_progress", "success", "failed", "retry", "dead_letter")
+
 
 # --- Base Schema ---
 # Contiene los campos comunes que pueden ser compartidos
@@ -53,9 +56,10 @@ class UrlUpdate(BaseModel):
 
     @field_validator("status")
     def status_must_be_valid(cls, v):
-        if v is not None and v not in ("pending", "in_progress", "success", "failed"):
+        if v is not None and v not in URL_STATUSES:
             raise ValueError(
-                "El estado debe ser uno de: 'pending', 'in_progress', 'success', 'failed'"
+                "El estado debe ser uno de: "
+                + ", ".join(f"'{status}'" for status in URL_STATUSES)
             )
         return v
 
@@ -69,6 +73,12 @@ class UrlRead(UrlBase):
     status: str
     created_at: datetime
     last_scraped_at: Optional[datetime] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    attempts: int = 0
+    next_attempt_at: Optional[datetime] = None
+    last_error: Optional[str] = None
 
     # Configuración para permitir crear este schema desde un objeto ORM (SQLAlchemy model)
     # Para Pydantic V2:
@@ -76,3 +86,27 @@ class UrlRead(UrlBase):
     # Para Pydantic V1 (si usas una versión anterior):
     # class Config:
     #     orm_mode = True
+
+
+# --- Bulk Schemas ---
+# Resultado de una carga masiva: las filas válidas se insertan y las inválidas
+# se reportan individualmente sin abortar el lote completo.
+class UrlBulkError(BaseModel):
+    index: int = Field(..., description="Posición (0-based) de la fila en la entrada")
+    errors: List[Dict[str, Any]] = Field(
+        ..., description="Errores de validación de la fila"
+    )
+
+
+class UrlBulkResult(BaseModel):
+    inserted: int = Field(..., description="Número de URLs creadas")
+    duplicates: int = Field(
+        0, description="URLs que ya existían para su config (no se vuelven a encolar)"
+    )
+    ids: List[uuid.UUID] = Field(
+        default_factory=list,
+        description="IDs en el orden de entrada (el existente para los duplicados)",
+    )
+    errors: List[UrlBulkError] = Field(
+        default_factory=list, description="Filas rechazadas por validación"
+    )
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import uuid
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from domain.exceptions import AppException
+from infrastructure.config.settings import settings
+from infrastructure.database.repositories.field_rollup_repo import (
+    ROLLUP_COUNTERS,
+    FieldRollupDelta,
+    field_rollup_repo,
+)
+from infrastructure.database.session import AsyncSessionFactory
+
+logger = logging.getLogger(__name__)
+
+# Resultado a agregar: (config_id, día, campos extraídos)
+RollupInput = Tuple[uuid.UUID, date, Dict[str, Any]]
+
+
+def _value_count(value: Any) -> int:
+    """Valores de un campo extraído: 0 si no hubo match, N para listas."""
+    if value is None or value == "":
+        return 0
+    if isinstance(value, (list, tuple)):
+        return sum(1 for item in value if item not in (None, ""))
+    return 1
+
+
+def compute_field_rollups(results: Sequence[RollupInput]) -> List[FieldRollupDelta]:
+    """
+    Agrega un lote de resultados en incrementos por (config, campo, día), en una sola
+    pasada sobre los campos con contadores por clave.
+    """
+    results_per_group = Counter((config_id, day) for config_id, day, _ in results)
+    match_counts: Counter = Counter()
+    value_counts: Counter = Counter()
+    for config_id, day, fields in results:
+        for name, value in fields.items():
+            key = (config_id, name, day)
+            values = _value_count(value)
+            match_counts[key] += int(values > 0)
+            value_counts[key] += values
+    return [
+        FieldRollupDelta(
+            config_id=config_id,
+            field=name,
+            day=day,
+            result_count=results_per_group[config_id, day],
+            match_count=match_counts[config_id, name, day],
+            value_count=value_counts[config_id, name, day],
+        )
+        for config_id, name, day in value_counts
+    ]
+
+
+def merge_rollups(deltas: Sequence[FieldRollupDelta]) -> List[FieldRollupDelta]:
+    """Suma incrementos con la misma clave (un INSERT no puede tocar dos veces una fila)."""
+    merged: Dict[Tuple[uuid.UUID, str, date], FieldRollupDelta] = {}
+    for delta in deltas:
+        key = (delta.config_id, delta.field, delta.day)
+        current = merged.setdefault(
+            key, FieldRollupDelta(config_id=key[0], field=key[1], day=key[2])
+        )
+        for name in ROLLUP_COUNTERS:
+            setattr(current, name, getattr(current, name) + getattr(delta, name))
+    return list(merged.values())
+
+
+class FieldRollupAccumulator:
+    """
+    Acumula resultados extraídos y vuelca sus agregados a field_rollup.
+
+    En lugar de un UPDATE por resultado, los resultados se guardan en memoria y
+    cada `flush_interval` segundos se agregan en bloque (compute_field_rollups) y
+    se escriben con un único INSERT ... ON CONFLICT.
+    """
+
+    def __init__(
+        self,
+        *,
+        flush_interval: float = settings.ANALYTICS_FLUSH_INTERVAL,
+        session_factory=AsyncSessionFactory,
+    ):
+        self.flush_interval = flush_interval
+        self.session_factory = session_factory
+        self._pending: List[RollupInput] = []
+        # Incrementos ya agregados cuya escritura falló; se reintentan en el siguiente flush
+        self._failed: List[FieldRollupDelta] = []
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    def add(
+        self,
+        config_id: Optional[uuid.UUID],
+        fields: Dict[str, Any],
+        *,
+        day: Optional[date] = None,
+    ) -> None:
+        if config_id is None:
+            return
+        self._pending.append(
+            (config_id, day or datetime.now(timezone.utc).date(), fields)
+        )
+
+    async def flush(self) -> None:
+        async with self._lock:
+            pending, self._pending = self._pending, []
+            deltas = compute_field_rollups(pending)
+            if self._failed:
+                deltas, self._failed = merge_rollups(self._failed + deltas), []
+            if not deltas:
+                return
+            try:
+                async with self.session_factory() as db:
+                    await field_rollup_repo.apply_deltas(db, deltas)
+            except AppException as e:
+                logger.error("Could not flush field rollups: %s", e.detail)
+                self._failed = deltas
+
+    async def _flush_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._flush_loop(), name="field-rollups")
+
+    async def stop(self) -> None:
+        """Detiene el volcado periódico y escribe lo que quede pendiente."""
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
@@ -0,0 +1,22 @@
+import zstandard
+
+from infrastructure.config.settings import settings
+
+# Identificador guardado junto al contenido para poder cambiar de algoritmo
+ZSTD = "zstd"
+
+# Los (de)compresores no son seguros entre hilos: uno por proceso, usados solo
+# desde el hilo del event loop
+_compressor = zstandard.ZstdCompressor(level=settings.RESULT_COMPRESSION_LEVEL)
+_decompressor = zstandard.ZstdDecompressor()
+
+
+def compress(data: bytes) -> bytes:
+    """Comprime con zstd; el tamaño original queda en la cabecera del frame."""
+    return _compressor.compress(data)
+
+
+def decompress(data: bytes, compression: str = ZSTD) -> bytes:
+    if compression != ZSTD:
+        raise ValueError(f"Unsupported compression: {compression}")
+    return _decompressor.decompress(data)
@@ -1,5 +1,6 @@
 import logging
 from fastapi import FastAPI, Request, status
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import (
     RequestValidationError,
@@ -15,14 +16,13 @@ from domain.exceptions import (
     ValidationError,
 )
 
-
 logger = logging.getLogger(__name__)
 
 
 async def handle_app_exception(request: Request, exc: AppException):
     """Manejador genérico para nuestras excepciones personalizadas."""
     logger.error(
-        f"Application error occurred: {exc.detail}", exc_info=True
+        "Application error occurred: %s", exc.detail, exc_info=True
     )  # Log con traceback
     # Por defecto, las excepciones de app podrían ser 400 o 500 dependiendo del tipo
     # Aquí usamos 400 como un ejemplo general, pero se puede refinar
@@ -46,18 +46,22 @@ async def handle_validation_exception(request: Request, exc: RequestValidationEr
     """Manejador para errores de validación de Pydantic."""
     # exc.errors() da detalles sobre qué campo falló la validación
     logger.warning(
-        f"Request validation error: {exc.errors()}", exc_info=False
+        "Request validation error: %s", exc.errors(), exc_info=False
     )  # No necesitamos traceback completo usualmente
     return JSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content={"detail": "Validation Error", "errors": exc.errors()},
+        # jsonable_encoder: el ctx de los validadores propios incluye el ValueError
+        content={
+            "detail": "Validation Error",
+            "errors": jsonable_encoder(exc.errors()),
+        },
     )
 
 
 async def handle_http_exception(request: Request, exc: StarletteHTTPException):
     """Manejador para excepciones HTTPException estándar de FastAPI/Starlette."""
     # Estas ya tienen status_code y detail
-    logger.warning(f"HTTP exception occurred: {exc.status_code} - {exc.detail}")
+    logger.warning("HTTP exception occurred: %s - %s", exc.status_code, exc.detail)
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
@@ -68,7 +72,7 @@ async def handle_http_exception(request: Request, exc: StarletteHTTPException):
 async def handle_generic_exception(request: Request, exc: Exception):
     """Manejador para cualquier otra excepción no capturada (errores 500)."""
     logger.critical(
-        f"Unhandled exception occurred: {exc}", exc_info=True
+        "Unhandled exception occurred: %s", exc, exc_info=True
     )  # Log como CRITICAL con traceback
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,40 @@
+import logging
+from typing import Any, AsyncIterator, Dict, Optional, Type
+
+from pydantic import BaseModel
+
+from infrastructure.database.repositories.base_repo import BaseRepository
+from infrastructure.database.session import AsyncSessionFactory
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Filas serializadas que se agrupan en cada chunk enviado al cliente
+EXPORT_CHUNK_ROWS = 500
+
+
+async def export_ndjson(
+    repo: BaseRepository,
+    read_schema: Type[BaseModel],
+    filters: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Genera una exportación NDJSON (un objeto por línea) de todas las filas filtradas.
+
+    Abre su propia sesión porque la respuesta se transmite después de que el
+    endpoint retorna; las filas se leen con un cursor de servidor y se envían en
+    chunks de EXPORT_CHUNK_ROWS, de modo que la memoria se mantiene constante.
+    """
+    exported = 0
+    lines = []
+    async with AsyncSessionFactory() as db:
+        async for db_obj in repo.stream(db, filters=filters):
+            lines.append(read_schema.model_validate(db_obj).model_dump_json())
+            if len(lines) >= EXPORT_CHUNK_ROWS:
+                exported += len(lines)
+                yield ("\n".join(lines) + "\n").encode()
+                lines = []
+    if lines:
+        exported += len(lines)
+        yield ("\n".join(lines) + "\n").encode()
+    logger.info("Exported %s %s rows as NDJSON", exported, repo.model.__name__)
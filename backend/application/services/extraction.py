@@ -0,0 +1,118 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from cssselect import HTMLTranslator, SelectorError
+from lxml import etree, html
+
+from domain.exceptions import ExtractionError
+
+# Sufijos estilo parsel soportados en selectores CSS: "a.title::text", "a::attr(href)"
+_CSS_PSEUDO_RE = re.compile(r"::(text|attr\(([^)]+)\))\s*$")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_css_translator = HTMLTranslator()
+
+
+@dataclass(frozen=True)
+class CompiledSelector:
+    """Selector de un campo ya traducido a XPath y compilado por lxml."""
+
+    field: str
+    xpath: etree.XPath
+    attr: Optional[str] = None  # Atributo a leer; None = texto del nodo
+    multiple: bool = False  # True = lista con todas las coincidencias
+
+
+CompiledSelectors = Dict[str, CompiledSelector]
+
+
+def _compile_one(field: str, spec: Any) -> CompiledSelector:
+    """
+    Compila la especificación de un campo de ScrapeConfig.selectors.
+
+    Formatos admitidos:
+    - "h1.title" o "a::attr(href)": selector CSS (con sufijos ::text / ::attr()).
+    - "//h1/text()" o "xpath://h1": expresión XPath.
+    - {"css" | "xpath": "...", "attr": "href", "multiple": true}
+    """
+    attr: Optional[str] = None
+    multiple = False
+    if isinstance(spec, str):
+        expression = spec.strip()
+        if expression.startswith("xpath:"):
+            kind, expression = "xpath", expression[len("xpath:") :].strip()
+        elif expression.startswith(("/", "(")):
+            kind = "xpath"
+        else:
+            kind = "css"
+    elif isinstance(spec, dict) and ("css" in spec or "xpath" in spec):
+        kind = "css" if "css" in spec else "xpath"
+        expression = str(spec[kind]).strip()
+        attr = spec.get("attr")
+        multiple = bool(spec.get("multiple", False))
+    else:
+        raise ExtractionError(f"Invalid selector definition for field '{field}'.")
+
+    try:
+        if kind == "css":
+            match = _CSS_PSEUDO_RE.search(expression)
+            if match:
+                expression = expression[: match.start()]
+                if match.group(2):
+                    attr = match.group(2).strip()
+            expression = _css_translator.css_to_xpath(expression)
+        return CompiledSelector(
+            field=field, xpath=etree.XPath(expression), attr=attr, multiple=multiple
+        )
+    except (SelectorError, etree.XPathSyntaxError) as e:
+        raise ExtractionError(f"Invalid selector for field '{field}': {e}")
+
+
+def compile_selectors(selectors: Dict[str, Any]) -> CompiledSelectors:
+    """Compila todos los selectores de una configuración."""
+    return {field: _compile_one(field, spec) for field, spec in selectors.items()}
+
+
+def _node_value(node: Any, attr: Optional[str]) -> Optional[str]:
+    if isinstance(node, etree._Element):
+        if attr:
+            value = node.get(attr)
+        else:
+            value = node.text_content()
+    else:  # Resultado de XPath sobre texto/atributo (str) u otro escalar
+        value = str(node)
+    if value is None:
+        return None
+    value = _WHITESPACE_RE.sub(" ", value).strip()
+    return value or None
+
+
+def parse_html(body: bytes, base_url: Optional[str] = None) -> etree._Element:
+    """Parsea el HTML de una página; lxml detecta la codificación desde los bytes."""
+    try:
+        return html.document_fromstring(body, base_url=base_url)
+    except (etree.ParserError, ValueError) as e:
+        raise ExtractionError(f"Could not parse HTML: {e}")
+
+
+def extract_fields(
+    compiled: CompiledSelectors, body: bytes, base_url: Optional[str] = None
+) -> Dict[str, Any]:
+    """Aplica los selectores compilados a una página y devuelve {campo: valor}."""
+    document = parse_html(body, base_url=base_url)
+    fields: Dict[str, Any] = {}
+    for field, selector in compiled.items():
+        try:
+            nodes = selector.xpath(document)
+        except etree.XPathEvalError as e:
+            raise ExtractionError(f"Could not evaluate selector '{field}': {e}")
+        if not isinstance(nodes, list):
+            nodes = [nodes]
+        values: List[str] = [
+            value
+            for value in (_node_value(node, selector.attr) for node in nodes)
+            if value is not None
+        ]
+        fields[field] = values if selector.multiple else (values[0] if values else None)
+    return fields
@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from application.services.extraction import extract_fields
+from application.services.selector_cache import selector_cache
+from domain.exceptions import ExtractionError
+from infrastructure.config.settings import settings
+from infrastructure.observability.metrics import SELECTOR_CACHE_TOTAL
+
+logger = logging.getLogger(__name__)
+
+# Contadores acumulados de la selector_cache de cada proceso y su label en métricas
+CACHE_COUNTERS = {"hits": "hit", "misses": "miss", "evictions": "eviction"}
+
+# (pid, selector_cache.stats()) del proceso que hizo la extracción
+CacheSnapshot = Tuple[int, Dict[str, Any]]
+
+
+def available_cpus() -> int:
+    """Núcleos que este proceso puede usar (respeta la afinidad de CPU y cgroups cpuset)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS / Windows
+        return os.cpu_count() or 1
+
+
+def _init_process() -> None:
+    # Ctrl+C lo gestiona el proceso principal, que apaga el pool de forma ordenada
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _extract(
+    config_id: uuid.UUID,
+    updated_at: datetime,
+    selectors: Dict[str, Any],
+    body: bytes,
+    base_url: Optional[str],
+) -> Tuple[Dict[str, Any], CacheSnapshot]:
+    """
+    Parseo y extracción de una página. En el pool se ejecuta en un proceso hijo:
+    los XPath compilados no se pueden serializar, así que cada proceso compila y
+    cachea los selectores en su propia selector_cache (por versión de la config).
+    Junto a los campos devuelve los contadores de esa caché, que solo existen en
+    el hijo, para que el proceso principal pueda informar de ellos.
+    """
+    compiled = selector_cache.get_compiled(config_id, updated_at, selectors)
+    fields = extract_fields(compiled, body, base_url=base_url)
+    return fields, (os.getpid(), selector_cache.stats())
+
+
+class ExtractionExecutor:
+    """
+    Ejecuta el parseo de HTML y la evaluación de selectores en un pool de procesos,
+    fuera del event loop, para que la extracción use todos los núcleos y no retrase
+    los fetches ni las escrituras.
+
+    El HTML viaja como bytes (una sola copia serializada hacia el hijo, sin decodificar
+    en el proceso principal) y de vuelta solo el dict de campos extraídos. Si un
+    proceso hijo muere (p. ej. por memoria), el pool se recrea y las extracciones
+    afectadas fallan con ExtractionError.
+
+    Con `processes` < 0 no hay pool: se extrae en el propio proceso, como antes.
+    """
+
+    def __init__(
+        self,
+        *,
+        processes: int = settings.EXTRACTION_PROCESSES,
+        start_method: str = settings.EXTRACTION_START_METHOD,
+    ):
+        self.inline = processes < 0
+        self.processes = processes if processes > 0 else available_cpus()
+        self.start_method = start_method
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.restarts = 0
+        # Última foto de la selector_cache de cada proceso vivo, y los contadores de
+        # los procesos de pools ya sustituidos
+        self._cache_by_process: Dict[int, Dict[str, Any]] = {}
+        self._retired_cache = dict.fromkeys(CACHE_COUNTERS, 0)
+
+    def start(self) -> None:
+        """Crea el pool; los procesos arrancan a medida que llega trabajo."""
+        if self.inline or self._pool is not None:
+            return
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=_init_process,
+        )
+        logger.info(
+            "Extraction pool started (%s processes, %s)",
+            self.processes,
+            self.start_method,
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        # Varias extracciones ven el mismo pool roto: solo la primera lo sustituye
+        if self._pool is broken:
+            logger.error("Extraction process pool broke; starting a new one")
+            self.restarts += 1
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            for snapshot in self._cache_by_process.values():
+                for name in CACHE_COUNTERS:
+                    self._retired_cache[name] += snapshot[name]
+            self._cache_by_process.clear()
+            self.start()
+
+    async def extract(
+        self,
+        config_id: uuid.UUID,
+        updated_at: datetime,
+        selectors: Dict[str, Any],
+        body: bytes,
+        base_url: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Aplica los selectores de una versión de ScrapeConfig a una página."""
+        if self.inline:
+            fields, cache = _extract(config_id, updated_at, selectors, body, base_url)
+            self._record_cache(cache)
+            return fields
+        if self._pool is None:
+            self.start()
+        pool = self._pool
+        self.in_flight += 1
+        try:
+            fields, cache = await asyncio.get_running_loop().run_in_executor(
+                pool, _extract, config_id, updated_at, selectors, body, base_url
+            )
+        except BrokenProcessPool:
+            self.failed += 1
+            self._restart(pool)
+            raise ExtractionError("Extraction process died while parsing the page.")
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        self.completed += 1
+        # Un resultado de un pool ya sustituido: sus contadores ya se retiraron
+        if pool is self._pool:
+            self._record_cache(cache)
+        return fields
+
+    def _record_cache(self, cache: CacheSnapshot) -> None:
+        """Guarda la foto de la caché de un proceso y suma a las métricas lo nuevo."""
+        pid, snapshot = cache
+        previous = self._cache_by_process.get(pid)
+        for name, label in CACHE_COUNTERS.items():
+            delta = snapshot[name] - (previous[name] if previous else 0)
+            if delta > 0:
+                SELECTOR_CACHE_TOTAL.labels(label).inc(delta)
+        self._cache_by_process[pid] = snapshot
+
+    def selector_cache_stats(self) -> Dict[str, Any]:
+        """
+        Caché de selectores sumada sobre los procesos de extracción: size es el total
+        de entradas en los procesos vivos y los contadores incluyen los de pools
+        anteriores. Un proceso aparece tras su primera extracción.
+        """
+        snapshots = list(self._cache_by_process.values())
+        totals = {
+            name: self._retired_cache[name] + sum(s[name] for s in snapshots)
+            for name in CACHE_COUNTERS
+        }
+        lookups = totals["hits"] + totals["misses"]
+        return {
+            "processes": len(snapshots),
+            "size": sum(s["size"] for s in snapshots),
+            "maxsize_per_process": selector_cache.stats()["maxsize"],
+            **totals,
+            "hit_ratio": totals["hits"] / lookups if lookups else 0.0,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        if self.inline:
+            return {"processes": 0, "selector_cache": self.selector_cache_stats()}
+        return {
+            "processes": self.processes,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "restarts": self.restarts,
+            "selector_cache": self.selector_cache_stats(),
+        }
+
+
+extraction_executor = ExtractionExecutor()
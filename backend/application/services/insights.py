@@ -0,0 +1,304 @@
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import uuid
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from domain.exceptions import AppException, LLMError
+from domain.models.scraped_data import ScrapedData
+from infrastructure.config.settings import settings
+from infrastructure.database.repositories.insight_cache_repo import insight_cache_repo
+from infrastructure.database.repositories.scraped_data_repo import scraped_data_repo
+from infrastructure.database.session import AsyncSessionFactory
+from infrastructure.database.unit_of_work import unit_of_work
+from infrastructure.http.rate_limit import AsyncTokenBucket
+from infrastructure.llm.client import LLMBackend
+from infrastructure.observability.metrics import INSIGHT_DOCUMENTS_TOTAL
+
+logger = logging.getLogger(__name__)
+
+# Cambiar la versión al modificar el prompt: invalida la caché de análisis
+PROMPT_VERSION = "v1"
+SYSTEM_PROMPT = (
+    "You extract business insights from web page content. You receive several "
+    "documents, each introduced by a line '### Document <id>'. For every document "
+    "return a JSON object with: 'summary' (one or two sentences), 'topics' (list of "
+    "short strings), 'entities' (list of organizations, products or people "
+    "mentioned) and 'sentiment' ('positive', 'neutral' or 'negative'). Answer only "
+    'with JSON of the form {"results": [{"id": "<id>", "insights": {...}}]} '
+    "containing one entry per document."
+)
+
+# Estimación de tokens sin tokenizador: ~4 caracteres por token en texto occidental.
+# Suficiente para empaquetar por presupuesto con margen; el consumo real se toma de
+# `usage` en la respuesta del modelo.
+CHARS_PER_TOKEN = 4
+# Cabecera "### Document <id>" y separadores de cada documento
+DOCUMENT_OVERHEAD_TOKENS = 8
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@dataclass
+class InsightDocument:
+    """Contenido de un resultado preparado para el modelo."""
+
+    url_id: uuid.UUID
+    scraped_at: datetime
+    text: str
+    content_hash: str
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text) + DOCUMENT_OVERHEAD_TOKENS
+
+
+def build_document(
+    row: ScrapedData, *, max_tokens: int = settings.LLM_MAX_DOCUMENT_TOKENS
+) -> InsightDocument:
+    """
+    Texto a analizar de un resultado: cleaned_text si existe y, si no, los campos
+    extraídos serializados con claves ordenadas (hash estable). Se trunca a
+    `max_tokens` estimados.
+    """
+    text = row.cleaned_text or json.dumps(
+        row.raw_payload, ensure_ascii=False, sort_keys=True
+    )
+    text = text[: max_tokens * CHARS_PER_TOKEN]
+    return InsightDocument(
+        url_id=row.url_id,
+        scraped_at=row.scraped_at,
+        text=text,
+        content_hash=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+    )
+
+
+def pack_batches(
+    documents: Sequence[InsightDocument],
+    *,
+    token_budget: int = settings.LLM_PROMPT_TOKEN_BUDGET,
+    max_documents: int = settings.LLM_MAX_DOCUMENTS_PER_REQUEST,
+) -> List[List[InsightDocument]]:
+    """
+    Agrupa documentos en peticiones sin superar `token_budget` tokens de entrada
+    (prompt de sistema incluido) ni `max_documents` por petición. Un documento que
+    por sí solo excede el presupuesto va en una petición propia.
+    """
+    available = token_budget - estimate_tokens(SYSTEM_PROMPT)
+    batches: List[List[InsightDocument]] = []
+    current: List[InsightDocument] = []
+    used = 0
+    for document in documents:
+        if current and (
+            used + document.tokens > available or len(current) >= max_documents
+        ):
+            batches.append(current)
+            current, used = [], 0
+        current.append(document)
+        used += document.tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_messages(batch: Sequence[InsightDocument]) -> List[Dict[str, str]]:
+    parts = [f"### Document {i}\n{document.text}" for i, document in enumerate(batch)]
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": "\n\n".join(parts)},
+    ]
+
+
+def parse_response(
+    content: str, batch: Sequence[InsightDocument]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Análisis de cada documento de la petición, como {content_hash: insights}.
+    Los documentos que falten en la respuesta se omiten (se reintentarán en otra
+    ejecución).
+    """
+    try:
+        results = json.loads(content)["results"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise LLMError(f"LLM response is not the expected JSON: {e}")
+    parsed: Dict[str, Dict[str, Any]] = {}
+    for item in results if isinstance(results, list) else []:
+        if not isinstance(item, dict) or not isinstance(item.get("insights"), dict):
+            continue
+        try:
+            document = batch[int(item.get("id"))]
+        except (TypeError, ValueError, IndexError):
+            continue
+        parsed[document.content_hash] = item["insights"]
+    return parsed
+
+
+@dataclass
+class InsightRunStats:
+    documents: int = 0
+    cached: int = 0  # Resueltos con la caché (o repetidos dentro de la ejecución)
+    analyzed: int = 0  # Resueltos con una petición al modelo
+    failed: int = 0
+    requests: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+class InsightPipeline:
+    """
+    Analiza con un modelo de lenguaje los resultados de un ScrapingJob.
+
+    Por cada página de resultados pendientes: calcula el hash del contenido,
+    resuelve con la caché (content_hash, prompt_version, model) lo ya analizado,
+    agrupa el resto en peticiones según el presupuesto de tokens y las envía en
+    paralelo, limitadas por concurrencia y por peticiones/tokens por minuto. Los
+    análisis nuevos se guardan en la caché y en scraped_data.insights.
+    """
+
+    def __init__(
+        self,
+        backend: LLMBackend,
+        *,
+        prompt_version: str = PROMPT_VERSION,
+        concurrency: int = settings.LLM_MAX_CONCURRENCY,
+        requests_per_minute: int = settings.LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = settings.LLM_TOKENS_PER_MINUTE,
+        token_budget: int = settings.LLM_PROMPT_TOKEN_BUDGET,
+        max_documents_per_request: int = settings.LLM_MAX_DOCUMENTS_PER_REQUEST,
+        max_output_tokens: int = settings.LLM_MAX_OUTPUT_TOKENS,
+        page_size: int = settings.INSIGHTS_PAGE_SIZE,
+        session_factory=AsyncSessionFactory,
+    ):
+        self.backend = backend
+        self.prompt_version = prompt_version
+        self.token_budget = token_budget
+        self.max_documents_per_request = max_documents_per_request
+        self.max_output_tokens = max_output_tokens
+        self.page_size = page_size
+        self.session_factory = session_factory
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._request_bucket = (
+            AsyncTokenBucket.per_minute(requests_per_minute)
+            if requests_per_minute > 0
+            else None
+        )
+        self._token_bucket = (
+            AsyncTokenBucket.per_minute(tokens_per_minute)
+            if tokens_per_minute > 0
+            else None
+        )
+
+    async def run_job(self, job_id: uuid.UUID) -> InsightRunStats:
+        """Analiza todos los resultados del job que aún no tienen insights."""
+        stats = InsightRunStats()
+        after_url_id: Optional[uuid.UUID] = None
+        while True:
+            async with self.session_factory() as db:
+                rows = await scraped_data_repo.get_pending_insights(
+                    db, job_id=job_id, after_url_id=after_url_id, limit=self.page_size
+                )
+            if not rows:
+                break
+            after_url_id = rows[-1].url_id
+            await self._process_page(rows, stats)
+        logger.info("Insights for job %s: %s", job_id, stats.as_dict())
+        return stats
+
+    async def _process_page(
+        self, rows: Sequence[ScrapedData], stats: InsightRunStats
+    ) -> None:
+        documents = [build_document(row) for row in rows]
+        stats.documents += len(documents)
+        async with self.session_factory() as db:
+            cached = await insight_cache_repo.get_cached(
+                db,
+                list({d.content_hash for d in documents}),
+                prompt_version=self.prompt_version,
+                model=self.backend.model,
+            )
+        # Un documento por contenido distinto: las URLs con el mismo texto comparten
+        # análisis
+        pending: Dict[str, InsightDocument] = {}
+        for document in documents:
+            if document.content_hash not in cached:
+                pending.setdefault(document.content_hash, document)
+        batches = pack_batches(
+            list(pending.values()),
+            token_budget=self.token_budget,
+            max_documents=self.max_documents_per_request,
+        )
+        fresh: Dict[str, Dict[str, Any]] = {}
+        for analyzed in await asyncio.gather(
+            *(self._analyze(batch, stats) for batch in batches)
+        ):
+            fresh.update(analyzed)
+
+        resolved = {**cached, **fresh}
+        updates = {}
+        for document in documents:
+            insights = resolved.get(document.content_hash)
+            if insights is None:
+                stats.failed += 1
+                INSIGHT_DOCUMENTS_TOTAL.labels("failed").inc()
+                continue
+            updates[(document.url_id, document.scraped_at)] = insights
+            if document.content_hash in fresh and (
+                pending.get(document.content_hash) is document
+            ):
+                stats.analyzed += 1
+                INSIGHT_DOCUMENTS_TOTAL.labels("model").inc()
+            else:
+                stats.cached += 1
+                INSIGHT_DOCUMENTS_TOTAL.labels("cache").inc()
+        try:
+            async with self.session_factory() as db:
+                async with unit_of_work(db):
+                    await insight_cache_repo.put_many(
+                        db,
+                        fresh,
+                        prompt_version=self.prompt_version,
+                        model=self.backend.model,
+                    )
+                    await scraped_data_repo.set_insights(db, updates)
+        except AppException as e:
+            logger.error("Could not save %s insights: %s", len(updates), e.detail)
+
+    async def _analyze(
+        self, batch: List[InsightDocument], stats: InsightRunStats
+    ) -> Dict[str, Dict[str, Any]]:
+        messages = build_messages(batch)
+        prompt_tokens = sum(estimate_tokens(m["content"]) for m in messages)
+        async with self._semaphore:
+            if self._request_bucket is not None:
+                await self._request_bucket.acquire()
+            if self._token_bucket is not None:
+                await self._token_bucket.acquire(prompt_tokens)
+            stats.requests += 1
+            try:
+                completion = await self.backend.complete(
+                    messages, max_tokens=self.max_output_tokens
+                )
+                stats.prompt_tokens += completion.prompt_tokens
+                stats.completion_tokens += completion.completion_tokens
+                analyzed = parse_response(completion.content, batch)
+            except LLMError as e:
+                logger.error(
+                    "Insight request for %s documents failed: %s", len(batch), e.detail
+                )
+                return {}
+        if len(analyzed) < len(batch):
+            logger.warning(
+                "LLM returned insights for %s of %s documents",
+                len(analyzed),
+                len(batch),
+            )
+        return analyzed
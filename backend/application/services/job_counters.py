@@ -0,0 +1,36 @@
+import uuid
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from infrastructure.database.repositories.job_repo import COUNTER_FIELDS
+
+
+def job_counter_deltas(
+    *,
+    changed_jobs: Iterable[Optional[uuid.UUID]] = (),
+    unchanged_jobs: Iterable[Optional[uuid.UUID]] = (),
+    failed_jobs: Iterable[Tuple[Optional[uuid.UUID], str]] = (),
+) -> Dict[uuid.UUID, Dict[str, int]]:
+    """
+    Agrupa por job los incrementos de un lote de URLs cerradas, para escribirlos
+    con un único executemany (job_repo.increment_counters_many).
+
+    Recibe el job_id de cada URL cerrada con contenido nuevo o sin cambios, y
+    (job_id, estado) de cada fallo: solo cuentan como error las URLs que pasan a
+    'dead_letter', ya que una URL que se reintentará sigue abierta.
+    """
+    deltas: Dict[uuid.UUID, Dict[str, int]] = defaultdict(
+        lambda: dict.fromkeys(COUNTER_FIELDS, 0)
+    )
+    for job_id in changed_jobs:
+        if job_id is not None:
+            deltas[job_id]["success_count"] += 1
+            deltas[job_id]["changed_count"] += 1
+    for job_id in unchanged_jobs:
+        if job_id is not None:
+            deltas[job_id]["success_count"] += 1
+            deltas[job_id]["unchanged_count"] += 1
+    for job_id, status in failed_jobs:
+        if job_id is not None and status == "dead_letter":
+            deltas[job_id]["error_count"] += 1
+    return dict(deltas)
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import logging
+import uuid
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, Mapping, Optional, Set
+
+from application.schemas.job import JobRead
+from infrastructure.config.settings import settings
+from infrastructure.database.notifications import PgNotificationListener
+from infrastructure.database.repositories.job_repo import JOB_PROGRESS_CHANNEL, job_repo
+from infrastructure.database.session import AsyncSessionFactory
+
+logger = logging.getLogger(__name__)
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+# Estados a partir de los cuales un job ya no cambia
+FINAL_JOB_STATUSES = frozenset({"completed", "failed"})
+
+
+class JobProgressHub:
+    """
+    Reparte los cambios de scraping_job a los clientes conectados del proceso.
+
+    Un trigger de Postgres emite NOTIFY con la fila del job (JSON, mismas claves
+    que JobRead) en cada alta o cambio; el hub escucha el canal con la conexión
+    compartida de pg_listener y copia cada notificación en la cola de los
+    suscriptores de ese job y de los suscritos a todos los jobs. Los clientes no
+    consultan la base de datos para seguir el progreso.
+
+    Las colas son acotadas: si un cliente no consume, se descarta la notificación
+    más antigua (cada una trae el estado completo del job, así que basta la última).
+    """
+
+    def __init__(self, queue_size: int = settings.JOB_PROGRESS_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._by_job: Dict[uuid.UUID, Set[asyncio.Queue]] = {}
+        self._all_jobs: Set[asyncio.Queue] = set()
+
+    def attach(self, listener: PgNotificationListener) -> None:
+        """Se suscribe al canal de progreso. Debe llamarse antes de listener.start()."""
+        listener.subscribe(JOB_PROGRESS_CHANNEL, self.handle_notification)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._all_jobs) + sum(len(q) for q in self._by_job.values())
+
+    @contextmanager
+    def subscribe(self, job_id: Optional[uuid.UUID] = None) -> Iterator[asyncio.Queue]:
+        """
+        Cola con el payload (JSON) de cada cambio de `job_id`, o de cualquier job si
+        es None. La suscripción se elimina al salir del bloque.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        targets = (
+            self._all_jobs if job_id is None else self._by_job.setdefault(job_id, set())
+        )
+        targets.add(queue)
+        try:
+            yield queue
+        finally:
+            targets.discard(queue)
+            if job_id is not None and not targets:
+                self._by_job.pop(job_id, None)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, payload: str) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(payload)
+
+    def handle_notification(self, channel: str, payload: str) -> None:
+        """Callback del listener LISTEN/NOTIFY: el payload es la fila del job en JSON."""
+        try:
+            job_id = uuid.UUID(json.loads(payload)["id"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed job progress payload: %s", payload)
+            return
+        for queue in self._by_job.get(job_id, ()):
+            self._offer(queue, payload)
+        for queue in self._all_jobs:
+            self._offer(queue, payload)
+
+
+# Hub compartido por el proceso de la API
+job_progress_hub = JobProgressHub()
+
+
+def _sse_event(data: str) -> str:
+    return f"event: job\ndata: {data}\n\n"
+
+
+def _is_settled(job: Mapping[str, Any]) -> bool:
+    """
+    Job en estado final y con todas sus URLs contadas. El worker lo cierra
+    después de escribir los contadores, así que su notificación de 'completed' ya
+    trae los totales; un estado final puesto por otra vía (p. ej. PATCH desde la
+    API) puede llegar antes que ellos.
+    """
+    if job.get("status") not in FINAL_JOB_STATUSES:
+        return False
+    counted = (job.get("success_count") or 0) + (job.get("error_count") or 0)
+    return counted >= (job.get("total_urls") or 0)
+
+
+async def job_progress_events(
+    job_id: Optional[uuid.UUID] = None,
+    *,
+    hub: JobProgressHub = job_progress_hub,
+    keepalive: float = settings.JOB_PROGRESS_KEEPALIVE,
+    final_wait: float = settings.JOB_PROGRESS_FINAL_WAIT,
+) -> AsyncIterator[str]:
+    """
+    Server-Sent Events con el estado de `job_id` (o de todos los jobs si es None).
+
+    Primero se suscribe al hub y después envía el estado actual (el job, o los que
+    están en 'running'), de modo que ningún cambio queda entre la foto inicial y las
+    notificaciones. A partir de ahí solo reenvía notificaciones; sin cambios envía
+    un comentario cada `keepalive` segundos para mantener viva la conexión. El
+    stream de un job termina cuando este llega a un estado final con todas sus URLs
+    contadas, o `final_wait` segundos después del estado final si los contadores
+    no llegan a sumar total_urls.
+    """
+    loop = asyncio.get_running_loop()
+    final_deadline: Optional[float] = None
+    with hub.subscribe(job_id) as queue:
+        async with AsyncSessionFactory() as db:
+            if job_id is not None:
+                job = await job_repo.get(db, job_id)
+                jobs = [job] if job is not None else []
+            else:
+                jobs = await job_repo.get_running(db)
+        for job in jobs:
+            snapshot = JobRead.model_validate(job)
+            yield _sse_event(snapshot.model_dump_json())
+            if job_id is not None and snapshot.status in FINAL_JOB_STATUSES:
+                if _is_settled(snapshot.model_dump()):
+                    return
+                final_deadline = loop.time() + final_wait
+        while True:
+            timeout = keepalive
+            if final_deadline is not None:
+                remaining = final_deadline - loop.time()
+                if remaining <= 0:
+                    return
+                timeout = min(timeout, remaining)
+            try:
+                payload = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield _sse_event(payload)
+            if job_id is None:
+                continue
+            job = json.loads(payload)
+            if _is_settled(job):
+                return
+            if job.get("status") in FINAL_JOB_STATUSES and final_deadline is None:
+                final_deadline = loop.time() + final_wait
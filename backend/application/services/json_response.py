@@ -0,0 +1,32 @@
+from typing import Any
+
+import orjson
+from pydantic_core import to_jsonable_python
+from starlette.responses import JSONResponse
+
+# UTC como "Z" (igual que Pydantic) y claves no str (p. ej. UUID) en los dicts
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serializa con orjson. Lo que orjson no conoce (timedelta, modelos Pydantic,
+    HttpUrl, ...) se delega en Pydantic, que lo representa igual que response_model.
+    """
+    return orjson.dumps(content, default=to_jsonable_python, option=ORJSON_OPTIONS)
+
+
+class OrjsonResponse(JSONResponse):
+    """
+    Respuesta JSON serializada con orjson para endpoints que ya tienen los datos en
+    forma de dicts (p. ej. BaseRepository.get_page_rows).
+
+    Devolverla desde un endpoint se salta la validación de response_model, que se
+    mantiene solo para documentar el esquema en OpenAPI. No se usa como
+    default_response_class: con la clase por defecto, FastAPI serializa los
+    response_model directamente a JSON con Pydantic, que es más rápido que
+    convertirlos a dicts para pasarlos a orjson.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,49 @@
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+from infrastructure.config.settings import settings
+
+# Respuestas HTTP que indican un fallo pasajero; el resto de 4xx no se reintentan
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def is_retryable_status(status_code: int) -> bool:
+    return status_code in RETRYABLE_STATUS_CODES
+
+
+def backoff_delay(
+    attempt: int,
+    *,
+    base: float,
+    cap: float = settings.RETRY_MAX_BACKOFF,
+    jitter: float = settings.RETRY_JITTER,
+    rng: Callable[[], float] = random.random,
+) -> float:
+    """
+    Segundos hasta el reintento número `attempt` (1 = primer reintento): `base`
+    duplicado en cada intento y limitado a `cap`. Se resta un porcentaje aleatorio
+    de hasta `jitter` para que las URLs que fallaron juntas (p. ej. un host caído)
+    no vuelvan todas a la vez.
+    """
+    delay = min(cap, base * 2 ** max(attempt - 1, 0))
+    return delay * (1.0 - jitter * rng())
+
+
+def retry_after_seconds(
+    value: Optional[str], now: Optional[datetime] = None
+) -> Optional[float]:
+    """Segundos indicados por una cabecera Retry-After (delta o fecha HTTP)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max((moment - (now or datetime.now(timezone.utc))).total_seconds(), 0.0)
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from croniter import croniter
+
+
+def is_valid_cron(expression: str) -> bool:
+    return croniter.is_valid(expression)
+
+
+def is_valid_timezone(name: str) -> bool:
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
+
+
+def next_fire_time(
+    *,
+    cron: Optional[str],
+    interval_seconds: Optional[int],
+    tz: str = "UTC",
+    after: datetime,
+    anchor: Optional[datetime] = None,
+) -> Optional[datetime]:
+    """
+    Primer disparo estrictamente posterior a `after` (UTC), o None si la
+    programación es de un solo disparo (sin cron ni intervalo).
+
+    Los disparos perdidos (scheduler parado, programación desactivada) no se
+    recuperan uno a uno: se salta al siguiente. Con intervalo, los disparos se
+    mantienen alineados con `anchor` (el disparo anterior); la expresión cron se
+    evalúa en la zona horaria `tz`, de modo que "0 9 * * *" son las 9:00 locales
+    también tras un cambio de horario.
+    """
+    if cron:
+        local = after.astimezone(ZoneInfo(tz))
+        return croniter(cron, local).get_next(datetime).astimezone(timezone.utc)
+    if interval_seconds:
+        interval = timedelta(seconds=interval_seconds)
+        if anchor is None or anchor > after:
+            return after + interval
+        return anchor + ((after - anchor) // interval + 1) * interval
+    return None
@@ -0,0 +1,52 @@
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Tuple
+
+from application.services.extraction import CompiledSelectors, compile_selectors
+from infrastructure.cache.lru import LRUCache
+from infrastructure.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SelectorCache:
+    """
+    Caché LRU de selectores compilados por versión de ScrapeConfig.
+
+    La versión es (id, updated_at): cualquier edición de la configuración cambia
+    updated_at, así que la entrada anterior deja de coincidir y se recompila en el
+    siguiente uso, incluso en procesos que no vieron la edición. Por cada id solo
+    se guarda la versión más reciente; las de configs borradas salen por LRU.
+    """
+
+    def __init__(self, maxsize: int = settings.SELECTOR_CACHE_SIZE):
+        self._cache: LRUCache[Tuple[uuid.UUID, datetime], CompiledSelectors] = LRUCache(
+            maxsize
+        )
+        # Última versión vista de cada config, para liberar la anterior al cambiar
+        self._latest: Dict[uuid.UUID, datetime] = {}
+
+    def get_compiled(
+        self, config_id: uuid.UUID, updated_at: datetime, selectors: Dict[str, Any]
+    ) -> CompiledSelectors:
+        compiled = self._cache.get((config_id, updated_at))
+        if compiled is not None:
+            return compiled
+        compiled = compile_selectors(selectors)
+        previous = self._latest.get(config_id)
+        if previous is not None and previous != updated_at:
+            self._cache.pop((config_id, previous))
+        self._cache.set((config_id, updated_at), compiled)
+        self._latest[config_id] = updated_at
+        return compiled
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._latest.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+selector_cache = SelectorCache()
@@ -0,0 +1,233 @@
+import codecs
+import csv
+import json
+import logging
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from fastapi import Request
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.schemas.url import UrlBulkError, UrlBulkResult, UrlCreate
+from domain.exceptions import ValidationError
+from infrastructure.database.repositories.url_repo import BULK_CHUNK_SIZE, url_repo
+
+logger = logging.getLogger(__name__)
+
+NDJSON_CONTENT_TYPES = (
+    "application/x-ndjson",
+    "application/jsonl",
+    "application/ndjson",
+)
+CSV_CONTENT_TYPES = ("text/csv", "application/csv")
+
+
+async def _iter_text(request: Request) -> AsyncIterator[str]:
+    """
+    Decodifica el cuerpo como UTF-8 a medida que llega. El decodificador incremental
+    guarda los bytes de un carácter partido entre dos trozos; un BOM inicial se
+    descarta (CSV exportados desde Excel).
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    try:
+        async for chunk in request.stream():
+            yield decoder.decode(chunk)
+        yield decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        raise ValidationError(f"Request body is not valid UTF-8 ({e.reason}).")
+
+
+async def _iter_lines(request: Request) -> AsyncIterator[str]:
+    """
+    Itera las líneas del cuerpo de la petición, con su salto de línea, sin cargarlo
+    entero en memoria.
+    """
+    buffer = ""
+    async for text in _iter_text(request):
+        buffer += text
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line + "\n"
+    if buffer:
+        yield buffer
+
+
+async def _iter_ndjson_rows(request: Request) -> AsyncIterator[Any]:
+    async for line in _iter_lines(request):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            # Se entrega la excepción como fila para reportarla con su índice
+            yield e
+
+
+class _LineFeed:
+    """Iterador de líneas para csv.reader que se rellena a medida que llegan."""
+
+    def __init__(self):
+        self.lines: Deque[str] = deque()
+
+    def __iter__(self) -> "_LineFeed":
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+async def _iter_csv_records(
+    request: Request,
+) -> AsyncIterator[Union[List[str], csv.Error]]:
+    """
+    Registros CSV del cuerpo, leídos por un único csv.reader. Un campo entre comillas
+    puede contener saltos de línea, así que las líneas se acumulan hasta cerrar las
+    comillas (número par) antes de entregárselas al reader.
+    """
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+
+    def parse() -> Iterator[Union[List[str], csv.Error]]:
+        while feed.lines:
+            try:
+                yield next(reader)
+            except csv.Error as e:
+                # Como en NDJSON, el error se reporta como fila
+                yield e
+
+    pending: List[str] = []
+    quotes = 0
+    async for line in _iter_lines(request):
+        pending.append(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+        feed.lines.extend(pending)
+        pending, quotes = [], 0
+        for record in parse():
+            yield record
+    # Comillas sin cerrar al final del cuerpo: el reader entrega lo que haya
+    feed.lines.extend(pending)
+    for record in parse():
+        yield record
+
+
+async def _iter_csv_rows(request: Request) -> AsyncIterator[Any]:
+    header: Optional[List[str]] = None
+    async for values in _iter_csv_records(request):
+        if isinstance(values, csv.Error):
+            if header is None:
+                raise ValidationError(f"Invalid CSV header: {values}")
+            yield values
+            continue
+        if not any(value.strip() for value in values):
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        # Las celdas vacías se tratan como ausentes para que apliquen los defaults
+        yield {
+            name: value
+            for name, value in zip(header, values)
+            if value is not None and value != ""
+        }
+
+
+async def iter_request_rows(request: Request) -> AsyncIterator[Any]:
+    """
+    Devuelve las filas crudas de la petición según su Content-Type:
+    - application/json: una lista JSON de objetos.
+    - application/x-ndjson: un objeto JSON por línea (streaming).
+    - text/csv: cabecera con los nombres de campo y una URL por línea (streaming).
+    """
+    content_type = request.headers.get("content-type", "application/json")
+    media_type = content_type.split(";")[0].strip().lower()
+
+    if media_type in NDJSON_CONTENT_TYPES:
+        async for row in _iter_ndjson_rows(request):
+            yield row
+    elif media_type in CSV_CONTENT_TYPES:
+        async for row in _iter_csv_rows(request):
+            yield row
+    elif media_type == "application/json":
+        try:
+            payload = await request.json()
+        except ValueError:
+            # JSONDecodeError o UnicodeDecodeError (cuerpo que no es UTF-8)
+            raise ValidationError("Request body is not valid JSON.")
+        if not isinstance(payload, list):
+            raise ValidationError("Expected a JSON array of URL objects.")
+        for row in payload:
+            yield row
+    else:
+        raise ValidationError(f"Unsupported content type for bulk upload: {media_type}")
+
+
+def validate_row(
+    index: int, row: Any
+) -> Tuple[Optional[UrlCreate], Optional[UrlBulkError]]:
+    """Valida una fila contra UrlCreate y devuelve el objeto o el error de esa fila."""
+    if isinstance(row, json.JSONDecodeError):
+        return None, UrlBulkError(
+            index=index, errors=[{"type": "json_invalid", "msg": str(row)}]
+        )
+    if isinstance(row, csv.Error):
+        return None, UrlBulkError(
+            index=index, errors=[{"type": "csv_invalid", "msg": str(row)}]
+        )
+    try:
+        return UrlCreate.model_validate(row), None
+    except PydanticValidationError as e:
+        errors: List[Dict[str, Any]] = e.errors(
+            include_url=False, include_context=False
+        )
+        return None, UrlBulkError(index=index, errors=errors)
+
+
+async def ingest_urls(
+    db: AsyncSession, request: Request, chunk_size: int = BULK_CHUNK_SIZE
+) -> UrlBulkResult:
+    """
+    Valida y carga en bloque las URLs de la petición dentro de una única transacción.
+    Las filas inválidas se reportan con su índice y no abortan el resto del lote.
+    """
+    errors: List[UrlBulkError] = []
+
+    async def valid_rows() -> AsyncIterator[UrlCreate]:
+        index = 0
+        async for row in iter_request_rows(request):
+            obj_in, error = validate_row(index, row)
+            index += 1
+            if error is not None:
+                errors.append(error)
+            else:
+                yield obj_in
+
+    result = await url_repo.create_bulk_stream(
+        db, objs_in=valid_rows(), chunk_size=chunk_size
+    )
+    logger.info(
+        "Bulk URL ingestion finished: %s inserted, %s duplicates, %s rejected",
+        result.inserted,
+        result.duplicates,
+        len(errors),
+    )
+    return UrlBulkResult(
+        inserted=result.inserted,
+        duplicates=result.duplicates,
+        ids=result.ids,
+        errors=errors,
+    )
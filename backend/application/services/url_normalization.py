@@ -0,0 +1,75 @@
+import hashlib
+from urllib.parse import parse_qsl, urldefrag, urlencode, urlsplit, urlunsplit
+
+# Parámetros de seguimiento que no cambian el contenido de la página
+TRACKING_PARAMS = frozenset(
+    {
+        "gclid",
+        "dclid",
+        "fbclid",
+        "msclkid",
+        "yclid",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "_ga",
+        "_hsenc",
+        "_hsmi",
+        "ref_src",
+    }
+)
+TRACKING_PREFIXES = ("utm_",)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Bytes del hash de la URL normalizada (blake2b-128): ancho fijo para el índice único
+URL_HASH_SIZE = 16
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def normalize_url(url: str) -> str:
+    """
+    Forma canónica de una URL para detectar duplicados:
+    - esquema y host en minúsculas, sin el puerto por defecto del esquema;
+    - ruta vacía como "/";
+    - sin fragmento (#...) ni parámetros de seguimiento (utm_*, gclid, ...);
+    - parámetros de la query ordenados por nombre y valor.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:  # IPv6
+        host = f"[{host}]"
+    netloc = host
+    if parts.port is not None and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    if parts.username is not None:
+        userinfo = parts.username
+        if parts.password is not None:
+            userinfo = f"{userinfo}:{parts.password}"
+        netloc = f"{userinfo}@{netloc}"
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    )
+    return urlunsplit((scheme, netloc, parts.path or "/", urlencode(query), ""))
+
+
+def strip_fragment(url: str) -> str:
+    """
+    URL tal como se pidió, sin el fragmento (#...), que nunca llega al servidor.
+    Es la que se guarda y se descarga: la forma normalizada solo sirve para el hash.
+    """
+    return urldefrag(url.strip()).url
+
+
+def url_hash(normalized_url: str) -> bytes:
+    """Hash de ancho fijo de una URL ya normalizada (clave de de-duplicación)."""
+    return hashlib.blake2b(
+        normalized_url.encode("utf-8"), digest_size=URL_HASH_SIZE
+    ).digest()
@@ -0,0 +1,6 @@
+"""
+Benchmarks reproducibles de las rutas calientes (repositorios y API HTTP).
+
+Se ejecutan contra una base de datos Postgres local y desechable; ver
+`python -m benchmarks --help` y la sección "Benchmarks" del readme.
+"""
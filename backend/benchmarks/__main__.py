@@ -0,0 +1,199 @@
+import argparse
+import asyncio
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+from application.services.extraction_executor import ExtractionExecutor
+from benchmarks import api, extraction, repository, report, seed, serialization
+from benchmarks.runner import run_scenarios
+from infrastructure.config.logger import setup_logging
+from infrastructure.database.session import async_engine
+
+setup_logging()
+
+logger = logging.getLogger(__name__)
+
+SUITES = ("repo", "api", "extraction", "serialization")
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmarks de repositorios y API contra un Postgres local desechable."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_cmd = commands.add_parser(
+        "seed", help="Crea el esquema y siembra datos sintéticos"
+    )
+    seed_cmd.add_argument(
+        "--scale", default="10k", help="10k, 1m, 10m o número de URLs (default: 10k)"
+    )
+    seed_cmd.add_argument(
+        "--reset",
+        action="store_true",
+        help="Vacía las tablas antes de sembrar (¡destructivo!)",
+    )
+    seed_cmd.add_argument(
+        "--i-know",
+        action="store_true",
+        help="Permite --reset contra una base que no es local",
+    )
+
+    run_cmd = commands.add_parser("run", help="Ejecuta las suites y guarda un JSON")
+    run_cmd.add_argument(
+        "--suite",
+        default="repo",
+        help=f"Suites separadas por comas: {', '.join(SUITES)} (default: repo)",
+    )
+    run_cmd.add_argument(
+        "--concurrency",
+        type=_int_list,
+        default=[1, 8, 32],
+        help="Niveles de concurrencia separados por comas (default: 1,8,32)",
+    )
+    run_cmd.add_argument(
+        "--duration", type=float, default=10.0, help="Segundos medidos por escenario"
+    )
+    run_cmd.add_argument(
+        "--warmup",
+        type=float,
+        default=1.0,
+        help="Segundos de calentamiento descartados",
+    )
+    run_cmd.add_argument(
+        "--only",
+        default=None,
+        help="Ejecuta solo escenarios cuyo nombre contenga este texto",
+    )
+    run_cmd.add_argument(
+        "--base-url",
+        default="http://127.0.0.1:8000",
+        help="URL de la API ya arrancada (suite api)",
+    )
+    run_cmd.add_argument(
+        "--scale-label",
+        default=None,
+        help="Etiqueta de escala guardada en el resultado",
+    )
+    run_cmd.add_argument(
+        "--output", type=Path, default=None, help="Fichero JSON de resultados"
+    )
+
+    compare_cmd = commands.add_parser(
+        "compare", help="Compara dos ficheros de resultados"
+    )
+    compare_cmd.add_argument("baseline", type=Path)
+    compare_cmd.add_argument("current", type=Path)
+    return parser.parse_args()
+
+
+async def run_seed(args: argparse.Namespace) -> None:
+    rows = seed.resolve_scale(args.scale)
+    await seed.ensure_schema(async_engine)
+    if args.reset:
+        await seed.reset(async_engine, allow_remote=args.i_know)
+    sizes = await seed.seed(async_engine, rows)
+    logger.info("Dataset ready: %s", sizes)
+
+
+async def run_benchmarks(args: argparse.Namespace) -> None:
+    suites = [s.strip() for s in args.suite.split(",") if s.strip()]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        raise SystemExit(f"Unknown suites: {', '.join(sorted(unknown))}")
+
+    dataset = await seed.dataset_size(async_engine)
+    scale = args.scale_label or f"{dataset.get('scrape_url', 0)} urls"
+    results = []
+    options = {
+        "suites": suites,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "warmup": args.warmup,
+        "only": args.only,
+    }
+
+    def _selected(scenarios):
+        return [s for s in scenarios if not args.only or args.only in s.name]
+
+    if "repo" in suites:
+        scenarios = _selected(await repository.build_scenarios())
+        results += await run_scenarios(
+            "repo",
+            scenarios,
+            concurrency_levels=args.concurrency,
+            duration=args.duration,
+            warmup=args.warmup,
+        )
+    if "api" in suites:
+        options["base_url"] = args.base_url
+        async with api.create_bench_client(
+            args.base_url, max(args.concurrency)
+        ) as client:
+            scenarios = _selected(await api.build_scenarios(client))
+            results += await run_scenarios(
+                "api",
+                scenarios,
+                concurrency_levels=args.concurrency,
+                duration=args.duration,
+                warmup=args.warmup,
+            )
+
+    if "extraction" in suites:
+        executor = ExtractionExecutor()
+        executor.start()
+        try:
+            results += await run_scenarios(
+                "extraction",
+                _selected(extraction.build_scenarios(executor)),
+                concurrency_levels=args.concurrency,
+                duration=args.duration,
+                warmup=args.warmup,
+            )
+        finally:
+            executor.shutdown()
+    if "serialization" in suites:
+        results += await run_scenarios(
+            "serialization",
+            _selected(serialization.build_scenarios()),
+            concurrency_levels=args.concurrency,
+            duration=args.duration,
+            warmup=args.warmup,
+        )
+
+    output = args.output or Path(
+        f"bench-results-{datetime.now().strftime('%Y%m%dT%H%M%S')}.json"
+    )
+    report.write_results(
+        output,
+        scale=scale,
+        dataset=dataset,
+        env=await report.environment(async_engine),
+        options=options,
+        results=results,
+    )
+    logger.info("Wrote %s results to %s", len(results), output)
+
+
+async def main() -> None:
+    args = parse_args()
+    if args.command == "compare":
+        print("\n".join(report.compare(args.baseline, args.current)))
+        return
+    try:
+        if args.command == "seed":
+            await run_seed(args)
+        else:
+            await run_benchmarks(args)
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
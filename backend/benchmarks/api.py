@@ -0,0 +1,82 @@
+import itertools
+import uuid
+from typing import List
+
+import httpx
+
+from benchmarks.repository import delete_urls, sample_ids
+from benchmarks.runner import Scenario
+from benchmarks.seed import BENCH_URL_PREFIX
+from infrastructure.config.settings import settings
+
+PAGE_SIZE = 50
+
+
+class HttpStatusError(Exception):
+    """Respuesta con un código distinto del esperado (cuenta como error)."""
+
+
+def create_bench_client(base_url: str, concurrency: int) -> httpx.AsyncClient:
+    """Cliente con tantas conexiones como tareas concurrentes, para no medir colas locales."""
+    return httpx.AsyncClient(
+        base_url=base_url.rstrip("/") + settings.API_V1_STR,
+        limits=httpx.Limits(
+            max_connections=concurrency, max_keepalive_connections=concurrency
+        ),
+        timeout=httpx.Timeout(30.0),
+    )
+
+
+async def build_scenarios(client: httpx.AsyncClient) -> List[Scenario]:
+    """Escenarios de las rutas más usadas de la API sobre los datos sembrados."""
+    config_ids = itertools.cycle(await sample_ids("scrape_config"))
+    url_ids = itertools.cycle(await sample_ids("scrape_url"))
+    job_ids = itertools.cycle(await sample_ids("scraping_job"))
+    first_config_id = next(config_ids)
+
+    async def request(
+        method: str, path: str, expected: int, **kwargs
+    ) -> httpx.Response:
+        response = await client.request(method, path, **kwargs)
+        if response.status_code != expected:
+            raise HttpStatusError(f"{method} {path} -> {response.status_code}")
+        return response
+
+    async def get_config(_i):
+        return await request("GET", f"/configs/{next(config_ids)}", 200)
+
+    async def list_configs(_i):
+        return await request("GET", "/configs/", 200, params={"limit": PAGE_SIZE})
+
+    async def get_url(_i):
+        return await request("GET", f"/urls/urls/{next(url_ids)}", 200)
+
+    async def list_urls(_i):
+        return await request("GET", "/urls/urls/", 200, params={"limit": PAGE_SIZE})
+
+    async def get_job(_i):
+        return await request("GET", f"/jobs/{next(job_ids)}", 200)
+
+    async def create_url(i):
+        return await request(
+            "POST",
+            "/urls/urls/",
+            201,
+            json={
+                "url": f"{BENCH_URL_PREFIX}http/{i}",
+                "config_id": str(first_config_id),
+            },
+        )
+
+    return [
+        Scenario("GET /configs/{id}", get_config),
+        Scenario("GET /configs/", list_configs, params={"limit": PAGE_SIZE}),
+        Scenario("GET /urls/urls/{id}", get_url),
+        Scenario("GET /urls/urls/", list_urls, params={"limit": PAGE_SIZE}),
+        Scenario("GET /jobs/{id}", get_job),
+        Scenario(
+            "POST /urls/urls/",
+            create_url,
+            cleanup=lambda response: delete_urls([uuid.UUID(response.json()["id"])]),
+        ),
+    ]
@@ -0,0 +1,58 @@
+import uuid
+from datetime import datetime, timezone
+from typing import List
+
+from application.services.extraction_executor import (
+    ExtractionExecutor,
+    available_cpus,
+)
+from benchmarks.runner import Scenario
+
+# Página sintética de tamaño realista (~100 KB) con los campos que buscan los selectores
+PRODUCTS_PER_PAGE = 400
+SELECTORS = {
+    "title": "h1.title::text",
+    "price": "span.price",
+    "links": {"css": "li.product a", "attr": "href", "multiple": True},
+    "names": {"xpath": "//li[@class='product']/a/text()", "multiple": True},
+}
+
+
+def synthetic_page(products: int = PRODUCTS_PER_PAGE) -> bytes:
+    items = "".join(
+        f'<li class="product"><a href="/p/{i}">Producto {i}</a>'
+        f'<span class="price">{i}.99</span><p>{"lorem ipsum " * 8}</p></li>'
+        for i in range(products)
+    )
+    return (
+        "<html><head><title>Bench</title></head><body>"
+        f'<h1 class="title">Catálogo</h1><ul>{items}</ul></body></html>'
+    ).encode()
+
+
+def build_scenarios(executor: ExtractionExecutor) -> List[Scenario]:
+    """
+    Parseo + selectores de la misma página en el propio proceso (bloquea el loop) y
+    en el pool de procesos; con concurrencia >= núcleos, el pool debería escalar
+    de forma casi lineal con `processes`.
+    """
+    body = synthetic_page()
+    config_id = uuid.uuid4()
+    updated_at = datetime.now(timezone.utc)
+    inline = ExtractionExecutor(processes=-1)
+    params = {"page_bytes": len(body), "cpus": available_cpus()}
+
+    async def extract_inline(_i):
+        return await inline.extract(config_id, updated_at, SELECTORS, body)
+
+    async def extract_pool(_i):
+        return await executor.extract(config_id, updated_at, SELECTORS, body)
+
+    return [
+        Scenario("extraction.inline", extract_inline, params=params),
+        Scenario(
+            "extraction.process_pool",
+            extract_pool,
+            params={**params, "processes": executor.processes},
+        ),
+    ]
@@ -0,0 +1,103 @@
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from infrastructure.config.settings import settings
+
+# Versión del formato de resultados; incrementarla si cambian las claves
+RESULTS_FORMAT_VERSION = 1
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def environment(engine: AsyncEngine) -> Dict[str, Any]:
+    """Metadatos necesarios para saber si dos ejecuciones son comparables."""
+    async with engine.connect() as conn:
+        server_version = await conn.scalar(text("SHOW server_version"))
+    return {
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "postgres": server_version,
+        "db_pool_size": settings.DB_POOL_SIZE,
+        "db_max_overflow": settings.DB_MAX_OVERFLOW,
+    }
+
+
+def write_results(
+    path: Path,
+    *,
+    scale: str,
+    dataset: Dict[str, int],
+    env: Dict[str, Any],
+    options: Dict[str, Any],
+    results: List[Dict[str, Any]],
+) -> None:
+    document = {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "scale": scale,
+        "dataset": dataset,
+        "environment": env,
+        "options": options,
+        "results": results,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2, default=str), encoding="utf-8")
+
+
+def _index(document: Dict[str, Any]) -> Dict[Tuple[str, str, int], Dict[str, Any]]:
+    return {(r["suite"], r["name"], r["concurrency"]): r for r in document["results"]}
+
+
+def _change(baseline: float, current: float) -> str:
+    if not baseline:
+        return "n/a"
+    return f"{(current - baseline) / baseline * 100:+.1f}%"
+
+
+def compare(baseline_path: Path, current_path: Path) -> List[str]:
+    """Tabla de diferencias (throughput, p50, p99) entre dos ficheros de resultados."""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    current = json.loads(current_path.read_text(encoding="utf-8"))
+    lines = []
+    if baseline.get("scale") != current.get("scale"):
+        lines.append(
+            f"WARNING: different scales ({baseline.get('scale')} vs {current.get('scale')})"
+        )
+    lines.append(
+        f"{'suite':<6} {'scenario':<40} {'conc':>4} "
+        f"{'ops/s':>10} {'Δ':>8} {'p50 ms':>9} {'Δ':>8} {'p99 ms':>9} {'Δ':>8}"
+    )
+    base_index = _index(baseline)
+    for key, result in _index(current).items():
+        suite, name, concurrency = key
+        base = base_index.get(key)
+        if base is None:
+            lines.append(f"{suite:<6} {name:<40} {concurrency:>4} (new)")
+            continue
+        lines.append(
+            f"{suite:<6} {name:<40} {concurrency:>4} "
+            f"{result['throughput_ops']:>10.1f} "
+            f"{_change(base['throughput_ops'], result['throughput_ops']):>8} "
+            f"{result['p50_ms']:>9.2f} {_change(base['p50_ms'], result['p50_ms']):>8} "
+            f"{result['p99_ms']:>9.2f} {_change(base['p99_ms'], result['p99_ms']):>8}"
+        )
+    return lines
@@ -0,0 +1,217 @@
+import itertools
+import logging
+import uuid
+from typing import Any, List
+
+from sqlalchemy import delete, text
+
+from application.schemas.config import ConfigCreate, ConfigUpdate
+from application.schemas.url import UrlCreate
+from benchmarks.runner import Scenario, SetupFn
+from benchmarks.seed import BENCH_SITE_PREFIX, BENCH_URL_PREFIX
+from domain.models.scrape_url import ScrapeUrl
+from infrastructure.database.repositories.config_repo import config_repo
+from infrastructure.database.repositories.url_repo import url_repo
+from infrastructure.database.session import AsyncSessionFactory
+
+logger = logging.getLogger(__name__)
+
+# Tamaño de las muestras de ids con las que se reparten las lecturas puntuales
+SAMPLE_SIZE = 5000
+PAGE_SIZE = 50
+BULK_SIZE = 1000
+DEEP_OFFSET = 10_000
+BENCH_WORKER_ID = "benchmark"
+
+
+async def sample_ids(table: str, size: int = SAMPLE_SIZE) -> List[uuid.UUID]:
+    """
+    Muestra aleatoria de ids con TABLESAMPLE SYSTEM: lee solo algunas páginas, así
+    que su coste no depende del tamaño de la tabla.
+    """
+    async with AsyncSessionFactory() as db:
+        estimated = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table"),
+            {"table": table},
+        )
+        pct = (
+            100.0
+            if not estimated or estimated <= 0
+            else min(100.0, 200.0 * size / estimated)
+        )
+        result = await db.execute(
+            text(f"SELECT id FROM {table} TABLESAMPLE SYSTEM ({pct}) LIMIT :size"),
+            {"size": size},
+        )
+        ids = list(result.scalars().all())
+    if not ids:
+        raise RuntimeError(
+            f"No rows in {table}; run 'python -m benchmarks seed' first."
+        )
+    return ids
+
+
+def _cycle(values: List[Any]) -> SetupFn:
+    """setup() que reparte los valores de la muestra en rotación."""
+    iterator = itertools.cycle(values)
+
+    async def _setup(_i: int) -> Any:
+        return next(iterator)
+
+    return _setup
+
+
+async def delete_urls(ids: List[uuid.UUID]) -> None:
+    async with AsyncSessionFactory() as db:
+        await db.execute(delete(ScrapeUrl).where(ScrapeUrl.id.in_(ids)))
+        await db.commit()
+
+
+async def build_scenarios() -> List[Scenario]:
+    """Escenarios de BaseRepository y de la cola de URLs sobre los datos sembrados."""
+    config_ids = await sample_ids("scrape_config")
+    url_ids = await sample_ids("scrape_url")
+    logger.info("Sampled %s config ids and %s URL ids", len(config_ids), len(url_ids))
+    async with AsyncSessionFactory() as db:
+        anchor = await url_repo.get(db, url_ids[0])
+        deep_cursor = url_repo.encode_cursor(anchor)
+
+    async def get_config_cached(config_id):
+        async with AsyncSessionFactory() as db:
+            return await config_repo.get(db, config_id)
+
+    async def get_config_uncached(config_id):
+        async with AsyncSessionFactory() as db:
+            return await config_repo.get(db, config_id, use_cache=False)
+
+    async def get_url(url_id):
+        async with AsyncSessionFactory() as db:
+            return await url_repo.get(db, url_id)
+
+    url_batches = [
+        url_ids[i : i + PAGE_SIZE] for i in range(0, len(url_ids), PAGE_SIZE)
+    ]
+
+    async def get_many_urls(ids):
+        async with AsyncSessionFactory() as db:
+            return await url_repo.get_many(db, ids)
+
+    async def get_page_first(_i):
+        async with AsyncSessionFactory() as db:
+            return await url_repo.get_page(db, limit=PAGE_SIZE)
+
+    async def get_page_deep(_i):
+        async with AsyncSessionFactory() as db:
+            return await url_repo.get_page(db, cursor=deep_cursor, limit=PAGE_SIZE)
+
+    async def get_multi_offset(_i):
+        async with AsyncSessionFactory() as db:
+            return await url_repo.get_multi(db, skip=DEEP_OFFSET, limit=PAGE_SIZE)
+
+    async def pending_ordered(_i):
+        async with AsyncSessionFactory() as db:
+            return await url_repo.get_pending_urls_ordered(db, limit=100)
+
+    async def claim(_i):
+        async with AsyncSessionFactory() as db:
+            return await url_repo.claim_pending_urls(
+                db, worker_id=BENCH_WORKER_ID, limit=PAGE_SIZE
+            )
+
+    async def release(claimed):
+        async with AsyncSessionFactory() as db:
+            await url_repo.release_leases(
+                db, worker_id=BENCH_WORKER_ID, url_ids=[u.id for u in claimed]
+            )
+
+    async def create_config(i):
+        async with AsyncSessionFactory() as db:
+            return await config_repo.create(
+                db,
+                obj_in=ConfigCreate(
+                    site_name=f"{BENCH_SITE_PREFIX}new-{i}", selectors={"title": "h1"}
+                ),
+            )
+
+    async def remove_config(config):
+        async with AsyncSessionFactory() as db:
+            return await config_repo.remove(db, id=config.id)
+
+    next_config_id = _cycle(config_ids)
+
+    async def load_config(i):
+        async with AsyncSessionFactory() as db:
+            return await config_repo.get_or_404(
+                db, await next_config_id(i), use_cache=False
+            )
+
+    async def update_config(config):
+        async with AsyncSessionFactory() as db:
+            return await config_repo.update(
+                db, db_obj=config, obj_in=ConfigUpdate(site_name=config.site_name)
+            )
+
+    async def create_url(i):
+        async with AsyncSessionFactory() as db:
+            return await url_repo.create(
+                db,
+                obj_in=UrlCreate(
+                    url=f"{BENCH_URL_PREFIX}new/{i}", config_id=config_ids[0]
+                ),
+            )
+
+    async def create_urls_bulk(i):
+        objs_in = [
+            UrlCreate(url=f"{BENCH_URL_PREFIX}bulk/{i}/{n}", config_id=config_ids[0])
+            for n in range(BULK_SIZE)
+        ]
+        async with AsyncSessionFactory() as db:
+            return (await url_repo.create_bulk(db, objs_in=objs_in)).ids
+
+    return [
+        Scenario(
+            "config_repo.get[cached]", get_config_cached, setup=_cycle(config_ids)
+        ),
+        Scenario(
+            "config_repo.get[uncached]", get_config_uncached, setup=_cycle(config_ids)
+        ),
+        Scenario("url_repo.get", get_url, setup=_cycle(url_ids)),
+        Scenario(
+            "url_repo.get_many",
+            get_many_urls,
+            setup=_cycle(url_batches),
+            params={"ids": PAGE_SIZE},
+        ),
+        Scenario(
+            "url_repo.get_page[first]", get_page_first, params={"limit": PAGE_SIZE}
+        ),
+        Scenario("url_repo.get_page[deep]", get_page_deep, params={"limit": PAGE_SIZE}),
+        Scenario(
+            "url_repo.get_multi[offset]",
+            get_multi_offset,
+            params={"skip": DEEP_OFFSET, "limit": PAGE_SIZE},
+        ),
+        Scenario(
+            "url_repo.get_pending_urls_ordered", pending_ordered, params={"limit": 100}
+        ),
+        Scenario(
+            "url_repo.claim_pending_urls",
+            claim,
+            cleanup=release,
+            params={"limit": PAGE_SIZE},
+        ),
+        Scenario("config_repo.create", create_config, cleanup=remove_config),
+        Scenario("config_repo.update", update_config, setup=load_config),
+        Scenario("config_repo.remove", remove_config, setup=create_config),
+        Scenario(
+            "url_repo.create",
+            create_url,
+            cleanup=lambda url: delete_urls([url.id]),
+        ),
+        Scenario(
+            "url_repo.create_bulk",
+            create_urls_bulk,
+            cleanup=delete_urls,
+            params={"rows": BULK_SIZE},
+        ),
+    ]
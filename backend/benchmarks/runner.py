@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import math
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# setup(i) -> arg (no cronometrado); run(arg) -> resultado (cronometrado);
+# cleanup(resultado) (no cronometrado, p. ej. devolver la fila a su estado inicial)
+SetupFn = Callable[[int], Awaitable[Any]]
+RunFn = Callable[[Any], Awaitable[Any]]
+CleanupFn = Callable[[Any], Awaitable[None]]
+
+
+@dataclass
+class Scenario:
+    """Una operación a medir, con preparación y limpieza fuera del cronómetro."""
+
+    name: str
+    run: RunFn
+    setup: Optional[SetupFn] = None
+    cleanup: Optional[CleanupFn] = None
+    # Etiquetas libres que acompañan al resultado (límite, tamaño de lote, ...)
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(
+    latencies: List[float], errors: Counter, wall_seconds: float
+) -> Dict[str, Any]:
+    """Resume latencias (segundos) en métricas en milisegundos y throughput."""
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "count": count,
+        "errors": sum(errors.values()),
+        "error_types": dict(errors),
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_ops": round(count / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+        "mean_ms": round(sum(values) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p90_ms": round(percentile(values, 90) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if count else 0.0,
+    }
+
+
+async def measure(
+    scenario: Scenario,
+    *,
+    concurrency: int,
+    duration: float,
+    warmup: float = 1.0,
+) -> Dict[str, Any]:
+    """
+    Ejecuta `scenario` con `concurrency` tareas en bucle durante `duration` segundos.
+
+    Cada tarea repite setup -> run -> cleanup y solo se cronometra `run`. Las
+    iteraciones del calentamiento (`warmup` segundos) no cuentan en el resultado.
+    """
+    latencies: List[float] = []
+    errors: Counter = Counter()
+    counter = iter(range(1 << 62))
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    measure_from = start + warmup
+    deadline = measure_from + duration
+
+    async def _task() -> None:
+        while True:
+            now = loop.time()
+            if now >= deadline:
+                return
+            recording = now >= measure_from
+            i = next(counter)
+            arg = await scenario.setup(i) if scenario.setup else i
+            began = time.perf_counter()
+            try:
+                result = await scenario.run(arg)
+            except Exception as e:
+                if recording:
+                    errors[type(e).__name__] += 1
+                continue
+            elapsed = time.perf_counter() - began
+            if recording:
+                latencies.append(elapsed)
+            if scenario.cleanup:
+                await scenario.cleanup(result)
+
+    await asyncio.gather(*(_task() for _ in range(concurrency)))
+    wall = max(loop.time() - measure_from, 0.0)
+    summary = summarize(latencies, errors, wall)
+    logger.info(
+        "%s (concurrency=%s): %s ops, %s ops/s, p50=%sms p99=%sms, errors=%s",
+        scenario.name,
+        concurrency,
+        summary["count"],
+        summary["throughput_ops"],
+        summary["p50_ms"],
+        summary["p99_ms"],
+        summary["errors"],
+    )
+    return {
+        "name": scenario.name,
+        "concurrency": concurrency,
+        "params": scenario.params,
+        **summary,
+    }
+
+
+async def run_scenarios(
+    suite: str,
+    scenarios: List[Scenario],
+    *,
+    concurrency_levels: List[int],
+    duration: float,
+    warmup: float,
+) -> List[Dict[str, Any]]:
+    results = []
+    for scenario in scenarios:
+        for concurrency in concurrency_levels:
+            result = await measure(
+                scenario, concurrency=concurrency, duration=duration, warmup=warmup
+            )
+            results.append({"suite": suite, **result})
+    return results
@@ -0,0 +1,234 @@
+import logging
+import time
+from pathlib import Path
+from typing import Dict
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from infrastructure.config.settings import settings
+from infrastructure.database.notifications import asyncpg_dsn
+
+logger = logging.getLogger(__name__)
+
+# Escalas predefinidas (número de filas de scrape_url)
+SCALES: Dict[str, int] = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+
+# Marcas de los datos sintéticos, para distinguirlos de datos reales
+BENCH_SITE_PREFIX = "bench-"
+BENCH_URL_PREFIX = "https://bench.example.com/"
+
+# Filas de scrape_url por sentencia INSERT ... SELECT generate_series
+SEED_BATCH_ROWS = 1_000_000
+
+SCHEMA_FILE = (
+    Path(__file__).resolve().parent.parent
+    / "infrastructure"
+    / "database"
+    / "init_supabase_db.sql"
+)
+
+# En un Postgres local pueden faltar la extensión uuid-ossp y el esquema auth de
+# Supabase que usa init_supabase_db.sql; se crean equivalentes mínimos antes de
+# aplicarlo (gen_random_uuid() es nativa desde Postgres 13).
+_LOCAL_PREREQUISITES = """
+DO $$
+BEGIN
+    CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+EXCEPTION WHEN feature_not_supported THEN
+    CREATE OR REPLACE FUNCTION uuid_generate_v4() RETURNS uuid
+        LANGUAGE sql VOLATILE AS 'SELECT gen_random_uuid()';
+END
+$$;
+CREATE SCHEMA IF NOT EXISTS auth;
+CREATE OR REPLACE FUNCTION auth.uid() RETURNS uuid
+    LANGUAGE sql STABLE AS 'SELECT NULL::uuid';
+"""
+
+_SEED_CONFIGS = text("""
+    INSERT INTO scrape_config (site_name, selectors, created_at, updated_at)
+    SELECT
+        CAST(:prefix AS text) || g,
+        '{"title": "h1::text", "price": ".price::text", "link": "a::attr(href)"}'::jsonb,
+        now() - make_interval(secs => CAST(:n AS integer) - g),
+        now() - make_interval(secs => CAST(:n AS integer) - g)
+    FROM generate_series(1, :n) AS g
+    """)
+
+_SEED_JOBS = text("""
+    INSERT INTO scraping_job (started_at, status)
+    SELECT now() - make_interval(secs => CAST(:n AS integer) - g), 'running'
+    FROM generate_series(1, :n) AS g
+    """)
+
+# 20% pending, 5% failed y 75% success; prioridades 1..10 repartidas por igual.
+# Los ids de configs/jobs se indexan en arrays para repartir las URLs sin joins.
+_SEED_URLS = text("""
+    WITH c AS (
+        SELECT array_agg(id ORDER BY id) AS ids FROM scrape_config
+        WHERE site_name LIKE CAST(:prefix AS text) || '%'
+    ), j AS (
+        SELECT array_agg(id ORDER BY id) AS ids FROM scraping_job
+        WHERE status = 'running'
+    )
+    INSERT INTO scrape_url (
+        config_id, job_id, url, status, created_at, last_scraped_at, priority
+    )
+    SELECT
+        c.ids[1 + g % cardinality(c.ids)],
+        j.ids[1 + g % cardinality(j.ids)],
+        CAST(:url_prefix AS text) || (g % cardinality(c.ids)) || '/' || g,
+        CASE WHEN g % 20 < 4 THEN 'pending' WHEN g % 20 = 4 THEN 'failed' ELSE 'success' END,
+        now() - make_interval(secs => CAST(:total AS integer) - g),
+        CASE WHEN g % 20 < 4 THEN NULL
+             ELSE now() - make_interval(secs => CAST(:total AS integer) - g) END,
+        1 + g % 10
+    FROM generate_series(CAST(:start AS integer), CAST(:stop AS integer)) AS g, c, j
+    """)
+
+# Los contadores los mantiene la aplicación; aquí se fijan de una vez tras la carga
+_SEED_JOB_COUNTERS = text("""
+    UPDATE scraping_job AS job
+    SET total_urls = s.total, success_count = s.success, error_count = s.failed
+    FROM (
+        SELECT job_id,
+               count(*) AS total,
+               count(*) FILTER (WHERE status = 'success') AS success,
+               count(*) FILTER (WHERE status = 'failed') AS failed
+        FROM scrape_url GROUP BY job_id
+    ) AS s
+    WHERE job.id = s.job_id
+    """)
+
+_TABLES = (
+    "scrape_config",
+    "scraping_job",
+    "scrape_url",
+    "scraped_data",
+    "scrape_result",
+)
+
+# Hosts en los que reset() vacía las tablas sin pedir confirmación (None: socket Unix)
+LOCAL_HOSTS = (None, "", "localhost", "127.0.0.1", "::1")
+
+# Filas estimadas por tabla; las particionadas (scrape_result) suman sus particiones
+_DATASET_SIZE = text("""
+    SELECT t.name, sum(greatest(c.reltuples, 0))::bigint
+    FROM unnest(CAST(:tables AS text[])) AS t(name)
+    JOIN pg_class AS c
+      ON c.oid = to_regclass(t.name)
+      OR c.oid IN (
+          SELECT relid FROM pg_partition_tree(to_regclass(t.name)) WHERE isleaf
+      )
+    WHERE c.relkind = 'r'
+    GROUP BY t.name
+    """)
+
+
+def resolve_scale(scale: str) -> int:
+    """Acepta una escala predefinida (10k, 1m, 10m) o un número de filas."""
+    if scale.lower() in SCALES:
+        return SCALES[scale.lower()]
+    try:
+        rows = int(scale.replace("_", ""))
+    except ValueError:
+        raise ValueError(
+            f"Unknown scale '{scale}'. Use one of {list(SCALES)} or a number."
+        )
+    if rows <= 0:
+        raise ValueError("Scale must be a positive number of rows.")
+    return rows
+
+
+async def ensure_schema(engine: AsyncEngine) -> bool:
+    """Crea el esquema desde init_supabase_db.sql si la base está vacía."""
+    async with engine.connect() as conn:
+        exists = await conn.scalar(text("SELECT to_regclass('public.scrape_url')"))
+    if exists is not None:
+        logger.info("Schema already present, skipping creation")
+        return False
+    script = _LOCAL_PREREQUISITES + SCHEMA_FILE.read_text(encoding="utf-8")
+    # Script con varias sentencias: asyncpg lo envía tal cual por el protocolo simple
+    conn = await asyncpg.connect(asyncpg_dsn(settings.DATABASE_URL))
+    try:
+        await conn.execute(script)
+    finally:
+        await conn.close()
+    logger.info("Schema created from %s", SCHEMA_FILE.name)
+    return True
+
+
+def is_local(url: URL) -> bool:
+    return url.host in LOCAL_HOSTS
+
+
+async def reset(engine: AsyncEngine, *, allow_remote: bool = False) -> None:
+    """
+    Vacía las tablas de datos. Solo para bases desechables: se niega si la base no
+    está en este equipo, salvo con `allow_remote` (seed --reset --i-know).
+    """
+    target = engine.url.render_as_string(hide_password=True)
+    if not is_local(engine.url) and not allow_remote:
+        raise RuntimeError(
+            f"Refusing to truncate {target}: it is not a local database. "
+            "Pass --i-know if it is a throwaway one."
+        )
+    async with engine.begin() as conn:
+        await conn.execute(text(f"TRUNCATE {', '.join(_TABLES)} CASCADE"))
+    logger.warning("Truncated %s in %s", ", ".join(_TABLES), target)
+
+
+async def seed(engine: AsyncEngine, rows: int) -> Dict[str, int]:
+    """
+    Carga `rows` URLs sintéticas, con una config y un job por cada 1.000 URLs
+    (mínimo 10 de cada), generadas en el servidor con generate_series.
+    """
+    async with engine.connect() as conn:
+        existing = await conn.scalar(text("SELECT EXISTS (SELECT 1 FROM scrape_url)"))
+    if existing:
+        raise RuntimeError(
+            "scrape_url already has rows; run 'seed --reset' on a throwaway database."
+        )
+    parents = max(10, rows // 1000)
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        await conn.execute(text("SET LOCAL statement_timeout = 0"))
+        await conn.execute(_SEED_CONFIGS, {"prefix": BENCH_SITE_PREFIX, "n": parents})
+        await conn.execute(_SEED_JOBS, {"n": parents})
+    logger.info("Seeded %s configs and %s jobs", parents, parents)
+
+    for start in range(1, rows + 1, SEED_BATCH_ROWS):
+        stop = min(start + SEED_BATCH_ROWS - 1, rows)
+        async with engine.begin() as conn:
+            await conn.execute(text("SET LOCAL statement_timeout = 0"))
+            await conn.execute(
+                _SEED_URLS,
+                {
+                    "prefix": BENCH_SITE_PREFIX,
+                    "url_prefix": BENCH_URL_PREFIX,
+                    "total": rows,
+                    "start": start,
+                    "stop": stop,
+                },
+            )
+        logger.info("Seeded URLs %s/%s", stop, rows)
+
+    async with engine.begin() as conn:
+        await conn.execute(text("SET LOCAL statement_timeout = 0"))
+        await conn.execute(_SEED_JOB_COUNTERS)
+    # ANALYZE fuera de transacción para que el planificador vea las nuevas tablas
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for table in _TABLES:
+            await conn.execute(text(f"ANALYZE {table}"))
+    logger.info("Seed completed in %.1fs", time.perf_counter() - started)
+    return await dataset_size(engine)
+
+
+async def dataset_size(engine: AsyncEngine) -> Dict[str, int]:
+    """Filas estimadas por tabla (pg_class.reltuples, actualizado por ANALYZE)."""
+    async with engine.connect() as conn:
+        result = await conn.execute(_DATASET_SIZE, {"tables": list(_TABLES)})
+        return {name: int(rows) for name, rows in result.all()}
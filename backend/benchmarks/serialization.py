@@ -0,0 +1,73 @@
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from application.schemas.config import ConfigRead
+from application.schemas.pagination import Page
+from application.services.json_response import dumps
+from benchmarks.runner import Scenario
+from domain.models.config import ScrapeConfig
+
+# Una página de listado grande, con selectores JSONB de tamaño realista
+CONFIGS_PER_PAGE = 1000
+SELECTORS_PER_CONFIG = 40
+
+
+def synthetic_configs(count: int = CONFIGS_PER_PAGE) -> List[Dict[str, Any]]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "site_name": f"bench-site-{i}",
+            "selectors": {
+                f"field_{j}": {
+                    "css": f"div.item-{j} span.value",
+                    "multiple": j % 2 == 0,
+                }
+                for j in range(SELECTORS_PER_CONFIG)
+            },
+            "politeness": None,
+            "retry_interval": timedelta(hours=1),
+            "max_retries": 3,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+def build_scenarios() -> List[Scenario]:
+    """
+    Serialización de una página de configs por cada camino: el ORM validado con
+    response_model (lo que hace FastAPI), el encoder estándar y las filas planas
+    de get_page_rows con orjson. No usa la base de datos.
+    """
+    rows = synthetic_configs()
+    objects = [ScrapeConfig(**row) for row in rows]
+    adapter = TypeAdapter(Page[ConfigRead])
+    params = {"configs": len(rows), "selectors": SELECTORS_PER_CONFIG}
+
+    async def response_model(_i):
+        page = adapter.validate_python(
+            {"items": objects, "next_cursor": None}, from_attributes=True
+        )
+        return adapter.dump_json(page)
+
+    async def json_encoder(_i):
+        page = Page[ConfigRead](
+            items=[ConfigRead.model_validate(o) for o in objects], next_cursor=None
+        )
+        return json.dumps(jsonable_encoder(page)).encode()
+
+    async def orjson_rows(_i):
+        return dumps({"items": rows, "next_cursor": None})
+
+    return [
+        Scenario("serialization.response_model", response_model, params=params),
+        Scenario("serialization.json_encoder", json_encoder, params=params),
+        Scenario("serialization.orjson_rows", orjson_rows, params=params),
+    ]
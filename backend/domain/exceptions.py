@@ -39,3 +39,17 @@ class OperationError(AppException):
     def __init__(self, operation: str = "Operation", detail: str = "failed"):
         full_detail = f"{operation} {detail}"
         super().__init__(full_detail)
+
+
+class ExtractionError(AppException):
+    """Error al compilar selectores o extraer campos de una página."""
+
+    def __init__(self, detail: str = "Could not extract data from page."):
+        super().__init__(detail)
+
+
+class LLMError(AppException):
+    """Error al llamar al modelo de lenguaje o al interpretar su respuesta."""
+
+    def __init__(self, detail: str = "The language model request failed."):
+        super().__init__(detail)
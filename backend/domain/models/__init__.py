@@ -2,3 +2,8 @@ from .base_model import Base
 from .config import ScrapeConfig
 from .job import ScrapingJob
 from .scrape_url import ScrapeUrl
+from .scraped_data import ScrapedData
+from .scrape_result import ScrapeResult
+from .insight_cache import InsightCache
+from .field_rollup import FieldRollup
+from .schedule import ScrapingSchedule
@@ -1,8 +1,8 @@
 import uuid
-from datetime import datetime
-from typing import List, Dict, Any, TYPE_CHECKING
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 
-from sqlalchemy import Text, TIMESTAMP
+from sqlalchemy import Interval, SmallInteger, Text, TIMESTAMP, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
@@ -20,6 +20,20 @@ class ScrapeConfig(Base):
     )
     site_name: Mapped[str] = mapped_column(Text, nullable=False)
     selectors: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    # Credenciales o cabeceras de acceso al sitio
+    auth_settings: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSONB, nullable=True
+    )
+    # Espera base antes del primer reintento (se duplica en cada fallo) y
+    # reintentos antes de pasar una URL a 'dead_letter'
+    retry_interval: Mapped[Optional[timedelta]] = mapped_column(
+        Interval, default=timedelta(hours=1), nullable=True
+    )
+    max_retries: Mapped[Optional[int]] = mapped_column(
+        SmallInteger, default=3, nullable=True
+    )
+    # Sobrescribe la cortesía por host por defecto (ver infrastructure.http.politeness)
+    politeness: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), default=datetime.utcnow
@@ -28,6 +42,11 @@ class ScrapeConfig(Base):
         TIMESTAMP(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    __table_args__ = (
+        # Orden estable para la paginación por cursor
+        Index("ix_scrape_config_created_at_id", "created_at", "id"),
+    )
+
     # Relación inversa
     scrape_urls: Mapped[List["ScrapeUrl"]] = relationship(
         "ScrapeUrl", back_populates="config"
@@ -0,0 +1,49 @@
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import TIMESTAMP, BigInteger, Date, ForeignKey, Index, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base_model import Base
+
+
+class FieldRollup(Base):
+    """
+    Agregados diarios por (config, campo): cuántos resultados se extrajeron, en
+    cuántos el selector del campo encontró algo y cuántos valores devolvió.
+
+    El worker los incrementa a medida que llegan resultados con contenido nuevo, de
+    modo que las vistas de tendencia leen unas pocas filas por día en lugar de
+    recorrer scraped_data / scrape_result.
+    """
+
+    __tablename__ = "field_rollup"
+
+    config_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("scrape_config.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    field: Mapped[str] = mapped_column(String, primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    # Resultados de la config ese día (los mismos para todos sus campos)
+    result_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    # Resultados en los que el campo tiene al menos un valor
+    match_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    # Valores extraídos (un campo `multiple` puede aportar varios por resultado)
+    value_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    __table_args__ = (
+        # Consultas por rango de días sin filtrar por config
+        Index("ix_field_rollup_day", "day"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<FieldRollup(config_id={self.config_id}, field={self.field}, "
+            f"day={self.day})>"
+        )
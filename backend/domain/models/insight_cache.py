@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import TIMESTAMP, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base_model import Base
+
+
+class InsightCache(Base):
+    """
+    Respuestas del modelo de lenguaje por documento.
+
+    La clave (content_hash, prompt_version, model) identifica exactamente qué se
+    preguntó: un documento con el mismo contenido no se vuelve a analizar mientras
+    no cambien el prompt ni el modelo.
+    """
+
+    __tablename__ = "insight_cache"
+
+    # sha256 del texto del documento enviado al modelo
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    prompt_version: Mapped[str] = mapped_column(String(32), primary_key=True)
+    model: Mapped[str] = mapped_column(String(128), primary_key=True)
+    insights: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    def __repr__(self):
+        return (
+            f"<InsightCache(content_hash={self.content_hash}, "
+            f"prompt_version={self.prompt_version}, model={self.model})>"
+        )
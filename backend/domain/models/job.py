@@ -4,10 +4,11 @@ from typing import Optional, List, TYPE_CHECKING
 
 from sqlalchemy import (
     TIMESTAMP,
-    SmallInteger,
+    Integer,
     String,
     ForeignKey,
     CheckConstraint,
+    Index,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
@@ -36,9 +37,13 @@ class ScrapingJob(Base):
     finished_at: Mapped[Optional[datetime]] = mapped_column(
         TIMESTAMP(timezone=True), nullable=True
     )
-    total_urls: Mapped[Optional[int]] = mapped_column(SmallInteger, default=0)
-    success_count: Mapped[Optional[int]] = mapped_column(SmallInteger, default=0)
-    error_count: Mapped[Optional[int]] = mapped_column(SmallInteger, default=0)
+    # Integer (no SmallInteger): un job puede superar las 32.767 URLs
+    total_urls: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    success_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    error_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    # Desglose de success_count: páginas con contenido nuevo vs. sin cambios
+    changed_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    unchanged_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
     status: Mapped[str] = mapped_column(String, default="pending", nullable=False)
 
     __table_args__ = (
@@ -46,6 +51,8 @@ class ScrapingJob(Base):
             "status IN ('pending', 'running', 'completed', 'failed')",
             name="ck_scraping_job_status",
         ),
+        # Orden estable para la paginación por cursor
+        Index("ix_scraping_job_started_at_id", "started_at", "id"),
     )
 
     # Relación inversa: Usa string reference "ScrapeUrl"
@@ -0,0 +1,95 @@
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import (
+    TIMESTAMP,
+    Boolean,
+    CheckConstraint,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base_model import Base
+
+
+class ScrapingSchedule(Base):
+    """
+    Programación que crea un ScrapingJob con su conjunto de URLs de forma periódica
+    (expresión cron o intervalo fijo) o una sola vez (sin cron ni intervalo).
+
+    `scheduled_at` es siempre el próximo disparo: el scheduler lo avanza en la misma
+    transacción en la que crea el job, y marca `is_processed` cuando una
+    programación de un solo disparo ya se ejecutó.
+    """
+
+    __tablename__ = "scraping_schedule"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    # FK a "user" en el esquema SQL; no hay modelo User en el ORM
+    user_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), nullable=True
+    )
+    name: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Config por defecto de las URLs que no indican la suya
+    config_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("scrape_config.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    cron: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    interval_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Zona horaria (IANA) en la que se evalúa la expresión cron
+    timezone: Mapped[str] = mapped_column(String, nullable=False, default="UTC")
+    # [{"url": ..., "priority": ..., "config_id": ...}, ...]
+    urls: Mapped[List[Dict[str, Any]]] = mapped_column(
+        JSONB, nullable=False, default=list
+    )
+    is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    scheduled_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False
+    )
+    is_processed: Mapped[bool] = mapped_column(Boolean, default=False)
+    last_run_at: Mapped[Optional[datetime]] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), default=datetime.utcnow
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    __table_args__ = (
+        CheckConstraint(
+            "cron IS NULL OR interval_seconds IS NULL",
+            name="ck_scraping_schedule_cron_or_interval",
+        ),
+        CheckConstraint(
+            "interval_seconds IS NULL OR interval_seconds > 0",
+            name="ck_scraping_schedule_interval_positive",
+        ),
+        Index("idx_scraping_schedule_scheduled_at", "scheduled_at"),
+        # Próximos disparos que el scheduler carga en su heap
+        Index(
+            "ix_scraping_schedule_pending_scheduled_at",
+            "scheduled_at",
+            postgresql_where=text("is_active AND NOT is_processed"),
+        ),
+        # Orden estable para la paginación por cursor
+        Index("ix_scraping_schedule_created_at_id", "created_at", "id"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<ScrapingSchedule(id={self.id}, name='{self.name}', "
+            f"scheduled_at={self.scheduled_at})>"
+        )
@@ -0,0 +1,67 @@
+import uuid
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from sqlalchemy import (
+    TIMESTAMP,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+)
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base_model import Base
+
+
+class ScrapeResult(Base):
+    """
+    Histórico de resultados de scraping: una fila por fetch con contenido nuevo.
+
+    La tabla está particionada por rango de scraped_at (una partición por mes), de
+    modo que el histórico antiguo se elimina con un DROP de la partición en lugar
+    de DELETEs masivos. El HTML se guarda comprimido (zstd) en una columna con
+    STORAGE EXTERNAL: va siempre a TOAST, fuera de la fila, y Postgres no intenta
+    volver a comprimirlo.
+
+    El último resultado de cada URL se localiza sin recorrer el histórico a través
+    de ScrapedData.result_id / result_scraped_at.
+    """
+
+    __tablename__ = "scrape_result"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    # Clave de partición: forma parte de la clave primaria (requisito de Postgres)
+    scraped_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), primary_key=True, default=datetime.utcnow
+    )
+    url_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("scrape_url.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    job_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("scraping_job.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    # Campos extraídos con los selectores de la configuración: {campo: valor}
+    fields: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # HTML comprimido; NULL si no se guardó el cuerpo
+    html_compressed: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    html_size: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    compression: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+
+    __table_args__ = (
+        # Histórico de una URL, más reciente primero
+        Index("ix_scrape_result_url_id_scraped_at", "url_id", "scraped_at"),
+        {"postgresql_partition_by": "RANGE (scraped_at)"},
+    )
+
+    def __repr__(self):
+        return f"<ScrapeResult(id={self.id}, url_id={self.url_id}, scraped_at={self.scraped_at})>"
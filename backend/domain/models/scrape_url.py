@@ -3,13 +3,15 @@ from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 
 from sqlalchemy import (
+    LargeBinary,
     Text,
     String,
     TIMESTAMP,
     SmallInteger,
     ForeignKey,
     CheckConstraint,
-    # Index # Descomenta si añades índices aquí
+    Index,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID  # Quita JSONB si no se usa aquí
@@ -20,6 +22,7 @@ from .base_model import Base
 if TYPE_CHECKING:
     from .config import ScrapeConfig
     from .job import ScrapingJob
+    from .scraped_data import ScrapedData
 
 
 class ScrapeUrl(Base):
@@ -39,14 +42,36 @@ class ScrapeUrl(Base):
         nullable=True,
     )
     url: Mapped[str] = mapped_column(Text, nullable=False)
+    # Hash de ancho fijo de la URL normalizada (ver url_normalization); las filas
+    # anteriores a la columna lo tienen a NULL y no participan en la de-duplicación
+    url_hash: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
     status: Mapped[str] = mapped_column(String, default="pending", nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), default=datetime.utcnow, nullable=False
     )
+    # Último cierre con éxito (los fallos no lo modifican)
     last_scraped_at: Mapped[Optional[datetime]] = mapped_column(
         TIMESTAMP(timezone=True), nullable=True
     )
     priority: Mapped[int] = mapped_column(SmallInteger, default=5, nullable=False)
+    # Lease de la cola de trabajo: qué worker tiene la URL 'in_progress' y hasta cuándo
+    lease_owner: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
+    # Validadores HTTP y huella del último contenido descargado, para re-fetch
+    # condicionales (If-None-Match / If-Modified-Since) y detectar páginas sin cambios
+    etag: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    last_modified: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # Reintentos: fallos consecutivos, próximo intento y último error
+    attempts: Mapped[int] = mapped_column(
+        SmallInteger, default=0, server_default=text("0"), nullable=False
+    )
+    next_attempt_at: Mapped[Optional[datetime]] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # --- Relaciones ---
     # Usar string references es más seguro contra imports circulares
@@ -56,18 +81,55 @@ class ScrapeUrl(Base):
     job: Mapped[Optional["ScrapingJob"]] = relationship(
         "ScrapingJob", back_populates="scrape_urls"
     )
-    # Ejemplo si tuvieras ScrapedData con relación uno a uno/muchos
-    # scraped_data_rel: Mapped[Optional["ScrapedData"]] = relationship(
-    #    "ScrapedData", back_populates="scrape_url", uselist=False, cascade="all, delete-orphan"
-    # )
+    scraped_data: Mapped[Optional["ScrapedData"]] = relationship(
+        "ScrapedData",
+        back_populates="scrape_url",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
 
     __table_args__ = (
+        # 'retry': falló y espera a next_attempt_at; 'dead_letter': agotó los
+        # reintentos o el fallo no es recuperable ('failed' es anterior a los reintentos)
         CheckConstraint(
-            "status IN ('pending', 'in_progress', 'success', 'failed')",
+            "status IN ('pending', 'in_progress', 'success', 'failed', 'retry',"
+            " 'dead_letter')",
             name="ck_scrape_url_status",
         ),
         CheckConstraint("priority BETWEEN 1 AND 10", name="ck_scrape_url_priority"),
-        # Index('ix_scrape_url_status_priority', 'status', 'priority'), # Ejemplo de índice
+        # Orden estable para la paginación por cursor
+        Index("ix_scrape_url_created_at_id", "created_at", "id"),
+        # Índice parcial para el dequeue: solo contiene filas 'pending', en el mismo
+        # orden que usa claim_pending_urls, así el coste no crece con la tabla.
+        Index(
+            "ix_scrape_url_pending_queue",
+            text("priority DESC"),
+            "created_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        # Una URL (normalizada) como máximo una vez por config; config_id NULL cuenta
+        # como un ámbito más (NULLS NOT DISTINCT, Postgres 15+)
+        Index(
+            "ux_scrape_url_config_url_hash",
+            "config_id",
+            "url_hash",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+            postgresql_where=text("url_hash IS NOT NULL"),
+        ),
+        # Índice parcial para que el reclaimer encuentre leases vencidos sin escanear
+        Index(
+            "ix_scrape_url_lease_expires_at",
+            "lease_expires_at",
+            postgresql_where=text("status = 'in_progress'"),
+        ),
+        # Índice parcial de reintentos en espera: claim_pending_urls recoge los
+        # vencidos recorriendo solo su extremo inicial
+        Index(
+            "ix_scrape_url_retry_next_attempt_at",
+            "next_attempt_at",
+            postgresql_where=text("status = 'retry'"),
+        ),
     )
 
     def __repr__(self):
@@ -0,0 +1,67 @@
+import uuid
+from datetime import datetime
+from typing import Optional, Dict, Any, TYPE_CHECKING
+
+from sqlalchemy import Text, TIMESTAMP, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship, Mapped, mapped_column
+
+from .base_model import Base
+
+if TYPE_CHECKING:
+    from .scrape_url import ScrapeUrl
+
+
+class ScrapedData(Base):
+    """
+    Último resultado extraído de cada URL (una fila por URL).
+
+    Apunta a la fila de ScrapeResult de la que procede (result_id, result_scraped_at),
+    con la clave de partición incluida para que la lectura toque una sola partición.
+    `insights` guarda el análisis del modelo de lenguaje de ese resultado; vuelve a
+    NULL cada vez que la URL se scrapea con contenido nuevo.
+    """
+
+    __tablename__ = "scraped_data"
+
+    url_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("scrape_url.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # Campos extraídos con los selectores de la configuración: {campo: valor}
+    raw_payload: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    cleaned_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    scraped_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), default=datetime.utcnow
+    )
+    job_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("scraping_job.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
+    result_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), nullable=True
+    )
+    result_scraped_at: Mapped[Optional[datetime]] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
+    insights: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+
+    scrape_url: Mapped["ScrapeUrl"] = relationship(
+        "ScrapeUrl", back_populates="scraped_data"
+    )
+
+    __table_args__ = (
+        # Resultados de un job pendientes de análisis (pipeline de insights)
+        Index(
+            "ix_scraped_data_job_id_pending_insights",
+            "job_id",
+            "url_id",
+            postgresql_where=text("insights IS NULL"),
+        ),
+    )
+
+    def __repr__(self):
+        return f"<ScrapedData(url_id={self.url_id}, scraped_at={self.scraped_at})>"
@@ -0,0 +1,109 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Caché LRU acotada en memoria con contadores de aciertos, fallos y desalojos.
+
+    Pensada para usarse desde un único event loop (o un único proceso del pool):
+    no usa locks.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+        self._data: "OrderedDict[K, V]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._data
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        value = self._data.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        if key in self._data:
+            self._data.move_to_end(key)
+        self._data[key] = value
+        while len(self._data) > self.maxsize:
+            evicted_key, _ = self._data.popitem(last=False)
+            self.evictions += 1
+            self._on_evict(evicted_key)
+
+    def _on_evict(self, key: K) -> None:
+        """Hook para subclases que guardan metadatos por clave."""
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Elimina una entrada (invalidación explícita; no cuenta como desalojo)."""
+        return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class TTLCache(LRUCache[K, V]):
+    """
+    LRUCache cuyas entradas caducan `ttl` segundos después de escribirse.
+    Una entrada caducada cuenta como fallo (y como expiración) al leerse.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        super().__init__(maxsize)
+        self.ttl = ttl
+        self.expirations = 0
+        self._expires_at: Dict[K, float] = {}
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        expires_at = self._expires_at.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.pop(key)
+            self.expirations += 1
+        return super().get(key, default)
+
+    def set(self, key: K, value: V) -> None:
+        self._expires_at[key] = time.monotonic() + self.ttl
+        super().set(key, value)
+
+    def _on_evict(self, key: K) -> None:
+        self._expires_at.pop(key, None)
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        self._expires_at.pop(key, None)
+        return super().pop(key, default)
+
+    def clear(self) -> None:
+        super().clear()
+        self._expires_at.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "ttl": self.ttl, "expirations": self.expirations}
@@ -1,7 +1,12 @@
+import atexit
+import json
 import logging
+import queue
 import sys
 import os
-from logging.handlers import TimedRotatingFileHandler
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from typing import Optional
 
 # --- Configuración ---
 LOG_LEVEL = os.getenv(
@@ -10,6 +15,13 @@ LOG_LEVEL = os.getenv(
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(process)d:%(thread)d - %(filename)s:%(lineno)d - %(message)s"
 LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# --- Salida estructurada y escritura fuera del hilo principal ---
+# Una línea JSON por registro
+LOG_JSON = os.getenv("LOG_JSON", "false").lower() == "true"
+# Formatear/escribir en un hilo aparte (QueueListener)
+LOG_ASYNC = os.getenv("LOG_ASYNC", "true").lower() == "true"
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "0"))  # 0 = cola sin límite
+
 # --- Opcional: Log a archivo ---
 LOG_TO_FILE = os.getenv("LOG_TO_FILE", "false").lower() == "true"
 LOG_FILE_PATH = os.getenv(
@@ -26,21 +38,76 @@ if LOG_TO_FILE:
         os.makedirs(log_dir)
 
 
+# Listener activo en modo LOG_ASYNC (uno por proceso)
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatea cada registro como un objeto JSON en una sola línea."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+            "thread": record.thread,
+            "file": record.filename,
+            "line": record.lineno,
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _DeferredFormatQueueHandler(QueueHandler):
+    """
+    QueueHandler que no formatea en el hilo que emite el log.
+
+    El QueueHandler estándar formatea el mensaje completo (incluida la traza) antes
+    de encolarlo; aquí solo se fija el texto del mensaje, para que los argumentos
+    no cambien antes de procesarse, y el formateo queda a cargo del listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()  # Vacía la cola antes de terminar
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
 def setup_logging():
     """Configura el logging para la aplicación."""
     # Crear formateador
-    formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+    if LOG_JSON:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
 
     # Configurar el logger raíz
+    _stop_listener()  # Detener el listener previo (importante en reload)
     root_logger = logging.getLogger()
     root_logger.setLevel(LOG_LEVEL)
     root_logger.handlers.clear()  # Limpiar handlers preexistentes (importante en reload)
+    handlers = []
 
     # Handler para la consola (siempre activo)
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
     console_handler.setLevel(LOG_LEVEL)  # Nivel para la consola
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
 
     # Handler para archivo (opcional)
     if LOG_TO_FILE:
@@ -53,8 +120,21 @@ def setup_logging():
         )
         file_handler.setFormatter(formatter)
         file_handler.setLevel(LOG_LEVEL)  # Nivel para el archivo
-        root_logger.addHandler(file_handler)
-        root_logger.info(f"Logging to file enabled: {LOG_FILE_PATH}")
+        handlers.append(file_handler)
+
+    if LOG_ASYNC:
+        # Los hilos de la app solo encolan; el I/O ocurre en el hilo del listener
+        global _listener
+        log_queue = queue.Queue(LOG_QUEUE_SIZE)
+        root_logger.addHandler(_DeferredFormatQueueHandler(log_queue))
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+    else:
+        for handler in handlers:
+            root_logger.addHandler(handler)
+
+    if LOG_TO_FILE:
+        root_logger.info("Logging to file enabled: %s", LOG_FILE_PATH)
 
     # Silenciar loggers de librerías muy verbosas si es necesario
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
@@ -62,7 +142,12 @@ def setup_logging():
         logging.WARNING
     )  # O INFO/DEBUG si necesitas ver queries
 
-    root_logger.info(f"Logging setup complete. Level: {LOG_LEVEL}")
+    root_logger.info(
+        "Logging setup complete. Level: %s (async=%s, json=%s)",
+        LOG_LEVEL,
+        LOG_ASYNC,
+        LOG_JSON,
+    )
 
 
 # --- Llamar a setup_logging() aquí asegura que se configure al importar ---
@@ -5,6 +5,8 @@ from domain.models.base_model import Base
 from domain.models.scrape_url import ScrapeUrl
 from domain.models.config import ScrapeConfig
 from domain.models.job import ScrapingJob
+from domain.models.schedule import ScrapingSchedule
+from domain.models.scraped_data import ScrapedData
 from domain.models.base_model import Base
 
 
@@ -10,16 +10,45 @@ CREATE TABLE IF NOT EXISTS "user" (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
--- Tabla de programación de scraping
+-- Tabla de programación de scraping. scheduled_at es el próximo disparo; sin cron
+-- ni intervalo la programación es de un solo disparo (is_processed al ejecutarse)
 CREATE TABLE IF NOT EXISTS scraping_schedule (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     user_id UUID REFERENCES "user"(id) ON DELETE CASCADE,
+    name TEXT,
+    config_id UUID,
+    cron TEXT,
+    interval_seconds INTEGER,
+    timezone VARCHAR NOT NULL DEFAULT 'UTC',
+    urls JSONB NOT NULL DEFAULT '[]'::jsonb,
+    is_active BOOLEAN NOT NULL DEFAULT TRUE,
     scheduled_at TIMESTAMP WITH TIME ZONE NOT NULL,
     is_processed BOOLEAN DEFAULT FALSE,
+    last_run_at TIMESTAMP WITH TIME ZONE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Recurrencia y URLs de las programaciones (bases creadas sin ellas)
+ALTER TABLE scraping_schedule
+    ADD COLUMN IF NOT EXISTS name TEXT,
+    ADD COLUMN IF NOT EXISTS config_id UUID,
+    ADD COLUMN IF NOT EXISTS cron TEXT,
+    ADD COLUMN IF NOT EXISTS interval_seconds INTEGER,
+    ADD COLUMN IF NOT EXISTS timezone VARCHAR NOT NULL DEFAULT 'UTC',
+    ADD COLUMN IF NOT EXISTS urls JSONB NOT NULL DEFAULT '[]'::jsonb,
+    ADD COLUMN IF NOT EXISTS is_active BOOLEAN NOT NULL DEFAULT TRUE,
+    ADD COLUMN IF NOT EXISTS last_run_at TIMESTAMP WITH TIME ZONE;
+
+ALTER TABLE scraping_schedule
+    DROP CONSTRAINT IF EXISTS ck_scraping_schedule_cron_or_interval,
+    DROP CONSTRAINT IF EXISTS ck_scraping_schedule_interval_positive;
+ALTER TABLE scraping_schedule
+    ADD CONSTRAINT ck_scraping_schedule_cron_or_interval
+        CHECK (cron IS NULL OR interval_seconds IS NULL),
+    ADD CONSTRAINT ck_scraping_schedule_interval_positive
+        CHECK (interval_seconds IS NULL OR interval_seconds > 0);
+
 -- Tabla de configuración de scraping
 CREATE TABLE IF NOT EXISTS scrape_config (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -28,43 +57,151 @@ CREATE TABLE IF NOT EXISTS scrape_config (
     auth_settings JSONB,
     retry_interval INTERVAL DEFAULT '1 hour',
     max_retries SMALLINT DEFAULT 3,
+    politeness JSONB,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Límites por host propios de la config (bases creadas sin la columna)
+ALTER TABLE scrape_config ADD COLUMN IF NOT EXISTS politeness JSONB;
+
 -- Tabla de trabajos de scraping
 CREATE TABLE IF NOT EXISTS scraping_job (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     schedule_id UUID REFERENCES scraping_schedule(id) ON DELETE SET NULL,
     started_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     finished_at TIMESTAMP WITH TIME ZONE,
-    total_urls SMALLINT DEFAULT 0,
-    success_count SMALLINT DEFAULT 0,
-    error_count SMALLINT DEFAULT 0,
+    total_urls INTEGER DEFAULT 0,
+    success_count INTEGER DEFAULT 0,
+    error_count INTEGER DEFAULT 0,
+    changed_count INTEGER DEFAULT 0,
+    unchanged_count INTEGER DEFAULT 0,
     status VARCHAR CHECK (status IN ('pending', 'running', 'completed', 'failed')) DEFAULT 'pending'
 );
 
+-- Bases creadas con contadores SMALLINT (desbordaban a las 32.767 URLs)
+ALTER TABLE scraping_job
+    ALTER COLUMN total_urls TYPE INTEGER,
+    ALTER COLUMN success_count TYPE INTEGER,
+    ALTER COLUMN error_count TYPE INTEGER;
+
+ALTER TABLE scraping_job
+    ADD COLUMN IF NOT EXISTS changed_count INTEGER DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS unchanged_count INTEGER DEFAULT 0;
+
 -- Tabla de URLs a scrapear
 CREATE TABLE IF NOT EXISTS scrape_url (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     config_id UUID REFERENCES scrape_config(id) ON DELETE CASCADE,
     job_id UUID REFERENCES scraping_job(id) ON DELETE CASCADE,
     url TEXT NOT NULL,
-    status VARCHAR CHECK (status IN ('pending', 'in_progress', 'success', 'failed')) DEFAULT 'pending',
+    url_hash BYTEA,
+    status VARCHAR DEFAULT 'pending',
+    CONSTRAINT ck_scrape_url_status
+        CHECK (status IN ('pending', 'in_progress', 'success', 'failed', 'retry', 'dead_letter')),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     last_scraped_at TIMESTAMP WITH TIME ZONE,
-    priority SMALLINT DEFAULT 5 CHECK (priority BETWEEN 1 AND 10)
+    priority SMALLINT DEFAULT 5 CHECK (priority BETWEEN 1 AND 10),
+    lease_owner VARCHAR,
+    lease_expires_at TIMESTAMP WITH TIME ZONE,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash VARCHAR(64),
+    attempts SMALLINT NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP WITH TIME ZONE,
+    last_error TEXT
 );
 
+-- Validadores HTTP y hash del contenido para re-fetch condicionales
+ALTER TABLE scrape_url
+    ADD COLUMN IF NOT EXISTS etag TEXT,
+    ADD COLUMN IF NOT EXISTS last_modified TEXT,
+    ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+
+-- Hash (blake2b-128) de la URL normalizada para de-duplicar en la ingesta. Las filas
+-- existentes quedan con NULL: el índice único parcial no las tiene en cuenta.
+ALTER TABLE scrape_url ADD COLUMN IF NOT EXISTS url_hash BYTEA;
+
+-- Reintentos con backoff: 'retry' espera a next_attempt_at y 'dead_letter' es final
+ALTER TABLE scrape_url
+    ADD COLUMN IF NOT EXISTS attempts SMALLINT NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMP WITH TIME ZONE,
+    ADD COLUMN IF NOT EXISTS last_error TEXT;
+ALTER TABLE scrape_url
+    DROP CONSTRAINT IF EXISTS scrape_url_status_check,
+    DROP CONSTRAINT IF EXISTS ck_scrape_url_status;
+ALTER TABLE scrape_url
+    ADD CONSTRAINT ck_scrape_url_status
+        CHECK (status IN ('pending', 'in_progress', 'success', 'failed', 'retry', 'dead_letter'));
+
 -- Tabla de datos scrapeados
 CREATE TABLE IF NOT EXISTS scraped_data (
     url_id UUID PRIMARY KEY REFERENCES scrape_url(id) ON DELETE CASCADE,
     raw_payload JSONB NOT NULL,
     cleaned_text TEXT,
     scraped_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-    job_id UUID REFERENCES scraping_job(id) ON DELETE CASCADE
+    job_id UUID REFERENCES scraping_job(id) ON DELETE CASCADE,
+    result_id UUID,
+    result_scraped_at TIMESTAMP WITH TIME ZONE,
+    insights JSONB
+);
+
+-- Puntero al último resultado del histórico (clave primaria completa de scrape_result)
+ALTER TABLE scraped_data
+    ADD COLUMN IF NOT EXISTS result_id UUID,
+    ADD COLUMN IF NOT EXISTS result_scraped_at TIMESTAMP WITH TIME ZONE;
+
+-- Análisis del modelo de lenguaje del último resultado (NULL = pendiente)
+ALTER TABLE scraped_data ADD COLUMN IF NOT EXISTS insights JSONB;
+
+-- Caché de análisis por contenido: un documento idéntico no se vuelve a enviar al
+-- modelo mientras no cambien la versión del prompt ni el modelo
+CREATE TABLE IF NOT EXISTS insight_cache (
+    content_hash VARCHAR(64) NOT NULL,
+    prompt_version VARCHAR(32) NOT NULL,
+    model VARCHAR(128) NOT NULL,
+    insights JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (content_hash, prompt_version, model)
 );
 
+-- Histórico de resultados, particionado por mes de scraped_at. Las particiones
+-- (scrape_result_YYYY_MM) las crea y elimina el worker según RESULT_PARTITIONS_AHEAD
+-- y RESULT_RETENTION_MONTHS; la retención es un DROP de la partición.
+CREATE TABLE IF NOT EXISTS scrape_result (
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
+    scraped_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    url_id UUID NOT NULL REFERENCES scrape_url(id) ON DELETE CASCADE,
+    job_id UUID REFERENCES scraping_job(id) ON DELETE SET NULL,
+    fields JSONB NOT NULL,
+    content_hash VARCHAR(64),
+    html_compressed BYTEA,
+    html_size INTEGER,
+    compression VARCHAR(16),
+    PRIMARY KEY (id, scraped_at)
+) PARTITION BY RANGE (scraped_at);
+
+-- El HTML llega ya comprimido con zstd: va a TOAST sin que Postgres lo recomprima
+ALTER TABLE scrape_result ALTER COLUMN html_compressed SET STORAGE EXTERNAL;
+
+-- Agregados diarios por (config, campo) que el worker incrementa al guardar
+-- resultados; sirven las vistas de tendencia sin recorrer los resultados
+CREATE TABLE IF NOT EXISTS field_rollup (
+    config_id UUID NOT NULL REFERENCES scrape_config(id) ON DELETE CASCADE,
+    field VARCHAR NOT NULL,
+    day DATE NOT NULL,
+    result_count BIGINT NOT NULL DEFAULT 0,
+    match_count BIGINT NOT NULL DEFAULT 0,
+    value_count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (config_id, field, day)
+);
+
+-- scrape_config se crea después de scraping_schedule
+ALTER TABLE scraping_schedule DROP CONSTRAINT IF EXISTS scraping_schedule_config_id_fkey;
+ALTER TABLE scraping_schedule ADD CONSTRAINT scraping_schedule_config_id_fkey
+    FOREIGN KEY (config_id) REFERENCES scrape_config(id) ON DELETE CASCADE;
+
 -- Tabla de errores de scraping
 CREATE TABLE IF NOT EXISTS scrape_error (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -77,10 +214,27 @@ CREATE TABLE IF NOT EXISTS scrape_error (
 
 -- Índices para mejorar el rendimiento
 CREATE INDEX IF NOT EXISTS idx_scraping_schedule_scheduled_at ON scraping_schedule(scheduled_at);
+-- Próximos disparos que carga el scheduler
+CREATE INDEX IF NOT EXISTS ix_scraping_schedule_pending_scheduled_at ON scraping_schedule(scheduled_at) WHERE is_active AND NOT is_processed;
+CREATE INDEX IF NOT EXISTS ix_scraping_schedule_created_at_id ON scraping_schedule(created_at, id);
 CREATE INDEX IF NOT EXISTS idx_scraping_job_schedule_id ON scraping_job(schedule_id);
 CREATE INDEX IF NOT EXISTS idx_scrape_url_job_id ON scrape_url(job_id);
 CREATE INDEX IF NOT EXISTS idx_scrape_url_config_id ON scrape_url(config_id);
+-- Orden estable (marca temporal, id) para la paginación por cursor
+CREATE INDEX IF NOT EXISTS ix_scrape_config_created_at_id ON scrape_config(created_at, id);
+CREATE INDEX IF NOT EXISTS ix_scraping_job_started_at_id ON scraping_job(started_at, id);
+CREATE INDEX IF NOT EXISTS ix_scrape_url_created_at_id ON scrape_url(created_at, id);
+-- Cola de trabajo: índices parciales para el dequeue y para reclamar leases vencidos
+CREATE INDEX IF NOT EXISTS ix_scrape_url_pending_queue ON scrape_url(priority DESC, created_at) WHERE status = 'pending';
+-- Una URL normalizada como máximo una vez por config (Postgres 15+ por NULLS NOT DISTINCT)
+CREATE UNIQUE INDEX IF NOT EXISTS ux_scrape_url_config_url_hash ON scrape_url(config_id, url_hash) NULLS NOT DISTINCT WHERE url_hash IS NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_scrape_url_lease_expires_at ON scrape_url(lease_expires_at) WHERE status = 'in_progress';
+CREATE INDEX IF NOT EXISTS ix_scrape_url_retry_next_attempt_at ON scrape_url(next_attempt_at) WHERE status = 'retry';
 CREATE INDEX IF NOT EXISTS idx_scraped_data_job_id ON scraped_data(job_id);
+-- Resultados de un job pendientes de análisis, recorridos por url_id
+CREATE INDEX IF NOT EXISTS ix_scraped_data_job_id_pending_insights ON scraped_data(job_id, url_id) WHERE insights IS NULL;
+CREATE INDEX IF NOT EXISTS ix_scrape_result_url_id_scraped_at ON scrape_result(url_id, scraped_at);
+CREATE INDEX IF NOT EXISTS ix_field_rollup_day ON field_rollup(day);
 CREATE INDEX IF NOT EXISTS idx_scrape_error_url_id ON scrape_error(url_id);
 CREATE INDEX IF NOT EXISTS idx_scrape_error_job_id ON scrape_error(job_id);
 
@@ -109,60 +263,40 @@ BEFORE UPDATE ON scrape_config
 FOR EACH ROW
 EXECUTE FUNCTION update_updated_at();
 
--- Función para actualizar automáticamente el contador de URLs totales, exitosas y con errores
-CREATE OR REPLACE FUNCTION update_job_counts()
-RETURNS TRIGGER AS $$
-BEGIN
-    UPDATE scraping_job
-    SET 
-        total_urls = (SELECT COUNT(*) FROM scrape_url WHERE job_id = NEW.job_id),
-        success_count = (SELECT COUNT(*) FROM scrape_url WHERE job_id = NEW.job_id AND status = 'success'),
-        error_count = (SELECT COUNT(*) FROM scrape_url WHERE job_id = NEW.job_id AND status = 'failed')
-    WHERE id = NEW.job_id;
-    
-    RETURN NEW;
-END;
-$$ LANGUAGE plpgsql;
+-- Los contadores de scraping_job (total_urls, success_count, error_count) los mantiene
+-- la aplicación con incrementos atómicos (JobRepository.increment_counters). El antiguo
+-- trigger que los recalculaba con COUNT(*) en cada cambio de estado de una URL era
+-- O(URLs del job) por fila y pisaba esos incrementos.
+DROP TRIGGER IF EXISTS update_job_counts_trigger ON scrape_url;
+DROP FUNCTION IF EXISTS update_job_counts();
 
--- Trigger para actualizar contadores cuando cambia el estado de una URL
-CREATE TRIGGER update_job_counts_trigger
-AFTER INSERT OR UPDATE OF status ON scrape_url
-FOR EACH ROW
-EXECUTE FUNCTION update_job_counts();
-
--- Función para actualizar el estado del trabajo cuando todas las URLs están procesadas
-CREATE OR REPLACE FUNCTION update_job_status()
+-- Publica cada alta o cambio de un job (contadores, estado) en el canal
+-- scraping_job_progress con la fila en JSON; la API la reenvía a los clientes
+-- conectados por SSE (GET /jobs/events) sin que estos consulten la tabla
+CREATE OR REPLACE FUNCTION notify_job_progress()
 RETURNS TRIGGER AS $$
-DECLARE
-    pending_count INTEGER;
-    in_progress_count INTEGER;
 BEGIN
-    -- Contar URLs pendientes y en progreso
-    SELECT 
-        COUNT(*) FILTER (WHERE status = 'pending'),
-        COUNT(*) FILTER (WHERE status = 'in_progress')
-    INTO pending_count, in_progress_count
-    FROM scrape_url
-    WHERE job_id = NEW.job_id;
-    
-    -- Si no hay URLs pendientes ni en progreso, marcar el trabajo como completado
-    IF pending_count = 0 AND in_progress_count = 0 AND NEW.status = 'running' THEN
-        UPDATE scraping_job
-        SET 
-            status = 'completed',
-            finished_at = NOW()
-        WHERE id = NEW.job_id;
+    IF TG_OP = 'UPDATE' AND OLD IS NOT DISTINCT FROM NEW THEN
+        RETURN NEW;
     END IF;
-    
+    PERFORM pg_notify('scraping_job_progress', row_to_json(NEW)::text);
     RETURN NEW;
 END;
 $$ LANGUAGE plpgsql;
 
--- Trigger para actualizar el estado del trabajo
-CREATE TRIGGER update_job_status_trigger
-AFTER UPDATE OF status ON scrape_url
+DROP TRIGGER IF EXISTS notify_job_progress_trigger ON scraping_job;
+CREATE TRIGGER notify_job_progress_trigger
+AFTER INSERT OR UPDATE ON scraping_job
 FOR EACH ROW
-EXECUTE FUNCTION update_job_status();
+EXECUTE FUNCTION notify_job_progress();
+
+-- El cierre de un job ('completed' cuando no le quedan URLs pendientes, en curso
+-- ni esperando reintento) lo hace el worker (JobRepository.complete_finished) en la
+-- transacción que cierra sus últimas URLs, después de escribir los contadores. El
+-- antiguo trigger comprobaba NEW.status = 'running' sobre scrape_url, un estado que
+-- una URL nunca tiene, y no cerraba ningún job.
+DROP TRIGGER IF EXISTS update_job_status_trigger ON scrape_url;
+DROP FUNCTION IF EXISTS update_job_status();
 
 -- Políticas de Row Level Security (RLS)
 -- Habilitar RLS en todas las tablas
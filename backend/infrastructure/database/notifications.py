@@ -0,0 +1,124 @@
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+NotificationCallback = Callable[[str, str], None]
+
+
+def asyncpg_dsn(database_url: str) -> str:
+    """Convierte la URL de SQLAlchemy (postgresql+asyncpg://) en un DSN de asyncpg."""
+    return database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+async def publish(db: AsyncSession, channel: str, payload: str) -> None:
+    """
+    Emite un NOTIFY dentro de la transacción de `db`; Postgres solo lo entrega a
+    los oyentes cuando esa transacción hace commit.
+    """
+    await db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": channel, "payload": payload},
+    )
+
+
+class PgNotificationListener:
+    """
+    Mantiene una única conexión dedicada con LISTEN sobre uno o más canales y
+    reparte cada notificación a los callbacks registrados en el proceso.
+
+    Si la conexión se pierde se reconecta con backoff; mientras tanto las
+    notificaciones se pierden, por lo que los consumidores deben tolerarlo
+    (p. ej. cachés con TTL).
+    """
+
+    def __init__(self, dsn: Optional[str] = None, *, reconnect_delay: float = 1.0):
+        self.dsn = dsn or asyncpg_dsn(settings.DATABASE_URL)
+        self.reconnect_delay = reconnect_delay
+        self._callbacks: Dict[str, List[NotificationCallback]] = {}
+        self._connection: Optional[asyncpg.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    def subscribe(self, channel: str, callback: NotificationCallback) -> None:
+        """Registra un callback(channel, payload). Debe llamarse antes de start()."""
+        self._callbacks.setdefault(channel, []).append(callback)
+
+    def _dispatch(self, connection, pid, channel: str, payload: str) -> None:
+        for callback in self._callbacks.get(channel, []):
+            try:
+                callback(channel, payload)
+            except Exception as e:
+                logger.error(
+                    "Notification callback failed on channel %s: %s",
+                    channel,
+                    e,
+                    exc_info=True,
+                )
+
+    async def _run(self) -> None:
+        delay = self.reconnect_delay
+        while not self._stopping.is_set():
+            try:
+                self._connection = await asyncpg.connect(self.dsn)
+                lost = asyncio.Event()
+                self._connection.add_termination_listener(lambda _c: lost.set())
+                for channel in self._callbacks:
+                    await self._connection.add_listener(channel, self._dispatch)
+                logger.info("Listening for notifications on %s", list(self._callbacks))
+                delay = self.reconnect_delay
+                stop_wait = asyncio.create_task(self._stopping.wait())
+                lost_wait = asyncio.create_task(lost.wait())
+                await asyncio.wait(
+                    {stop_wait, lost_wait}, return_when=asyncio.FIRST_COMPLETED
+                )
+                stop_wait.cancel()
+                lost_wait.cancel()
+                if not self._stopping.is_set():
+                    logger.warning(
+                        "Notification listener connection lost, reconnecting"
+                    )
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                logger.error("Notification listener error: %s", e)
+            except Exception as e:
+                # Cualquier otro fallo tampoco debe terminar el bucle de reconexión
+                logger.error(
+                    "Unexpected notification listener error: %s", e, exc_info=True
+                )
+            finally:
+                await self._close_connection()
+            if not self._stopping.is_set():
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+    async def _close_connection(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is None or connection.is_closed():
+            return
+        try:
+            await connection.close()
+        except Exception:
+            # Conexión rota a medias: se cierra sin esperar al servidor
+            connection.terminate()
+
+    def start(self) -> None:
+        if self._task is None and self._callbacks:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run(), name="pg-listener")
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+
+# Listener compartido por el proceso (una sola conexión para todos los canales)
+pg_listener = PgNotificationListener()
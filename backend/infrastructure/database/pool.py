@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from infrastructure.observability.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_OVERFLOW,
+    DB_POOL_HEALTHCHECK_FAILURES,
+    DB_POOL_PRE_PING_FAILURES,
+    DB_POOL_WAIT_SECONDS,
+    counter_value,
+    histogram_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Pool asíncrono estándar que mide cuánto tarda cada checkout."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT_SECONDS.observe(time.perf_counter() - start)
+
+
+def register_pool_events(engine: AsyncEngine) -> None:
+    """Publica el estado del pool como gauges y cuenta los pre-ping fallidos."""
+    DB_POOL_CHECKED_OUT.set_function(lambda: engine.pool.checkedout())
+    DB_POOL_OVERFLOW.set_function(lambda: max(engine.pool.overflow(), 0))
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _count_pre_ping_failures(context):
+        if getattr(context, "is_pre_ping", False):
+            DB_POOL_PRE_PING_FAILURES.inc()
+
+
+def pool_status(engine: AsyncEngine) -> Dict[str, Any]:
+    """Estado actual del pool y estadísticas acumuladas de espera y pre-ping."""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "wait_seconds": histogram_snapshot(DB_POOL_WAIT_SECONDS),
+        "pre_ping_failures": int(counter_value(DB_POOL_PRE_PING_FAILURES)),
+        "healthcheck_failures": int(counter_value(DB_POOL_HEALTHCHECK_FAILURES)),
+    }
+
+
+async def pool_health_check_loop(engine: AsyncEngine, interval: float) -> None:
+    """
+    Alternativa barata a pool_pre_ping: un SELECT 1 cada `interval` segundos en
+    lugar de uno por checkout. Si falla (p. ej. failover de Postgres) se descarta
+    todo el pool para que los siguientes checkouts abran conexiones nuevas.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            DB_POOL_HEALTHCHECK_FAILURES.inc()
+            logger.warning("Database health check failed, disposing pool: %s", e)
+            await engine.dispose()
@@ -1,10 +1,34 @@
+import base64
+import json
 import logging
+import time
 import uuid
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import select, update as sqlalchemy_update, delete as sqlalchemy_delete
+from sqlalchemy import (
+    bindparam,
+    insert as sqlalchemy_insert,
+    select,
+    tuple_,
+    update as sqlalchemy_update,
+    delete as sqlalchemy_delete,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import (
     SQLAlchemyError,
@@ -12,9 +36,12 @@ from sqlalchemy.exc import (
 )  # Importar excepciones de SQLAlchemy
 
 from domain.models.base_model import Base
+from infrastructure.database.unit_of_work import in_unit_of_work
+from infrastructure.observability.metrics import DB_QUERY_DURATION_SECONDS
 from domain.exceptions import (
     DatabaseError,
     ResourceNotFound,
+    ValidationError,
 )  # Importar excepciones personalizadas
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -23,22 +50,55 @@ UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 logger = logging.getLogger(__name__)  # Obtener logger
 
+# Tamaño máximo de página para get_multi / get_page
+MAX_PAGE_SIZE = 500
+# Filas que el cursor de servidor trae por cada ida y vuelta en stream()
+STREAM_BATCH_SIZE = 1000
+
 
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Columna temporal usada, junto con el id, para el orden estable y la paginación
+    # por cursor. Los repositorios cuyo modelo no tenga created_at la sobrescriben.
+    cursor_column: str = "created_at"
+
     def __init__(self, model: Type[ModelType]):
         self.model = model
+        # Columnas leídas por get_row/get_page_rows para cada schema de lectura
+        self._row_columns: Dict[Type[BaseModel], List[Any]] = {}
+        self._statements: Dict[str, Any] = {}
+
+    def _prebuilt(self, key: str, build: Callable[[], Any]):
+        """
+        Sentencia de una lectura frecuente, construida una sola vez por repositorio
+        con bindparam() en lugar de valores. Al reutilizar el mismo objeto, SQLAlchemy
+        no vuelve a construir el select() ni a calcular su clave de caché, y el SQL
+        compilado (y la sentencia preparada de asyncpg) se reutilizan siempre.
+        """
+        statement = self._statements.get(key)
+        if statement is None:
+            statement = self._statements[key] = build()
+        return statement
 
     async def _execute_query(
-        self, db: AsyncSession, statement, operation: str = "query execution"
+        self,
+        db: AsyncSession,
+        statement,
+        operation: str = "query execution",
+        params=None,
     ):
-        """Método helper para ejecutar queries y manejar errores comunes."""
+        """Método helper para ejecutar queries y manejar errores comunes.
+        `params` puede ser una lista de diccionarios para un executemany."""
+        start = time.perf_counter()
         try:
-            result = await db.execute(statement)
+            result = await db.execute(statement, params)
             return result
         except IntegrityError as e:
             await db.rollback()
             logger.error(
-                f"Database integrity error during {operation} for {self.model.__name__}: {e}",
+                "Database integrity error during %s for %s: %s",
+                operation,
+                self.model.__name__,
+                e,
                 exc_info=True,
             )
             # Podrías analizar 'e' para dar un mensaje más específico (ej: constraint violation)
@@ -48,7 +108,10 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         except SQLAlchemyError as e:
             await db.rollback()
             logger.error(
-                f"Database error during {operation} for {self.model.__name__}: {e}",
+                "Database error during %s for %s: %s",
+                operation,
+                self.model.__name__,
+                e,
                 exc_info=True,
             )
             raise DatabaseError(
@@ -58,26 +121,53 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         except Exception as e:  # Captura otros posibles errores inesperados
             await db.rollback()
             logger.error(
-                f"Unexpected error during {operation} for {self.model.__name__}: {e}",
+                "Unexpected error during %s for %s: %s",
+                operation,
+                self.model.__name__,
+                e,
                 exc_info=True,
             )
             raise DatabaseError(
                 f"An unexpected error occurred during {operation}.",
                 original_exception=e,
             )
+        finally:
+            self._observe(operation, start)
+
+    def _observe(self, operation: str, start: float) -> None:
+        """Registra la duración de una operación en el histograma por modelo/operación."""
+        DB_QUERY_DURATION_SECONDS.labels(self.model.__name__, operation).observe(
+            time.perf_counter() - start
+        )
 
     async def _commit_and_refresh(
-        self, db: AsyncSession, db_obj: ModelType, operation: str = "commit"
+        self,
+        db: AsyncSession,
+        db_obj: ModelType,
+        operation: str = "commit",
+        refresh: bool = True,
     ):
-        """Método helper para hacer commit, refresh y manejar errores."""
+        """Método helper para hacer commit, refresh y manejar errores.
+        Dentro de un unit_of_work no hace commit (lo hará el bloque al terminar).
+        Con refresh=False se omite el SELECT extra, p. ej. si el objeto ya viene
+        poblado por un INSERT/UPDATE ... RETURNING."""
+        start = time.perf_counter()
         try:
-            await db.commit()
-            await db.refresh(db_obj)
+            if in_unit_of_work(db):
+                await db.flush()
+            else:
+                await db.commit()
+            if refresh:
+                await db.refresh(db_obj)
             return db_obj
         except IntegrityError as e:  # Puede ocurrir en commit diferido
             await db.rollback()
             logger.error(
-                f"Database integrity error during {operation} for {self.model.__name__} (ID: {getattr(db_obj, 'id', 'N/A')}): {e}",
+                "Database integrity error during %s for %s (ID: %s): %s",
+                operation,
+                self.model.__name__,
+                getattr(db_obj, "id", "N/A"),
+                e,
                 exc_info=True,
             )
             raise DatabaseError(
@@ -86,7 +176,11 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         except SQLAlchemyError as e:
             await db.rollback()
             logger.error(
-                f"Database error during {operation} for {self.model.__name__} (ID: {getattr(db_obj, 'id', 'N/A')}): {e}",
+                "Database error during %s for %s (ID: %s): %s",
+                operation,
+                self.model.__name__,
+                getattr(db_obj, "id", "N/A"),
+                e,
                 exc_info=True,
             )
             raise DatabaseError(
@@ -96,42 +190,302 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         except Exception as e:
             await db.rollback()
             logger.error(
-                f"Unexpected error during {operation} for {self.model.__name__} (ID: {getattr(db_obj, 'id', 'N/A')}): {e}",
+                "Unexpected error during %s for %s (ID: %s): %s",
+                operation,
+                self.model.__name__,
+                getattr(db_obj, "id", "N/A"),
+                e,
                 exc_info=True,
             )
             raise DatabaseError(
                 f"An unexpected error occurred during {operation}.",
                 original_exception=e,
             )
+        finally:
+            self._observe(f"{operation}_commit", start)
 
-    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
-        statement = select(self.model).where(self.model.id == id)
-        result = await self._execute_query(db, statement, operation="get")
+    async def _commit(self, db: AsyncSession, operation: str = "commit"):
+        """Método helper para hacer commit (sin refresh) y manejar errores.
+        Dentro de un unit_of_work no hace nada: el commit lo hace el bloque."""
+        if in_unit_of_work(db):
+            return
+        start = time.perf_counter()
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            logger.error(
+                "Database integrity error during %s for %s: %s",
+                operation,
+                self.model.__name__,
+                e,
+                exc_info=True,
+            )
+            raise DatabaseError(
+                f"Data conflict during {operation}.", original_exception=e
+            )
+        except SQLAlchemyError as e:
+            await db.rollback()
+            logger.error(
+                "Database error during %s for %s: %s",
+                operation,
+                self.model.__name__,
+                e,
+                exc_info=True,
+            )
+            raise DatabaseError(
+                f"Could not complete {operation} due to a database issue.",
+                original_exception=e,
+            )
+        finally:
+            self._observe(f"{operation}_commit", start)
+
+    async def get(
+        self, db: AsyncSession, id: Any, *, use_cache: bool = True
+    ) -> Optional[ModelType]:
+        # use_cache solo tiene efecto en repositorios con caché (ConfigRepository)
+        statement = self._prebuilt(
+            "get", lambda: select(self.model).where(self.model.id == bindparam("id"))
+        )
+        result = await self._execute_query(
+            db, statement, operation="get", params={"id": id}
+        )
         return result.scalar_one_or_none()
 
-    async def get_or_404(self, db: AsyncSession, id: Any) -> ModelType:
+    async def get_many(self, db: AsyncSession, ids: Sequence[Any]) -> List[ModelType]:
+        """Obtiene varios objetos por ID en una sola query."""
+        if not ids:
+            return []
+        statement = select(self.model).where(self.model.id.in_(ids))
+        result = await self._execute_query(db, statement, operation="get_many")
+        return result.scalars().all()
+
+    async def get_or_404(
+        self, db: AsyncSession, id: Any, *, use_cache: bool = True
+    ) -> ModelType:
         """Obtiene por ID o lanza ResourceNotFound."""
-        db_obj = await self.get(db, id)
+        db_obj = await self.get(db, id, use_cache=use_cache)
         if db_obj is None:
             raise ResourceNotFound(resource=self.model.__name__, identifier=f"ID {id}")
         return db_obj
 
+    def _order_columns(self):
+        """Columnas del orden estable (cursor_column, id)."""
+        return getattr(self.model, self.cursor_column), self.model.id
+
     async def get_multi(
         self, db: AsyncSession, *, skip: int = 0, limit: int = 100
     ) -> List[ModelType]:
-        statement = select(self.model).offset(skip).limit(limit)
-        result = await self._execute_query(db, statement, operation="get_multi")
+        """
+        Paginación por OFFSET, con orden estable. Las páginas profundas son lentas
+        porque la base de datos recorre y descarta las filas saltadas: para recorrer
+        tablas grandes usar get_page.
+        """
+        statement = self._prebuilt(
+            "get_multi",
+            lambda: select(self.model)
+            .order_by(*self._order_columns())
+            .offset(bindparam("skip"))
+            .limit(bindparam("limit")),
+        )
+        result = await self._execute_query(
+            db,
+            statement,
+            operation="get_multi",
+            params={"skip": skip, "limit": min(limit, MAX_PAGE_SIZE)},
+        )
         return result.scalars().all()
 
-    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
-        logger.debug(f"Attempting to create {self.model.__name__} with data: {obj_in}")
-        obj_in_data = jsonable_encoder(obj_in)
-        db_obj = self.model(**obj_in_data)
-        db.add(db_obj)
-        # El commit y refresh se manejan en el helper
-        created_obj = await self._commit_and_refresh(db, db_obj, operation="create")
+    def encode_cursor(self, db_obj: ModelType) -> str:
+        """Genera un cursor opaco con la posición (cursor_column, id) de un objeto."""
+        order_value: datetime = getattr(db_obj, self.cursor_column)
+        payload = json.dumps([order_value.isoformat(), str(db_obj.id)])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> Tuple[datetime, uuid.UUID]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            order_value, id_value = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(order_value), uuid.UUID(id_value)
+        except (ValueError, TypeError) as e:
+            raise ValidationError(f"Invalid pagination cursor: {e}")
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        Paginación por cursor (keyset) sobre (cursor_column, id).
+
+        En lugar de OFFSET filtra con `(cursor_column, id) > (valor, id)` sobre un
+        índice compuesto, así que cualquier página cuesta lo mismo que la primera.
+        Devuelve los elementos y el cursor de la página siguiente (None si no hay más).
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        statement = self._keyset_statement(select(self.model), cursor, limit)
+        result = await self._execute_query(db, statement, operation="get_page")
+        return self._split_page(list(result.scalars().all()), limit)
+
+    def _keyset_statement(self, statement, cursor: Optional[str], limit: int):
+        order_column, id_column = self._order_columns()
+        statement = statement.order_by(order_column, id_column)
+        if cursor:
+            order_value, id_value = self.decode_cursor(cursor)
+            statement = statement.where(
+                tuple_(order_column, id_column) > tuple_(order_value, id_value)
+            )
+        # Pedimos una fila extra para saber si existe una página siguiente
+        return statement.limit(limit + 1)
+
+    def _split_page(
+        self, items: List[Any], limit: int
+    ) -> Tuple[List[Any], Optional[str]]:
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = self.encode_cursor(items[-1])
+        return items, next_cursor
+
+    def row_columns(self, schema: Type[BaseModel]) -> List[Any]:
+        """
+        Columnas de la tabla que `schema` expone (más las del orden, que necesita el
+        cursor). Lo que el schema no declara, como auth_settings, ni se lee.
+        """
+        columns = self._row_columns.get(schema)
+        if columns is None:
+            table_columns = self.model.__table__.columns
+            names = [name for name in schema.model_fields if name in table_columns]
+            for name in (self.cursor_column, "id"):
+                if name not in names:
+                    names.append(name)
+            columns = self._row_columns[schema] = [table_columns[n] for n in names]
+        return columns
+
+    async def get_row(
+        self, db: AsyncSession, id: Any, *, schema: Type[BaseModel]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Como get(), pero devuelve un dict con las columnas de `schema` en lugar del
+        objeto ORM: sin identity map ni validación, listo para OrjsonResponse.
+        """
+        statement = select(*self.row_columns(schema)).where(self.model.id == id)
+        result = await self._execute_query(db, statement, operation="get_row")
+        row = result.one_or_none()
+        return row._asdict() if row is not None else None
+
+    async def get_row_or_404(
+        self, db: AsyncSession, id: Any, *, schema: Type[BaseModel]
+    ) -> Dict[str, Any]:
+        row = await self.get_row(db, id, schema=schema)
+        if row is None:
+            raise ResourceNotFound(resource=self.model.__name__, identifier=f"ID {id}")
+        return row
+
+    async def get_page_rows(
+        self,
+        db: AsyncSession,
+        *,
+        schema: Type[BaseModel],
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Como get_page(), pero con dicts de las columnas de `schema`. Las filas no
+        pasan por el ORM ni por Pydantic: los endpoints de listado las entregan tal
+        cual al encoder. Los valores son los de la base de datos, así que solo
+        sirve para schemas de lectura que no transforman los campos.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        statement = self._keyset_statement(
+            select(*self.row_columns(schema)), cursor, limit
+        )
+        result = await self._execute_query(db, statement, operation="get_page_rows")
+        rows, next_cursor = self._split_page(list(result.all()), limit)
+        return [row._asdict() for row in rows], next_cursor
+
+    def _filter_clauses(self, filters: Optional[Dict[str, Any]]) -> List[Any]:
+        """Traduce {columna: valor} a condiciones de igualdad; ignora valores None."""
+        clauses = []
+        for name, value in (filters or {}).items():
+            if value is None:
+                continue
+            column = self.model.__table__.columns.get(name)
+            if column is None:
+                raise ValidationError(
+                    f"Unknown filter '{name}' for {self.model.__name__}."
+                )
+            clauses.append(column == value)
+        return clauses
+
+    async def stream(
+        self,
+        db: AsyncSession,
+        *,
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[ModelType]:
+        """
+        Recorre todas las filas (filtradas) con un cursor del lado del servidor.
+
+        Las filas llegan en bloques de `batch_size`, así que la memoria no depende
+        del tamaño de la tabla. La sesión debe permanecer abierta mientras se itera.
+        """
+        order_column, id_column = self._order_columns()
+        statement = (
+            select(self.model)
+            .where(*self._filter_clauses(filters))
+            .order_by(order_column, id_column)
+            .execution_options(yield_per=batch_size)
+        )
+        try:
+            result = await db.stream_scalars(statement)
+            async for db_obj in result:
+                yield db_obj
+        except SQLAlchemyError as e:
+            await db.rollback()
+            logger.error(
+                "Database error during stream for %s: %s",
+                self.model.__name__,
+                e,
+                exc_info=True,
+            )
+            raise DatabaseError(
+                "Could not complete stream due to a database issue.",
+                original_exception=e,
+            )
+
+    def _column_values(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Descarta claves que no son columnas de la tabla (p. ej. relaciones anidadas)."""
+        columns = self.model.__table__.columns
+        return {key: value for key, value in data.items() if key in columns}
+
+    async def create(
+        self,
+        db: AsyncSession,
+        *,
+        obj_in: Union[CreateSchemaType, Dict[str, Any]],
+    ) -> ModelType:
+        """
+        Crea un objeto con un único INSERT ... RETURNING: los campos generados
+        (id, defaults) vuelven en la misma ida y vuelta, sin refresh posterior.
+        """
+        logger.debug(
+            "Attempting to create %s with data: %s", self.model.__name__, obj_in
+        )
+        obj_in_data = self._column_values(jsonable_encoder(obj_in))
+        statement = (
+            sqlalchemy_insert(self.model).values(**obj_in_data).returning(self.model)
+        )
+        result = await self._execute_query(db, statement, operation="create")
+        created_obj = result.scalar_one()
+        await self._commit_and_refresh(
+            db, created_obj, operation="create", refresh=False
+        )
         logger.info(
-            f"Successfully created {self.model.__name__} with ID: {created_obj.id}"
+            "Successfully created %s with ID: %s", self.model.__name__, created_obj.id
         )
         return created_obj
 
@@ -142,43 +496,70 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]],
     ) -> ModelType:
+        """
+        Actualiza con un único UPDATE ... WHERE id = :id RETURNING, sin leer la fila
+        antes ni hacer refresh después.
+        """
         logger.debug(
-            f"Attempting to update {self.model.__name__} (ID: {db_obj.id}) with data: {obj_in}"
+            "Attempting to update %s (ID: %s) with data: %s",
+            self.model.__name__,
+            db_obj.id,
+            obj_in,
         )
-        obj_data = jsonable_encoder(db_obj)
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
             update_data = obj_in.model_dump(exclude_unset=True)
+        update_data = self._column_values(update_data)
+        if not update_data:
+            return db_obj
 
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-
-        db.add(db_obj)  # SQLAlchemy maneja esto como una actualización
-        updated_obj = await self._commit_and_refresh(db, db_obj, operation="update")
+        statement = (
+            sqlalchemy_update(self.model)
+            .where(self.model.id == db_obj.id)
+            .values(**update_data)
+            .returning(self.model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await self._execute_query(db, statement, operation="update")
+        updated_obj = result.scalar_one_or_none()
+        if updated_obj is None:
+            raise ResourceNotFound(
+                resource=self.model.__name__, identifier=f"ID {db_obj.id}"
+            )
+        await self._commit_and_refresh(
+            db, updated_obj, operation="update", refresh=False
+        )
         logger.info(
-            f"Successfully updated {self.model.__name__} with ID: {updated_obj.id}"
+            "Successfully updated %s with ID: %s", self.model.__name__, updated_obj.id
         )
         return updated_obj
 
     async def remove(self, db: AsyncSession, *, id: Any) -> Optional[ModelType]:
-        logger.debug(f"Attempting to remove {self.model.__name__} with ID: {id}")
+        logger.debug("Attempting to remove %s with ID: %s", self.model.__name__, id)
         # Usamos get_or_404 para asegurar que existe antes de intentar borrar
         # obj = await self.get_or_404(db, id) # Opcional: Lanza 404 si no existe
-        obj = await self.get(db, id)  # O simplemente intenta borrar
+        obj = await self.get(db, id, use_cache=False)  # O simplemente intenta borrar
         if obj:
             try:
                 await db.delete(obj)
-                await db.commit()
-                logger.info(f"Successfully removed {self.model.__name__} with ID: {id}")
+                if in_unit_of_work(db):
+                    await db.flush()
+                else:
+                    await db.commit()
+                logger.info(
+                    "Successfully removed %s with ID: %s", self.model.__name__, id
+                )
                 return obj
             except (
                 IntegrityError
             ) as e:  # Ej: Si otras tablas dependen de esta fila y no hay CASCADE
                 await db.rollback()
                 logger.error(
-                    f"Database integrity error during remove for {self.model.__name__} (ID: {id}): {e}",
+                    "Database integrity error during remove for %s (ID: %s): %s",
+                    self.model.__name__,
+                    id,
+                    e,
                     exc_info=True,
                 )
                 raise DatabaseError(
@@ -188,7 +569,10 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             except SQLAlchemyError as e:
                 await db.rollback()
                 logger.error(
-                    f"Database error during remove for {self.model.__name__} (ID: {id}): {e}",
+                    "Database error during remove for %s (ID: %s): %s",
+                    self.model.__name__,
+                    id,
+                    e,
                     exc_info=True,
                 )
                 raise DatabaseError(
@@ -198,7 +582,10 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             except Exception as e:
                 await db.rollback()
                 logger.error(
-                    f"Unexpected error during remove for {self.model.__name__} (ID: {id}): {e}",
+                    "Unexpected error during remove for %s (ID: %s): %s",
+                    self.model.__name__,
+                    id,
+                    e,
                     exc_info=True,
                 )
                 raise DatabaseError(
@@ -206,7 +593,9 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 )
         else:
             logger.warning(
-                f"Attempted to remove non-existent {self.model.__name__} with ID: {id}"
+                "Attempted to remove non-existent %s with ID: %s",
+                self.model.__name__,
+                id,
             )
             # Opcionalmente lanzar ResourceNotFound aquí si se espera que siempre exista
             # raise ResourceNotFound(resource=self.model.__name__, identifier=f"ID {id}")
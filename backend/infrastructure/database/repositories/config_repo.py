@@ -1,10 +1,129 @@
+import logging
+import uuid
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from .base_repo import BaseRepository
 from domain.models.config import ScrapeConfig
 from application.schemas.config import ConfigCreate, ConfigUpdate
+from infrastructure.cache.lru import TTLCache
+from infrastructure.config.settings import settings
+from infrastructure.database.notifications import publish
+
+logger = logging.getLogger(__name__)
+
+# Canal de Postgres por el que se anuncian configs modificadas o borradas
+CONFIG_INVALIDATION_CHANNEL = "scrape_config_invalidation"
 
 
 class ConfigRepository(BaseRepository[ScrapeConfig, ConfigCreate, ConfigUpdate]):
-    pass
+    """
+    Repositorio de ScrapeConfig con caché read-through (TTL + LRU) en get/get_or_404.
+
+    Los objetos cacheados están desvinculados de la sesión (expunge) y son de solo
+    lectura: para modificar o borrar, obtener la config con use_cache=False.
+    update/remove invalidan la entrada local y, si CONFIG_CACHE_NOTIFY está activo,
+    la de los demás procesos mediante NOTIFY.
+    """
+
+    def __init__(self, model):
+        super().__init__(model)
+        self.cache: TTLCache[uuid.UUID, ScrapeConfig] = TTLCache(
+            maxsize=settings.CONFIG_CACHE_SIZE, ttl=settings.CONFIG_CACHE_TTL
+        )
+
+    def _cache_put(self, db: AsyncSession, db_obj: ScrapeConfig) -> None:
+        db.expunge(db_obj)
+        self.cache.set(db_obj.id, db_obj)
+
+    async def get(
+        self, db: AsyncSession, id: Any, *, use_cache: bool = True
+    ) -> Optional[ScrapeConfig]:
+        if use_cache:
+            cached = self.cache.get(id)
+            if cached is not None:
+                return cached
+        db_obj = await super().get(db, id)
+        if db_obj is not None and use_cache:
+            self._cache_put(db, db_obj)
+        return db_obj
+
+    async def get_many(
+        self, db: AsyncSession, ids: Sequence[Any]
+    ) -> List[ScrapeConfig]:
+        """Como get_many de la base, pero solo consulta los IDs que no están en caché."""
+        found: List[ScrapeConfig] = []
+        missing = []
+        for config_id in ids:
+            cached = self.cache.get(config_id)
+            if cached is not None:
+                found.append(cached)
+            else:
+                missing.append(config_id)
+        if missing:
+            for db_obj in await super().get_many(db, missing):
+                self._cache_put(db, db_obj)
+                found.append(db_obj)
+        return found
+
+    def invalidate(self, config_id: uuid.UUID) -> None:
+        self.cache.pop(config_id)
+
+    def handle_invalidation(self, channel: str, payload: str) -> None:
+        """Callback del listener LISTEN/NOTIFY: el payload es el ID de la config."""
+        try:
+            self.invalidate(uuid.UUID(payload))
+        except ValueError:
+            logger.warning(
+                "Ignoring malformed config invalidation payload: %s", payload
+            )
+
+    async def _publish_invalidation(
+        self, db: AsyncSession, config_id: uuid.UUID
+    ) -> None:
+        if settings.CONFIG_CACHE_NOTIFY:
+            await publish(db, CONFIG_INVALIDATION_CHANNEL, str(config_id))
+
+    async def create(
+        self, db: AsyncSession, *, obj_in: Union[ConfigCreate, Dict[str, Any]]
+    ) -> ScrapeConfig:
+        """
+        Como BaseRepository.create, pero sin jsonable_encoder, que convertiría
+        retry_interval (timedelta) en segundos. Los campos omitidos toman los
+        valores por defecto del modelo.
+        """
+        if isinstance(obj_in, dict):
+            obj_in = ConfigCreate(**obj_in)
+        data = obj_in.model_dump(exclude_none=True)
+        statement = insert(self.model).values(**data).returning(self.model)
+        result = await self._execute_query(db, statement, operation="create")
+        created_obj = result.scalar_one()
+        await self._commit_and_refresh(
+            db, created_obj, operation="create", refresh=False
+        )
+        logger.info("Successfully created ScrapeConfig with ID: %s", created_obj.id)
+        return created_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ScrapeConfig,
+        obj_in: Union[ConfigUpdate, Dict[str, Any]],
+    ) -> ScrapeConfig:
+        # El NOTIFY se emite en la misma transacción que el UPDATE
+        await self._publish_invalidation(db, db_obj.id)
+        updated_obj = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        self.invalidate(updated_obj.id)
+        return updated_obj
+
+    async def remove(self, db: AsyncSession, *, id: Any) -> Optional[ScrapeConfig]:
+        await self._publish_invalidation(db, id)
+        removed = await super().remove(db, id=id)
+        self.invalidate(id)
+        return removed
 
 
 config_repo = ConfigRepository(ScrapeConfig)
@@ -0,0 +1,159 @@
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .base_repo import BaseRepository
+from domain.models.config import ScrapeConfig
+from domain.models.field_rollup import FieldRollup
+
+# Contadores que se suman al aplicar incrementos
+ROLLUP_COUNTERS = ("result_count", "match_count", "value_count")
+
+
+@dataclass
+class FieldRollupDelta:
+    """Incremento de los contadores de una fila (config, campo, día)."""
+
+    config_id: uuid.UUID
+    field: str
+    day: date
+    result_count: int = 0
+    match_count: int = 0
+    value_count: int = 0
+
+
+class FieldRollupRepository(BaseRepository[FieldRollup, Any, Any]):
+    cursor_column = "day"
+
+    async def apply_deltas(
+        self,
+        db: AsyncSession,
+        deltas: Sequence[FieldRollupDelta],
+        *,
+        commit: bool = True,
+    ) -> None:
+        """
+        Suma los incrementos con un único INSERT ... ON CONFLICT DO UPDATE
+        (`result_count = field_rollup.result_count + excluded.result_count`).
+        Las claves deben ser únicas; se escriben ordenadas para que dos procesos que
+        actualizan las mismas filas las bloqueen en el mismo orden.
+        """
+        if not deltas:
+            return
+        rows = sorted(
+            (asdict(delta) for delta in deltas),
+            key=lambda row: (str(row["config_id"]), row["field"], row["day"]),
+        )
+        statement = insert(self.model).values(rows)
+        table = self.model.__table__
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.config_id, table.c.field, table.c.day],
+            set_={
+                **{
+                    name: table.c[name] + statement.excluded[name]
+                    for name in ROLLUP_COUNTERS
+                },
+                "updated_at": func.now(),
+            },
+        )
+        await self._execute_query(db, statement, operation="apply_deltas")
+        if commit:
+            await self._commit(db, operation="apply_deltas")
+
+    def _filtered(
+        self,
+        statement,
+        *,
+        date_from: date,
+        date_to: date,
+        config_id: Optional[uuid.UUID],
+        site_name: Optional[str],
+        field: Optional[str],
+    ):
+        statement = statement.join(
+            ScrapeConfig, ScrapeConfig.id == self.model.config_id
+        ).where(self.model.day.between(date_from, date_to))
+        if config_id is not None:
+            statement = statement.where(self.model.config_id == config_id)
+        if site_name is not None:
+            statement = statement.where(ScrapeConfig.site_name == site_name)
+        if field is not None:
+            statement = statement.where(self.model.field == field)
+        return statement
+
+    async def get_daily(
+        self,
+        db: AsyncSession,
+        *,
+        date_from: date,
+        date_to: date,
+        config_id: Optional[uuid.UUID] = None,
+        site_name: Optional[str] = None,
+        field: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Serie diaria por (config, campo), ordenada por día."""
+        statement = self._filtered(
+            select(
+                self.model.config_id,
+                ScrapeConfig.site_name,
+                self.model.field,
+                self.model.day,
+                *(self.model.__table__.c[name] for name in ROLLUP_COUNTERS),
+            ),
+            date_from=date_from,
+            date_to=date_to,
+            config_id=config_id,
+            site_name=site_name,
+            field=field,
+        ).order_by(self.model.day, self.model.config_id, self.model.field)
+        result = await self._execute_query(db, statement, operation="get_daily")
+        return [dict(row) for row in result.mappings().all()]
+
+    async def get_totals(
+        self,
+        db: AsyncSession,
+        *,
+        date_from: date,
+        date_to: date,
+        config_id: Optional[uuid.UUID] = None,
+        site_name: Optional[str] = None,
+        field: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Totales por (config, campo) en el rango [date_from, date_to]."""
+        statement = self._filtered(
+            select(
+                self.model.config_id,
+                ScrapeConfig.site_name,
+                self.model.field,
+                *(
+                    func.sum(self.model.__table__.c[name]).label(name)
+                    for name in ROLLUP_COUNTERS
+                ),
+            ),
+            date_from=date_from,
+            date_to=date_to,
+            config_id=config_id,
+            site_name=site_name,
+            field=field,
+        )
+        statement = statement.group_by(
+            self.model.config_id, ScrapeConfig.site_name, self.model.field
+        ).order_by(ScrapeConfig.site_name, self.model.field)
+        result = await self._execute_query(db, statement, operation="get_totals")
+        return [
+            {
+                **row,
+                **{name: int(row[name]) for name in ROLLUP_COUNTERS},
+                "date_from": date_from,
+                "date_to": date_to,
+            }
+            for row in result.mappings().all()
+        ]
+
+
+field_rollup_repo = FieldRollupRepository(FieldRollup)
@@ -0,0 +1,65 @@
+from typing import Any, Dict, Mapping, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .base_repo import BaseRepository
+from domain.models.insight_cache import InsightCache
+
+
+class InsightCacheRepository(BaseRepository[InsightCache, Any, Any]):
+    """Caché de respuestas del modelo por (content_hash, prompt_version, model)."""
+
+    async def get_cached(
+        self,
+        db: AsyncSession,
+        content_hashes: Sequence[str],
+        *,
+        prompt_version: str,
+        model: str,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Análisis ya guardados de `content_hashes`, como {content_hash: insights}."""
+        if not content_hashes:
+            return {}
+        statement = select(self.model.content_hash, self.model.insights).where(
+            self.model.content_hash.in_(content_hashes),
+            self.model.prompt_version == prompt_version,
+            self.model.model == model,
+        )
+        result = await self._execute_query(db, statement, operation="get_cached")
+        return {content_hash: insights for content_hash, insights in result.all()}
+
+    async def put_many(
+        self,
+        db: AsyncSession,
+        entries: Mapping[str, Dict[str, Any]],
+        *,
+        prompt_version: str,
+        model: str,
+    ) -> None:
+        """
+        Guarda {content_hash: insights} con un único INSERT ... ON CONFLICT DO NOTHING
+        (otro proceso pudo analizar el mismo contenido a la vez). No hace commit.
+        """
+        if not entries:
+            return
+        statement = (
+            insert(self.model)
+            .values(
+                [
+                    {
+                        "content_hash": content_hash,
+                        "prompt_version": prompt_version,
+                        "model": model,
+                        "insights": insights,
+                    }
+                    for content_hash, insights in entries.items()
+                ]
+            )
+            .on_conflict_do_nothing()
+        )
+        await self._execute_query(db, statement, operation="put_many")
+
+
+insight_cache_repo = InsightCacheRepository(InsightCache)
@@ -1,10 +1,164 @@
-from .base_repo import BaseRepository
+import logging
+import uuid
+from typing import List, Mapping, Sequence
+
+from sqlalchemy import any_, bindparam, exists, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .base_repo import MAX_PAGE_SIZE, BaseRepository
 from domain.models.job import ScrapingJob
+from domain.models.scrape_url import ScrapeUrl
 from application.schemas.job import JobCreate, JobUpdate
 
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = (
+    "total_urls",
+    "success_count",
+    "error_count",
+    "changed_count",
+    "unchanged_count",
+)
+
+# Estados de URL que aún pueden cambiar: un job con alguna no está terminado
+OPEN_URL_STATUSES = ("pending", "in_progress", "retry")
+
+# Canal NOTIFY por el que el trigger notify_job_progress publica cada cambio de un job
+JOB_PROGRESS_CHANNEL = "scraping_job_progress"
+
 
 class JobRepository(BaseRepository[ScrapingJob, JobCreate, JobUpdate]):
-    pass
+    # ScrapingJob no tiene created_at; su marca temporal de alta es started_at
+    cursor_column = "started_at"
+
+    async def get_running(
+        self, db: AsyncSession, *, limit: int = MAX_PAGE_SIZE
+    ) -> List[ScrapingJob]:
+        """Jobs en estado 'running', los más recientes primero."""
+        statement = (
+            select(self.model)
+            .where(self.model.status == "running")
+            .order_by(self.model.started_at.desc())
+            .limit(limit)
+        )
+        result = await self._execute_query(db, statement, operation="get_running")
+        return list(result.scalars().all())
+
+    async def increment_counters(
+        self,
+        db: AsyncSession,
+        job_id: uuid.UUID,
+        *,
+        total_urls: int = 0,
+        success_count: int = 0,
+        error_count: int = 0,
+        changed_count: int = 0,
+        unchanged_count: int = 0,
+        commit: bool = True,
+    ) -> None:
+        """
+        Incrementa los contadores de un job con un único
+        `UPDATE ... SET success_count = success_count + :n`, sin leer la fila antes,
+        por lo que incrementos concurrentes no se pierden.
+        """
+        await self.increment_counters_many(
+            db,
+            {
+                job_id: {
+                    "total_urls": total_urls,
+                    "success_count": success_count,
+                    "error_count": error_count,
+                    "changed_count": changed_count,
+                    "unchanged_count": unchanged_count,
+                }
+            },
+            commit=commit,
+        )
+
+    async def increment_counters_many(
+        self,
+        db: AsyncSession,
+        deltas: Mapping[uuid.UUID, Mapping[str, int]],
+        *,
+        commit: bool = True,
+    ) -> None:
+        """
+        Aplica incrementos a varios jobs en un único executemany.
+        `deltas` es {job_id: {contador: n}} con contadores de COUNTER_FIELDS; los
+        que falten cuentan como 0.
+        """
+        # Orden fijo de las filas bloqueadas: dos lotes con los mismos jobs no se
+        # interbloquean
+        params = [
+            {
+                "b_id": job_id,
+                **{f"b_{name}": delta.get(name, 0) for name in COUNTER_FIELDS},
+            }
+            for job_id, delta in sorted(deltas.items())
+            if any(delta.get(name, 0) for name in COUNTER_FIELDS)
+        ]
+        if not params:
+            return
+        table = self.model.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(
+                {
+                    name: func.coalesce(table.c[name], 0) + bindparam(f"b_{name}")
+                    for name in COUNTER_FIELDS
+                }
+            )
+        )
+        await self._execute_query(
+            db, statement, operation="increment_counters", params=params
+        )
+        if commit:
+            await self._commit(db, operation="increment_counters")
+
+    async def complete_finished(
+        self, db: AsyncSession, job_ids: Sequence[uuid.UUID], *, commit: bool = True
+    ) -> List[uuid.UUID]:
+        """
+        Pasa a 'completed' (con finished_at) los jobs de `job_ids` que siguen
+        abiertos y ya no tienen URLs en OPEN_URL_STATUSES. Devuelve los cerrados.
+
+        Se llama en la transacción que cierra URLs, después de incrementar los
+        contadores de esos jobs: aquel UPDATE bloquea sus filas, así que dos workers
+        que cierran a la vez las últimas URLs de un job se serializan y el segundo
+        ve las URLs del primero. La notificación de 'completed' ya lleva los totales.
+        """
+        if not job_ids:
+            return []
+        statement = self._prebuilt(
+            "complete_finished",
+            lambda: update(self.model)
+            .where(
+                self.model.id
+                == any_(bindparam("job_ids", type_=ARRAY(UUID(as_uuid=True)))),
+                self.model.status.in_(("pending", "running")),
+                ~exists().where(
+                    ScrapeUrl.job_id == self.model.id,
+                    ScrapeUrl.status.in_(OPEN_URL_STATUSES),
+                ),
+            )
+            .values(status="completed", finished_at=func.now())
+            .returning(self.model.id)
+            .execution_options(synchronize_session=False),
+        )
+        result = await self._execute_query(
+            db,
+            statement,
+            operation="complete_finished",
+            params={"job_ids": list(job_ids)},
+        )
+        completed = list(result.scalars().all())
+        if commit:
+            await self._commit(db, operation="complete_finished")
+        if completed:
+            logger.info("Completed jobs %s", completed)
+        return completed
 
 
 job_repo = JobRepository(ScrapingJob)
@@ -0,0 +1,195 @@
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .base_repo import BaseRepository
+from domain.models.schedule import ScrapingSchedule
+from application.schemas.schedule import ScheduleCreate, ScheduleUpdate
+from application.services.scheduling import next_fire_time
+from domain.exceptions import ValidationError
+from infrastructure.database.notifications import publish
+
+logger = logging.getLogger(__name__)
+
+# Canal de Postgres por el que se anuncian programaciones creadas, modificadas o
+# borradas; el scheduler líder recarga solo esas filas
+SCHEDULE_CHANGED_CHANNEL = "scraping_schedule_changed"
+
+# Clave del advisory lock de sesión que elige al scheduler líder
+SCHEDULER_LEADER_LOCK = 7_316_002
+
+# Campos que determinan el próximo disparo
+RECURRENCE_FIELDS = ("cron", "interval_seconds", "timezone")
+NOT_NULL_FIELDS = ("timezone", "urls", "is_active", "scheduled_at")
+
+
+class ScheduleRepository(
+    BaseRepository[ScrapingSchedule, ScheduleCreate, ScheduleUpdate]
+):
+    """
+    Repositorio de ScrapingSchedule.
+
+    create/update calculan `scheduled_at` (el próximo disparo) y, en la misma
+    transacción, publican el ID por SCHEDULE_CHANGED_CHANNEL para que el scheduler
+    no tenga que releer todas las programaciones.
+    """
+
+    async def _publish_change(self, db: AsyncSession, schedule_id: uuid.UUID) -> None:
+        await publish(db, SCHEDULE_CHANGED_CHANNEL, str(schedule_id))
+
+    async def create(
+        self, db: AsyncSession, *, obj_in: Union[ScheduleCreate, Dict[str, Any]]
+    ) -> ScrapingSchedule:
+        if isinstance(obj_in, dict):
+            obj_in = ScheduleCreate(**obj_in)
+        data = obj_in.model_dump()
+        # JSONB: HttpUrl y UUID de las URLs como texto
+        data["urls"] = jsonable_encoder(data["urls"])
+        data["id"] = uuid.uuid4()
+        if data["scheduled_at"] is None:
+            data["scheduled_at"] = next_fire_time(
+                cron=obj_in.cron,
+                interval_seconds=obj_in.interval_seconds,
+                tz=obj_in.timezone,
+                after=datetime.now(timezone.utc),
+            )
+        statement = insert(self.model).values(**data).returning(self.model)
+        await self._publish_change(db, data["id"])
+        result = await self._execute_query(db, statement, operation="create")
+        created_obj = result.scalar_one()
+        await self._commit_and_refresh(
+            db, created_obj, operation="create", refresh=False
+        )
+        logger.info(
+            "Successfully created schedule %s (next fire at %s)",
+            created_obj.id,
+            created_obj.scheduled_at,
+        )
+        return created_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ScrapingSchedule,
+        obj_in: Union[ScheduleUpdate, Dict[str, Any]],
+    ) -> ScrapingSchedule:
+        """
+        Como BaseRepository.update, pero recalcula el próximo disparo cuando cambia
+        la recurrencia (o se indica scheduled_at) y lo notifica al scheduler.
+        """
+        if isinstance(obj_in, dict):
+            update_data = dict(obj_in)
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        # Columnas NOT NULL: un null explícito equivale a no indicarlas
+        for name in NOT_NULL_FIELDS:
+            if name in update_data and update_data[name] is None:
+                del update_data[name]
+        if "urls" in update_data:
+            update_data["urls"] = jsonable_encoder(update_data["urls"])
+        merged = {
+            name: update_data.get(name, getattr(db_obj, name))
+            for name in RECURRENCE_FIELDS
+        }
+        if merged["cron"] and merged["interval_seconds"]:
+            raise ValidationError("Set either cron or interval_seconds, not both.")
+        if "scheduled_at" in update_data:
+            update_data["is_processed"] = False
+        elif any(name in update_data for name in RECURRENCE_FIELDS):
+            next_fire = next_fire_time(
+                cron=merged["cron"],
+                interval_seconds=merged["interval_seconds"],
+                tz=merged["timezone"],
+                after=datetime.now(timezone.utc),
+            )
+            # Sin recurrencia queda como programación de un solo disparo pendiente
+            if next_fire is not None:
+                update_data["scheduled_at"] = next_fire
+                update_data["is_processed"] = False
+        await self._publish_change(db, db_obj.id)
+        return await super().update(db, db_obj=db_obj, obj_in=update_data)
+
+    async def remove(self, db: AsyncSession, *, id: Any) -> Optional[ScrapingSchedule]:
+        await self._publish_change(db, id)
+        return await super().remove(db, id=id)
+
+    def _pending_clauses(self):
+        # Mismo predicado que el índice parcial ix_scraping_schedule_pending_scheduled_at
+        return self.model.is_active, ~self.model.is_processed
+
+    async def get_fire_times(
+        self, db: AsyncSession, ids: Optional[Sequence[uuid.UUID]] = None
+    ) -> List[Tuple[uuid.UUID, datetime]]:
+        """
+        (id, próximo disparo) de las programaciones activas y pendientes, o solo de
+        `ids`. Lee dos columnas por fila sobre el índice parcial, de modo que la
+        carga inicial del scheduler es barata incluso con miles de programaciones.
+        """
+        statement = select(self.model.id, self.model.scheduled_at).where(
+            *self._pending_clauses()
+        )
+        if ids is not None:
+            if not ids:
+                return []
+            statement = statement.where(self.model.id.in_(ids))
+        result = await self._execute_query(db, statement, operation="get_fire_times")
+        return [(id_, scheduled_at) for id_, scheduled_at in result.all()]
+
+    async def claim_due(
+        self, db: AsyncSession, schedule_id: uuid.UUID, due_at: datetime
+    ) -> Optional[ScrapingSchedule]:
+        """
+        Reclama el disparo `due_at` de una programación y la avanza al siguiente.
+
+        Bloquea la fila con FOR UPDATE SKIP LOCKED solo si sigue activa, pendiente
+        y con ese mismo scheduled_at: es un compare-and-set, así que dos
+        schedulers que se crean líderes a la vez (o un disparo repetido) nunca
+        crean dos jobs para el mismo disparo. Devuelve None si el disparo ya no es
+        válido (reclamado, modificado o borrado).
+
+        No hace commit: el job del disparo se crea en la misma transacción.
+        """
+        statement = (
+            select(self.model)
+            .where(
+                self.model.id == schedule_id,
+                self.model.scheduled_at == due_at,
+                *self._pending_clauses(),
+            )
+            .with_for_update(skip_locked=True)
+        )
+        result = await self._execute_query(db, statement, operation="claim_due")
+        schedule = result.scalar_one_or_none()
+        if schedule is None:
+            return None
+        now = datetime.now(timezone.utc)
+        next_fire = next_fire_time(
+            cron=schedule.cron,
+            interval_seconds=schedule.interval_seconds,
+            tz=schedule.timezone,
+            after=max(now, due_at),
+            anchor=due_at,
+        )
+        values: Dict[str, Any] = {"last_run_at": now}
+        if next_fire is None:
+            values["is_processed"] = True
+        else:
+            values["scheduled_at"] = next_fire
+        statement = (
+            update(self.model)
+            .where(self.model.id == schedule_id)
+            .values(**values)
+            .returning(self.model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await self._execute_query(db, statement, operation="claim_due")
+        return result.scalar_one()
+
+
+schedule_repo = ScheduleRepository(ScrapingSchedule)
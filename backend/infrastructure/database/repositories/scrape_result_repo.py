@@ -0,0 +1,184 @@
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .base_repo import BaseRepository
+from domain.models.scrape_result import ScrapeResult
+from domain.models.scraped_data import ScrapedData
+from application.schemas.scraped_data import ScrapeResultCreate, ScrapedDataUpdate
+from application.services.compression import decompress
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock (de transacción) para que un solo proceso mantenga las particiones a la vez
+PARTITION_MAINTENANCE_LOCK = 7_316_001
+
+
+def _month_start(value: datetime, offset: int = 0) -> datetime:
+    """Primer instante (UTC) del mes de `value` desplazado `offset` meses."""
+    month_index = value.year * 12 + (value.month - 1) + offset
+    return datetime(month_index // 12, month_index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month_start: datetime) -> str:
+    return f"scrape_result_{month_start:%Y_%m}"
+
+
+class ScrapeResultRepository(
+    BaseRepository[ScrapeResult, ScrapeResultCreate, ScrapedDataUpdate]
+):
+    cursor_column = "scraped_at"
+
+    async def insert_many(
+        self, db: AsyncSession, objs_in: Sequence[ScrapeResultCreate]
+    ) -> List[Tuple[uuid.UUID, datetime]]:
+        """
+        Añade resultados al histórico con un único INSERT multi-fila.
+        Devuelve (id, scraped_at) de cada fila en el orden de entrada, para que
+        ScrapedData apunte a ellas. No hace commit.
+        """
+        if not objs_in:
+            return []
+        now = datetime.now(timezone.utc)
+        rows = [
+            {**obj_in.model_dump(), "id": uuid.uuid4(), "scraped_at": now}
+            for obj_in in objs_in
+        ]
+        statement = insert(self.model).values(rows)
+        await self._execute_query(db, statement, operation="insert_many")
+        return [(row["id"], now) for row in rows]
+
+    def _latest_statement(self):
+        # Join por la clave primaria completa (id, scraped_at): con scraped_at conocido
+        # en tiempo de ejecución Postgres poda el resto de particiones
+        return select(self.model).join(
+            ScrapedData,
+            and_(
+                self.model.id == ScrapedData.result_id,
+                self.model.scraped_at == ScrapedData.result_scraped_at,
+            ),
+        )
+
+    async def get_latest(
+        self, db: AsyncSession, url_id: uuid.UUID
+    ) -> Optional[ScrapeResult]:
+        """Último resultado de una URL, sin recorrer su histórico."""
+        statement = self._latest_statement().where(ScrapedData.url_id == url_id)
+        result = await self._execute_query(db, statement, operation="get_latest")
+        return result.scalar_one_or_none()
+
+    async def get_latest_many(
+        self, db: AsyncSession, url_ids: Sequence[uuid.UUID]
+    ) -> List[ScrapeResult]:
+        """Último resultado de cada URL de `url_ids` (las que no tienen se omiten)."""
+        if not url_ids:
+            return []
+        statement = self._latest_statement().where(ScrapedData.url_id.in_(url_ids))
+        result = await self._execute_query(db, statement, operation="get_latest_many")
+        return list(result.scalars().all())
+
+    async def get_history(
+        self, db: AsyncSession, url_id: uuid.UUID, *, limit: int = 20
+    ) -> List[ScrapeResult]:
+        """Resultados de una URL, más reciente primero."""
+        statement = (
+            select(self.model)
+            .where(self.model.url_id == url_id)
+            .order_by(self.model.scraped_at.desc())
+            .limit(limit)
+        )
+        result = await self._execute_query(db, statement, operation="get_history")
+        return list(result.scalars().all())
+
+    @staticmethod
+    def get_html(result: ScrapeResult) -> Optional[bytes]:
+        """HTML original de un resultado (descomprimido), o None si no se guardó."""
+        if result.html_compressed is None:
+            return None
+        return decompress(result.html_compressed, result.compression)
+
+    # --- Mantenimiento de particiones ---
+
+    async def list_partitions(self, db: AsyncSession) -> List[str]:
+        result = await self._execute_query(
+            db,
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:parent AS regclass) ORDER BY c.relname"
+            ).bindparams(parent=self.model.__tablename__),
+            operation="list_partitions",
+        )
+        return list(result.scalars().all())
+
+    async def maintain_partitions(
+        self,
+        db: AsyncSession,
+        *,
+        months_ahead: int = 2,
+        retention_months: int = 0,
+        now: Optional[datetime] = None,
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Crea las particiones mensuales del mes en curso y de los `months_ahead`
+        siguientes y, si `retention_months` > 0, elimina las anteriores a ese
+        periodo con DROP TABLE (sin DELETE ni VACUUM del histórico).
+
+        Se serializa con un advisory lock para poder llamarse desde varios procesos;
+        si otro lo tiene, no hace nada. Devuelve (creadas, eliminadas).
+        """
+        now = now or datetime.now(timezone.utc)
+        created: List[str] = []
+        dropped: List[str] = []
+        result = await self._execute_query(
+            db,
+            text("SELECT pg_try_advisory_xact_lock(:key)").bindparams(
+                key=PARTITION_MAINTENANCE_LOCK
+            ),
+            operation="partition_lock",
+        )
+        if not result.scalar():
+            await db.rollback()
+            return created, dropped
+        existing = set(await self.list_partitions(db))
+        parent = self.model.__tablename__
+        for offset in range(months_ahead + 1):
+            start = _month_start(now, offset)
+            name = partition_name(start)
+            if name in existing:
+                continue
+            end = _month_start(now, offset + 1)
+            await self._execute_query(
+                db,
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {parent} "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                ),
+                operation="create_partition",
+            )
+            created.append(name)
+        if retention_months > 0:
+            oldest_kept = partition_name(_month_start(now, -retention_months))
+            for name in sorted(existing):
+                # Los nombres scrape_result_YYYY_MM ordenan cronológicamente
+                if name < oldest_kept:
+                    await self._execute_query(
+                        db,
+                        text(f"DROP TABLE IF EXISTS {name}"),
+                        operation="drop_partition",
+                    )
+                    dropped.append(name)
+        await self._commit(db, operation="maintain_partitions")
+        if created or dropped:
+            logger.info(
+                "Scrape result partitions created: %s, dropped: %s", created, dropped
+            )
+        return created, dropped
+
+
+scrape_result_repo = ScrapeResultRepository(ScrapeResult)
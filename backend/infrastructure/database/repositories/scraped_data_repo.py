@@ -0,0 +1,109 @@
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import TIMESTAMP, column, select, update, values
+from sqlalchemy.dialects.postgresql import JSONB, UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .base_repo import BaseRepository
+from domain.models.scraped_data import ScrapedData
+from application.schemas.scraped_data import ScrapedDataCreate, ScrapedDataUpdate
+
+
+class ScrapedDataRepository(
+    BaseRepository[ScrapedData, ScrapedDataCreate, ScrapedDataUpdate]
+):
+    async def upsert_many(
+        self, db: AsyncSession, objs_in: Sequence[ScrapedDataCreate]
+    ) -> int:
+        """
+        Guarda el último resultado de cada URL con un único INSERT ... ON CONFLICT.
+        No hace commit: se usa dentro de la transacción que también cierra las URLs.
+        """
+        if not objs_in:
+            return 0
+        now = datetime.utcnow()
+        rows = [{**obj_in.model_dump(), "scraped_at": now} for obj_in in objs_in]
+        statement = insert(self.model).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[self.model.url_id],
+            set_={
+                "raw_payload": statement.excluded.raw_payload,
+                "cleaned_text": statement.excluded.cleaned_text,
+                "scraped_at": statement.excluded.scraped_at,
+                "job_id": statement.excluded.job_id,
+                "result_id": statement.excluded.result_id,
+                "result_scraped_at": statement.excluded.result_scraped_at,
+                # Contenido nuevo: el análisis anterior deja de ser válido
+                "insights": None,
+            },
+        )
+        result = await self._execute_query(db, statement, operation="upsert_many")
+        return result.rowcount
+
+    async def get_pending_insights(
+        self,
+        db: AsyncSession,
+        *,
+        job_id: uuid.UUID,
+        after_url_id: Optional[uuid.UUID] = None,
+        limit: int = 500,
+    ) -> List[ScrapedData]:
+        """
+        Resultados de un job aún sin analizar, ordenados por url_id.
+        `after_url_id` continúa tras la última fila de la página anterior (keyset),
+        de modo que las filas cuyo análisis falle no se vuelven a leer en la misma
+        pasada.
+        """
+        statement = (
+            select(self.model)
+            .where(self.model.job_id == job_id, self.model.insights.is_(None))
+            .order_by(self.model.url_id)
+            .limit(limit)
+        )
+        if after_url_id is not None:
+            statement = statement.where(self.model.url_id > after_url_id)
+        result = await self._execute_query(
+            db, statement, operation="get_pending_insights"
+        )
+        return list(result.scalars().all())
+
+    async def set_insights(
+        self,
+        db: AsyncSession,
+        insights: Mapping[Tuple[uuid.UUID, datetime], Dict[str, Any]],
+    ) -> int:
+        """
+        Guarda el análisis de varias filas en un único UPDATE unido a una lista VALUES.
+        Las claves son (url_id, scraped_at) de la fila analizada: si la URL se volvió a
+        scrapear entretanto, scraped_at ya no coincide y el análisis obsoleto se
+        descarta. No hace commit.
+        """
+        if not insights:
+            return 0
+        analyzed = values(
+            column("url_id", UUID(as_uuid=True)),
+            column("scraped_at", TIMESTAMP(timezone=True)),
+            column("insights", JSONB),
+            name="analyzed",
+        ).data(
+            [
+                (url_id, scraped_at, data)
+                for (url_id, scraped_at), data in insights.items()
+            ]
+        )
+        statement = (
+            update(self.model)
+            .where(
+                self.model.url_id == analyzed.c.url_id,
+                self.model.scraped_at == analyzed.c.scraped_at,
+            )
+            .values(insights=analyzed.c.insights)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._execute_query(db, statement, operation="set_insights")
+        return result.rowcount
+
+
+scraped_data_repo = ScrapedDataRepository(ScrapedData)
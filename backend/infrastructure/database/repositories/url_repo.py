@@ -1,12 +1,99 @@
+import logging
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import (
+    TIMESTAMP,
+    SmallInteger,
+    String,
+    Text,
+    all_,
+    bindparam,
+    case,
+    cast,
+    column,
+    func,
+    literal_column,
     select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, insert
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
 )
-from typing import List
 
 from .base_repo import BaseRepository
+from .job_repo import job_repo
 from domain.models.scrape_url import ScrapeUrl
 from application.schemas.url import UrlCreate, UrlUpdate
+from application.services.url_normalization import (
+    normalize_url,
+    strip_fragment,
+    url_hash,
+)
+
+logger = logging.getLogger(__name__)
+
+# asyncpg admite como máximo 32767 parámetros por sentencia; con 8 columnas
+# por fila, 1000 filas por INSERT deja un margen amplio.
+BULK_CHUNK_SIZE = 1000
+MAX_BULK_CHUNK_SIZE = 4000
+
+# Duración por defecto del lease de una URL reclamada por un worker
+DEFAULT_LEASE_SECONDS = 300
+
+# Campos del último fetch que finish_urls puede guardar por URL
+VALIDATOR_FIELDS = ("etag", "last_modified", "content_hash")
+
+# Estados finales: una URL en ellos puede volver a encolarse (requeue)
+FINISHED_STATUSES = ("success", "failed", "dead_letter")
+
+# Contadores de reintento que se ponen a cero al terminar bien o al reencolar
+RETRY_RESET_VALUES = {"attempts": 0, "next_attempt_at": None, "last_error": None}
+
+
+def url_host(url_column):
+    """Host (con puerto) de una URL calculado en SQL, como politeness.host_key."""
+    return func.lower(func.substring(url_column, r"^[^:/?#]+://([^/?#]*)"))
+
+
+@dataclass
+class BulkCreateResult:
+    """
+    Resultado de create_bulk: ids en orden de entrada y filas realmente nuevas
+    (incluidas las reencoladas con requeue=True).
+    """
+
+    ids: List[uuid.UUID] = field(default_factory=list)
+    inserted: int = 0
+
+    @property
+    def duplicates(self) -> int:
+        return len(self.ids) - self.inserted
+
+
+@dataclass
+class UrlFailure:
+    """Fallo de una URL para fail_urls: 'retry' con next_attempt_at, o 'dead_letter'."""
+
+    url_id: uuid.UUID
+    status: str
+    attempts: int
+    next_attempt_at: Optional[datetime] = None
+    error: Optional[str] = None
 
 
 class UrlRepository(BaseRepository[ScrapeUrl, UrlCreate, UrlUpdate]):
@@ -21,16 +108,518 @@ class UrlRepository(BaseRepository[ScrapeUrl, UrlCreate, UrlUpdate]):
     ) -> List[ScrapeUrl]:
         """
         Obtiene URLs pendientes, ordenadas por prioridad (desc) y fecha de creación (asc).
+        Solo lectura: para consumir la cola desde workers usar claim_pending_urls.
         """
-        statement = (
-            select(self.model)
+        statement = self._prebuilt(
+            "get_pending_urls_ordered",
+            lambda: select(self.model)
             .where(self.model.status == "pending")
             .order_by(self.model.priority.desc(), self.model.created_at.asc())
-            .limit(limit)
+            .limit(bindparam("limit")),
+        )
+        result = await self._execute_query(
+            db,
+            statement,
+            operation="get_pending_urls_ordered",
+            params={"limit": limit},
         )
-        result = await db.execute(statement)
         return result.scalars().all()
 
+    async def claim_pending_urls(
+        self,
+        db: AsyncSession,
+        *,
+        worker_id: str,
+        limit: int = 100,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+        exclude_hosts: Sequence[str] = (),
+    ) -> List[ScrapeUrl]:
+        """
+        Reclama atómicamente hasta `limit` URLs pendientes para `worker_id`.
+
+        Selecciona en el orden de la cola (prioridad desc, antigüedad asc) con
+        FOR UPDATE SKIP LOCKED, de modo que workers concurrentes nunca reciben la
+        misma fila ni se bloquean entre sí, y en la misma sentencia las pasa a
+        'in_progress' con un lease que vence a los `lease_seconds`.
+        Antes, en la misma transacción, devuelve a la cola los reintentos vencidos.
+
+        `exclude_hosts` (claves de politeness.host_key) salta las URLs de hosts que
+        el worker ya tiene saturados, para que un host lento con mucha cola no
+        ocupe todo su búfer mientras el resto de hosts espera.
+        """
+        await self._promote_due_retries(db, limit=limit)
+        conditions = [self.model.status == "pending"]
+        if exclude_hosts:
+            # Un único parámetro array: el SQL no cambia con el número de hosts
+            conditions.append(
+                url_host(self.model.url)
+                != all_(
+                    bindparam("exclude_hosts", list(exclude_hosts), type_=ARRAY(Text))
+                )
+            )
+        claimable = (
+            select(self.model.id)
+            .where(*conditions)
+            .order_by(self.model.priority.desc(), self.model.created_at.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("claimable")
+        )
+        statement = (
+            update(self.model)
+            .where(self.model.id == claimable.c.id)
+            .values(
+                status="in_progress",
+                lease_owner=worker_id,
+                lease_expires_at=func.now() + timedelta(seconds=lease_seconds),
+            )
+            .returning(self.model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await self._execute_query(
+            db, statement, operation="claim_pending_urls"
+        )
+        claimed = list(result.scalars().all())
+        await self._commit(db, operation="claim_pending_urls")
+        # RETURNING no garantiza orden: se restaura el de la cola
+        claimed.sort(key=lambda u: (-u.priority, u.created_at))
+        logger.debug("Worker %s claimed %s URLs", worker_id, len(claimed))
+        return claimed
+
+    async def _promote_due_retries(self, db: AsyncSession, *, limit: int) -> int:
+        """
+        Pasa a 'pending' hasta `limit` URLs en 'retry' cuyo next_attempt_at ya llegó.
+        Recorre solo el extremo del índice parcial ix_scrape_url_retry_next_attempt_at,
+        así que con nada vencido cuesta una lectura de índice. No hace commit.
+        """
+        due = (
+            select(self.model.id)
+            .where(
+                self.model.status == "retry", self.model.next_attempt_at <= func.now()
+            )
+            .order_by(self.model.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("due_retries")
+        )
+        statement = (
+            update(self.model)
+            .where(self.model.id == due.c.id)
+            .values(status="pending")
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._execute_query(
+            db, statement, operation="promote_due_retries"
+        )
+        return result.rowcount
+
+    async def renew_leases(
+        self,
+        db: AsyncSession,
+        *,
+        worker_id: str,
+        url_ids: Sequence[uuid.UUID],
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+    ) -> int:
+        """
+        Heartbeat: extiende el lease de las URLs que `worker_id` sigue procesando.
+        Devuelve cuántas filas se renovaron (las que el reclaimer ya liberó no cuentan).
+        """
+        if not url_ids:
+            return 0
+        statement = (
+            update(self.model)
+            .where(
+                self.model.id.in_(url_ids),
+                self.model.status == "in_progress",
+                self.model.lease_owner == worker_id,
+            )
+            .values(lease_expires_at=func.now() + timedelta(seconds=lease_seconds))
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._execute_query(db, statement, operation="renew_leases")
+        await self._commit(db, operation="renew_leases")
+        return result.rowcount
+
+    async def release_leases(
+        self, db: AsyncSession, *, worker_id: str, url_ids: Sequence[uuid.UUID]
+    ) -> int:
+        """Devuelve a 'pending' URLs reclamadas por `worker_id` que no llegó a procesar."""
+        if not url_ids:
+            return 0
+        statement = (
+            update(self.model)
+            .where(
+                self.model.id.in_(url_ids),
+                self.model.status == "in_progress",
+                self.model.lease_owner == worker_id,
+            )
+            .values(status="pending", lease_owner=None, lease_expires_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._execute_query(db, statement, operation="release_leases")
+        await self._commit(db, operation="release_leases")
+        return result.rowcount
+
+    async def finish_urls(
+        self,
+        db: AsyncSession,
+        *,
+        worker_id: str,
+        url_ids: Sequence[uuid.UUID],
+        status: str,
+        validators: Optional[Mapping[uuid.UUID, Mapping[str, Optional[str]]]] = None,
+    ) -> List[Tuple[uuid.UUID, Optional[uuid.UUID]]]:
+        """
+        Cierra un lote de URLs procesadas por `worker_id` con el estado final
+        ('success' o 'failed') y libera su lease en un único UPDATE.
+        `validators` ({url_id: {"etag", "last_modified", "content_hash"}}, con una
+        entrada por cada URL de `url_ids`) guarda además los datos del fetch de cada
+        fila en la misma sentencia, uniendo con una lista VALUES.
+        Devuelve (url_id, job_id) de cada fila cerrada (las que perdieron el lease
+        no aparecen), para actualizar los contadores del job y los agregados.
+        No hace commit: se usa junto con el guardado de resultados.
+        """
+        if not url_ids:
+            return []
+        new_values: Dict[str, Any] = {
+            "status": status,
+            "last_scraped_at": func.now(),
+            "lease_owner": None,
+            "lease_expires_at": None,
+        }
+        if status == "success":
+            new_values.update(RETRY_RESET_VALUES)
+        if validators is not None:
+            fetched = values(
+                column("id", UUID(as_uuid=True)),
+                column("etag", Text),
+                column("last_modified", Text),
+                column("content_hash", String(64)),
+                name="fetched",
+            ).data(
+                [
+                    (
+                        url_id,
+                        *(validators[url_id].get(name) for name in VALIDATOR_FIELDS),
+                    )
+                    for url_id in url_ids
+                ]
+            )
+            match_urls = self.model.id == fetched.c.id
+            new_values.update({name: fetched.c[name] for name in VALIDATOR_FIELDS})
+        else:
+            match_urls = self.model.id.in_(url_ids)
+        statement = (
+            update(self.model)
+            .where(
+                match_urls,
+                self.model.status == "in_progress",
+                self.model.lease_owner == worker_id,
+            )
+            .values(new_values)
+            .returning(self.model.id, self.model.job_id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._execute_query(db, statement, operation="finish_urls")
+        return [tuple(row) for row in result.all()]
+
+    async def fail_urls(
+        self,
+        db: AsyncSession,
+        *,
+        worker_id: str,
+        failures: Sequence[UrlFailure],
+    ) -> List[Tuple[Optional[uuid.UUID], str]]:
+        """
+        Registra un lote de fallos de `worker_id` en un único UPDATE unido a una
+        lista VALUES: cada URL pasa a 'retry' (con su next_attempt_at) o a
+        'dead_letter', guarda el contador de intentos y el error, y libera el lease.
+        No toca last_scraped_at: conserva la fecha del último resultado válido, con
+        la que el worker decide si puede reutilizarlo.
+        Devuelve (job_id, estado) de cada fila actualizada (las que perdieron el
+        lease no aparecen). No hace commit.
+        """
+        if not failures:
+            return []
+        failed = values(
+            column("id", UUID(as_uuid=True)),
+            column("status", String),
+            column("attempts", SmallInteger),
+            column("next_attempt_at", TIMESTAMP(timezone=True)),
+            column("last_error", Text),
+            name="failed",
+        ).data(
+            [
+                (f.url_id, f.status, f.attempts, f.next_attempt_at, f.error)
+                for f in failures
+            ]
+        )
+        statement = (
+            update(self.model)
+            .where(
+                self.model.id == failed.c.id,
+                self.model.status == "in_progress",
+                self.model.lease_owner == worker_id,
+            )
+            .values(
+                status=failed.c.status,
+                attempts=failed.c.attempts,
+                # Un VALUES con todo NULL en la columna no tendría tipo
+                next_attempt_at=cast(
+                    failed.c.next_attempt_at, TIMESTAMP(timezone=True)
+                ),
+                last_error=failed.c.last_error,
+                lease_owner=None,
+                lease_expires_at=None,
+            )
+            .returning(self.model.job_id, self.model.status)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._execute_query(db, statement, operation="fail_urls")
+        return [tuple(row) for row in result.all()]
+
+    async def reclaim_expired_leases(
+        self, db: AsyncSession, *, limit: int = 1000
+    ) -> int:
+        """
+        Devuelve a 'pending' las URLs cuyo lease venció (worker caído o colgado).
+        Procesa como máximo `limit` filas por llamada y usa SKIP LOCKED para poder
+        ejecutarse desde varios procesos a la vez.
+        """
+        expired = (
+            select(self.model.id)
+            .where(
+                self.model.status == "in_progress",
+                self.model.lease_expires_at < func.now(),
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("expired")
+        )
+        statement = (
+            update(self.model)
+            .where(self.model.id == expired.c.id)
+            .values(status="pending", lease_owner=None, lease_expires_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._execute_query(
+            db, statement, operation="reclaim_expired_leases"
+        )
+        await self._commit(db, operation="reclaim_expired_leases")
+        if result.rowcount:
+            logger.warning("Reclaimed %s URLs with expired leases", result.rowcount)
+        return result.rowcount
+
+    async def create(self, db: AsyncSession, *, obj_in: UrlCreate) -> ScrapeUrl:
+        """
+        Crea una URL por la misma vía que la carga masiva (incluye el contador del job).
+        Si la URL normalizada ya existe para la config, devuelve la fila existente.
+        """
+        result = await self.create_bulk(db, objs_in=[obj_in])
+        return await self.get_or_404(db, result.ids[0])
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ScrapeUrl,
+        obj_in: Union[UrlUpdate, Dict[str, Any]],
+    ) -> ScrapeUrl:
+        """
+        Como BaseRepository.update, pero guarda la URL sin fragmento y recalcula el
+        hash de su forma normalizada.
+        """
+        if isinstance(obj_in, dict):
+            update_data = dict(obj_in)
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        if update_data.get("url") is not None:
+            url = str(update_data["url"])
+            update_data["url"] = strip_fragment(url)
+            update_data["url_hash"] = url_hash(normalize_url(url))
+        if update_data.get("status") == "pending":
+            # Reencolar a mano (p. ej. desde 'dead_letter') empieza los reintentos de cero
+            update_data.update(RETRY_RESET_VALUES)
+        return await super().update(db, db_obj=db_obj, obj_in=update_data)
+
+    def _bulk_row(self, obj_in: UrlCreate, now: datetime) -> Dict[str, Any]:
+        """
+        Convierte un UrlCreate en los valores de una fila para el INSERT multi-fila.
+        Se guarda la URL enviada (sin fragmento): la normalización puede reordenar la
+        query o quitar parámetros que el servidor sí usa, así que solo define el hash.
+        """
+        url = str(obj_in.url)
+        return {
+            "id": uuid.uuid4(),
+            "url": strip_fragment(url),
+            "url_hash": url_hash(normalize_url(url)),
+            "priority": obj_in.priority if obj_in.priority is not None else 5,
+            "config_id": obj_in.config_id,
+            "job_id": obj_in.job_id,
+            "status": "pending",
+            "created_at": now,
+        }
+
+    async def bulk_insert(
+        self, db: AsyncSession, objs_in: Sequence[UrlCreate], *, requeue: bool = False
+    ) -> List[Tuple[uuid.UUID, bool]]:
+        """
+        Inserta un lote de URLs con un único
+        INSERT ... VALUES (...), (...) ON CONFLICT (config_id, url_hash) DO UPDATE.
+
+        Las URLs que ya existen para su config (misma URL normalizada) no se
+        duplican: conservan su estado y su job, y solo se eleva su prioridad si la
+        nueva es mayor. Los duplicados dentro del propio lote se envían una sola vez.
+        Devuelve, en el orden de entrada, (id, insertada) por URL; `insertada` es
+        False cuando el id corresponde a una fila existente.
+
+        Con requeue=True (disparos de una programación) las filas existentes que ya
+        terminaron ('success', 'failed' o 'dead_letter') vuelven a 'pending' con el
+        job del lote y sin intentos acumulados, y cuentan como insertadas; las que
+        siguen en cola, en curso o esperando un reintento no se tocan.
+
+        No hace commit: el llamador decide cuándo cerrar la transacción, de modo que
+        varios lotes puedan escribirse atómicamente.
+        """
+        if not objs_in:
+            return []
+        now = datetime.utcnow()
+        rows: Dict[Tuple[Optional[uuid.UUID], bytes], Dict[str, Any]] = {}
+        keys = []
+        for obj_in in objs_in:
+            row = self._bulk_row(obj_in, now)
+            key = (row["config_id"], row["url_hash"])
+            keys.append(key)
+            if key in rows:
+                # ON CONFLICT no admite afectar dos veces la misma fila en una sentencia
+                rows[key]["priority"] = max(rows[key]["priority"], row["priority"])
+            else:
+                rows[key] = row
+        statement = insert(self.model).values(list(rows.values()))
+        set_ = {
+            "priority": func.greatest(self.model.priority, statement.excluded.priority)
+        }
+        if requeue:
+            finished = self.model.status.in_(FINISHED_STATUSES)
+            set_["status"] = case((finished, "pending"), else_=self.model.status)
+            set_["job_id"] = case(
+                (finished, statement.excluded.job_id), else_=self.model.job_id
+            )
+            set_["attempts"] = case((finished, 0), else_=self.model.attempts)
+            set_["next_attempt_at"] = case(
+                (finished, None), else_=self.model.next_attempt_at
+            )
+            set_["last_error"] = case((finished, None), else_=self.model.last_error)
+        statement = statement.on_conflict_do_update(
+            index_elements=[self.model.config_id, self.model.url_hash],
+            index_where=self.model.url_hash.isnot(None),
+            set_=set_,
+        ).returning(
+            self.model.id,
+            self.model.config_id,
+            self.model.url_hash,
+            self.model.job_id,
+            # xmax = 0 solo en filas recién insertadas (no en las actualizadas)
+            literal_column("xmax = 0").label("inserted"),
+        )
+        result = await self._execute_query(db, statement, operation="bulk_insert")
+        by_key = {}
+        for id_, config_id, hash_, job_id, inserted in result.all():
+            key = (config_id, bytes(hash_))
+            # Una fila reencolada pasa al job del lote
+            requeued = requeue and job_id == rows[key]["job_id"]
+            by_key[key] = (id_, inserted or requeued)
+        seen = set()
+        ids: List[Tuple[uuid.UUID, bool]] = []
+        for key in keys:
+            id_, inserted = by_key[key]
+            # Solo la primera aparición de una URL nueva cuenta como insertada
+            ids.append((id_, inserted and key not in seen))
+            seen.add(key)
+        return ids
+
+    async def create_bulk(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Iterable[UrlCreate],
+        chunk_size: int = BULK_CHUNK_SIZE,
+        count_in_jobs: bool = True,
+        requeue: bool = False,
+    ) -> BulkCreateResult:
+        """
+        Crea muchas URLs en una sola transacción, troceadas en INSERTs multi-fila.
+        Devuelve los IDs en el mismo orden de entrada (el de la fila existente para
+        las URLs duplicadas) y cuántas filas se insertaron.
+        Con count_in_jobs=False no se incrementa total_urls de los jobs (el llamador
+        ya lo fijó, p. ej. al crear el job con sus URLs).
+        Con requeue=True las URLs ya terminadas se vuelven a encolar (ver bulk_insert).
+        """
+
+        async def _iter_objs() -> AsyncIterator[UrlCreate]:
+            for obj_in in objs_in:
+                yield obj_in
+
+        return await self.create_bulk_stream(
+            db,
+            objs_in=_iter_objs(),
+            chunk_size=chunk_size,
+            count_in_jobs=count_in_jobs,
+            requeue=requeue,
+        )
+
+    async def create_bulk_stream(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: AsyncIterable[UrlCreate],
+        chunk_size: int = BULK_CHUNK_SIZE,
+        count_in_jobs: bool = True,
+        requeue: bool = False,
+    ) -> BulkCreateResult:
+        """
+        Variante de create_bulk para entradas en streaming (NDJSON/CSV): consume el
+        iterador asíncrono por trozos, de modo que la memoria no crece con el tamaño
+        de la carga, y hace un único commit al final.
+        """
+        chunk_size = max(1, min(chunk_size, MAX_BULK_CHUNK_SIZE))
+        result = BulkCreateResult()
+        chunk: List[UrlCreate] = []
+        urls_per_job: Counter = Counter()
+
+        async def _flush() -> None:
+            added = await self.bulk_insert(db, chunk, requeue=requeue)
+            for obj_in, (id_, inserted) in zip(chunk, added):
+                result.ids.append(id_)
+                if inserted:
+                    result.inserted += 1
+                    # Los duplicados ya cuentan en el job al que pertenecen
+                    if count_in_jobs and obj_in.job_id is not None:
+                        urls_per_job[obj_in.job_id] += 1
+
+        async for obj_in in objs_in:
+            chunk.append(obj_in)
+            if len(chunk) >= chunk_size:
+                await _flush()
+                chunk = []
+        if chunk:
+            await _flush()
+        # total_urls se incrementa en la misma transacción que las inserciones
+        await job_repo.increment_counters_many(
+            db,
+            {job_id: {"total_urls": count} for job_id, count in urls_per_job.items()},
+            commit=False,
+        )
+        await self._commit(db, operation="create_bulk")
+        logger.info(
+            "Successfully bulk created %s %s rows (%s duplicates)",
+            result.inserted,
+            self.model.__name__,
+            result.duplicates,
+        )
+        return result
+
 
 # Crea una instancia singleton del repositorio.
 # Esta es la instancia que otros módulos importarán.
@@ -3,13 +3,40 @@ from sqlalchemy.orm import sessionmaker
 from typing import AsyncGenerator
 
 from infrastructure.config.settings import settings
+from infrastructure.database.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    register_pool_events,
+)
+from infrastructure.database.statement_cache import register_statement_cache_events
+
+# Parámetros de conexión de asyncpg; statement_timeout se fija por conexión
+connect_args = {
+    "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+}
+if settings.DB_PGBOUNCER:
+    # La caché propia de asyncpg (fetch/execute directos) usa nombres fijos por
+    # conexión, incompatibles con el reparto de conexiones de pgbouncer
+    connect_args["statement_cache_size"] = 0
+if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+    connect_args["server_settings"] = {
+        "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)
+    }
 
 # Crea el engine asíncrono
 async_engine = create_async_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,  # Verifica conexiones antes de usarlas
+    poolclass=InstrumentedAsyncAdaptedQueuePool,  # Mide la espera de cada checkout
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,  # Verifica conexiones antes de usarlas
+    connect_args=connect_args,
+    query_cache_size=settings.DB_COMPILED_CACHE_SIZE,  # SQL compilado reutilizable
     # echo=True, # Descomenta para ver las queries SQL generadas (útil para debug)
 )
+register_pool_events(async_engine)
+register_statement_cache_events(async_engine, pgbouncer=settings.DB_PGBOUNCER)
 
 # Crea una fábrica de sesiones asíncronas
 AsyncSessionFactory = sessionmaker(
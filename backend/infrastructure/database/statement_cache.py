@@ -0,0 +1,101 @@
+import uuid
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from infrastructure.config.settings import settings
+from infrastructure.observability.metrics import (
+    DB_COMPILED_CACHE_TOTAL,
+    DB_PREPARED_CACHE_TOTAL,
+    labeled_counter_values,
+)
+
+# Clave en connection.info (por conexión DBAPI) del contador de sentencias preparadas
+_PREPARES_KEY = "statement_cache_prepares"
+# Clave en el contexto de ejecución con el valor del contador antes de ejecutar
+_PREPARES_BEFORE = "_statement_cache_prepares_before"
+
+
+class _PrepareCounter:
+    """
+    prepared_statement_name_func de una conexión: asyncpg la llama solo cuando
+    prepara una sentencia en el servidor (fallo de la caché), así que cuenta los
+    fallos. Con pgbouncer da a cada sentencia un nombre único para que no choque
+    con las preparadas por otro cliente en la misma conexión del servidor.
+    """
+
+    __slots__ = ("count", "unique_names")
+
+    def __init__(self, unique_names: bool):
+        self.count = 0
+        self.unique_names = unique_names
+
+    def __call__(self) -> Optional[str]:
+        self.count += 1
+        # None: asyncpg genera el nombre por defecto
+        return f"__asyncpg_{uuid.uuid4()}__" if self.unique_names else None
+
+
+def _hit_rate(hits: float, misses: float) -> Optional[float]:
+    total = hits + misses
+    return round(hits / total, 4) if total else None
+
+
+def register_statement_cache_events(engine: AsyncEngine, *, pgbouncer: bool) -> None:
+    """
+    Cuenta, por cada sentencia ejecutada, si el SQL compilado salió de la caché de
+    SQLAlchemy y si asyncpg reutilizó una sentencia ya preparada en esa conexión.
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "do_connect")
+    def _install_prepare_counter(dialect, conn_rec, cargs, cparams):
+        counter = _PrepareCounter(pgbouncer)
+        conn_rec.info[_PREPARES_KEY] = counter
+        cparams["prepared_statement_name_func"] = counter
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        counter = conn.info.get(_PREPARES_KEY)
+        if context is not None and counter is not None:
+            setattr(context, _PREPARES_BEFORE, counter.count)
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is None:
+            return
+        if context.cache_hit == context.dialect.CACHE_HIT:
+            DB_COMPILED_CACHE_TOTAL.labels("hit").inc()
+        elif context.cache_hit == context.dialect.CACHE_MISS:
+            DB_COMPILED_CACHE_TOTAL.labels("miss").inc()
+        else:
+            DB_COMPILED_CACHE_TOTAL.labels("uncached").inc()
+        # executemany no pasa por la caché de sentencias preparadas
+        counter = conn.info.get(_PREPARES_KEY)
+        before = getattr(context, _PREPARES_BEFORE, None)
+        if not executemany and counter is not None and before is not None:
+            result = "miss" if counter.count > before else "hit"
+            DB_PREPARED_CACHE_TOTAL.labels(result).inc()
+
+
+def statement_cache_status() -> Dict[str, Any]:
+    """Aciertos y fallos acumulados de ambas cachés de sentencias en este proceso."""
+    compiled = labeled_counter_values(DB_COMPILED_CACHE_TOTAL)
+    prepared = labeled_counter_values(DB_PREPARED_CACHE_TOTAL)
+    return {
+        "compiled": {
+            "size": settings.DB_COMPILED_CACHE_SIZE,
+            "hits": int(compiled.get("hit", 0)),
+            "misses": int(compiled.get("miss", 0)),
+            "uncached": int(compiled.get("uncached", 0)),
+            "hit_rate": _hit_rate(compiled.get("hit", 0), compiled.get("miss", 0)),
+        },
+        "prepared": {
+            "size_per_connection": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+            "pgbouncer": settings.DB_PGBOUNCER,
+            "hits": int(prepared.get("hit", 0)),
+            "misses": int(prepared.get("miss", 0)),
+            "hit_rate": _hit_rate(prepared.get("hit", 0), prepared.get("miss", 0)),
+        },
+    }
@@ -0,0 +1,53 @@
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from domain.exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+# Clave en session.info con la profundidad de anidamiento de unidades de trabajo
+UOW_DEPTH_KEY = "unit_of_work_depth"
+
+
+def in_unit_of_work(db: AsyncSession) -> bool:
+    """True si la sesión está dentro de un bloque unit_of_work (commit diferido)."""
+    return db.info.get(UOW_DEPTH_KEY, 0) > 0
+
+
+@asynccontextmanager
+async def unit_of_work(db: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    Agrupa varias escrituras de repositorio en una sola transacción.
+
+    Dentro del bloque, create/update/remove y el resto de métodos de escritura de
+    BaseRepository no hacen commit; el commit se hace una sola vez al salir del
+    bloque más externo, o rollback si se produce una excepción.
+
+        async with unit_of_work(db):
+            job = await job_repo.create(db, obj_in=...)
+            await url_repo.create_bulk(db, objs_in=...)
+    """
+    depth = db.info.get(UOW_DEPTH_KEY, 0)
+    db.info[UOW_DEPTH_KEY] = depth + 1
+    try:
+        yield db
+    except BaseException:
+        db.info[UOW_DEPTH_KEY] = depth
+        if depth == 0:
+            await db.rollback()
+        raise
+    db.info[UOW_DEPTH_KEY] = depth
+    if depth == 0:
+        try:
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            logger.error("Database error committing unit of work: %s", e, exc_info=True)
+            raise DatabaseError(
+                "Could not commit unit of work due to a database issue.",
+                original_exception=e,
+            )
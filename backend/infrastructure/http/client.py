@@ -0,0 +1,28 @@
+from typing import Optional
+
+import httpx
+
+from infrastructure.config.settings import settings
+
+
+def create_http_client(
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> httpx.AsyncClient:
+    """
+    Crea el cliente HTTP asíncrono compartido por el worker.
+
+    Un único cliente reutiliza el pool de conexiones (keep-alive) entre todos los
+    fetches en curso. `transport` permite inyectar un transporte alternativo, por
+    ejemplo httpx.MockTransport o uno apuntando a un servidor HTTP local en pruebas.
+    """
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    )
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=httpx.Timeout(settings.HTTP_TIMEOUT),
+        follow_redirects=True,
+        headers={"User-Agent": settings.HTTP_USER_AGENT},
+        transport=transport,
+    )
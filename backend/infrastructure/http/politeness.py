@@ -0,0 +1,272 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, fields
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+from urllib.parse import urlsplit
+
+from infrastructure.config.settings import settings
+from infrastructure.http.rate_limit import AsyncTokenBucket
+
+T = TypeVar("T")
+
+# Cada cuánto se olvidan los hosts inactivos (segundos)
+PRUNE_INTERVAL = 60.0
+
+
+def host_key(url: str) -> str:
+    """Host (con puerto, si lo hay) en minúsculas: la unidad de cortesía."""
+    return urlsplit(url).netloc.lower()
+
+
+@dataclass(frozen=True)
+class HostPolicy:
+    """Límites por host; ScrapeConfig.politeness puede sobrescribir cada campo."""
+
+    requests_per_second: float = settings.HOST_REQUESTS_PER_SECOND
+    burst: float = settings.HOST_BURST
+    max_concurrency: int = settings.HOST_MAX_CONCURRENCY
+    respect_robots: bool = settings.ROBOTS_TXT_ENABLED
+
+    @classmethod
+    def from_overrides(
+        cls, overrides: Optional[Mapping[str, Any]] = None
+    ) -> "HostPolicy":
+        if not overrides:
+            return DEFAULT_HOST_POLICY
+        names = {f.name for f in fields(cls)}
+        return cls(
+            **{k: v for k, v in overrides.items() if k in names and v is not None}
+        )
+
+
+DEFAULT_HOST_POLICY = HostPolicy()
+
+
+class _HostState(Generic[T]):
+    __slots__ = (
+        "key",
+        "policy",
+        "crawl_delay",
+        "robots_checked",
+        "bucket",
+        "queue",
+        "active",
+        "scheduled",
+        "last_used",
+    )
+
+    def __init__(self, key: str, policy: HostPolicy):
+        self.key = key
+        self.policy = policy
+        self.crawl_delay: Optional[float] = None
+        # Hasta conocer robots.txt (y su crawl-delay) solo se permite un fetch a la vez
+        self.robots_checked = not policy.respect_robots
+        self.bucket = AsyncTokenBucket(policy.requests_per_second, policy.burst)
+        self.queue: Deque[T] = deque()
+        self.active = 0
+        # True mientras el host está en la cola de listos o en la de espera
+        self.scheduled = False
+        self.last_used = time.monotonic()
+
+    def limit(self) -> int:
+        return self.policy.max_concurrency if self.robots_checked else 1
+
+    def configure(self) -> None:
+        rate, burst = self.policy.requests_per_second, self.policy.burst
+        if self.crawl_delay:
+            # Crawl-delay: como mucho una petición cada N segundos, sin ráfagas
+            rate, burst = min(rate, 1.0 / self.crawl_delay), 1.0
+        self.bucket.configure(rate, burst)
+
+    def idle_for(self, now: float) -> Optional[float]:
+        """Segundos sin uso si no tiene trabajo, o None si tiene trabajo pendiente."""
+        if self.queue or self.active:
+            return None
+        return now - self.last_used
+
+
+class HostScheduler(Generic[T]):
+    """
+    Reparto cortés de fetches entre hosts para el worker.
+
+    Cada host tiene su cola FIFO, un token bucket (peticiones por segundo y
+    ráfaga) y un máximo de fetches simultáneos; además hay un máximo global
+    (`max_active`). get() entrega el siguiente trabajo que puede empezar ya,
+    recorriendo los hosts en turno rotatorio: un host lento o muy limitado solo
+    ocupa sus propios huecos y no retrasa a los demás. Los hosts sin tokens
+    esperan en un heap por el instante en que los tendrán, de modo que el coste
+    de cada get() no depende del número de hosts bloqueados.
+
+    Pensado para un único event loop; release() debe llamarse al terminar cada
+    trabajo entregado por get().
+
+    `max_queued_per_host` no rechaza trabajos: saturated_hosts() indica qué hosts
+    lo alcanzaron para que el dequeue deje de pedir URLs suyas.
+    """
+
+    def __init__(
+        self, *, max_active: int, max_queued_per_host: int = settings.HOST_MAX_QUEUED
+    ):
+        self.max_active = max_active
+        self.max_queued_per_host = max_queued_per_host
+        self.active = 0
+        self._queued = 0
+        self._hosts: Dict[str, _HostState[T]] = {}
+        self._ready: Deque[_HostState[T]] = deque()
+        self._delayed: List[Tuple[float, int, _HostState[T]]] = []
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._last_prune = time.monotonic()
+
+    @property
+    def queued(self) -> int:
+        """Trabajos recibidos que aún no han empezado."""
+        return self._queued
+
+    def queued_items(self) -> Iterator[T]:
+        for state in self._hosts.values():
+            yield from state.queue
+
+    def saturated_hosts(self) -> List[str]:
+        """Hosts con `max_queued_per_host` o más trabajos esperando turno."""
+        return [
+            key
+            for key, state in self._hosts.items()
+            if len(state.queue) >= self.max_queued_per_host
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hosts": len(self._hosts),
+            "active": self.active,
+            "queued": self._queued,
+            "delayed_hosts": len(self._delayed),
+            "saturated_hosts": len(self.saturated_hosts()),
+        }
+
+    def _host(self, key: str, policy: HostPolicy) -> _HostState[T]:
+        state = self._hosts.get(key)
+        if state is None:
+            state = self._hosts[key] = _HostState(key, policy)
+        elif state.policy != policy:
+            # Varias configs sobre el mismo host: rige la del último trabajo recibido
+            state.policy = policy
+            if not policy.respect_robots:
+                state.robots_checked = True
+            state.configure()
+        return state
+
+    def _schedule(self, state: _HostState[T]) -> None:
+        if not state.scheduled and state.queue:
+            state.scheduled = True
+            self._ready.append(state)
+            self._wakeup.set()
+
+    def submit(
+        self, url: str, item: T, policy: HostPolicy = DEFAULT_HOST_POLICY
+    ) -> str:
+        """Encola `item` en el host de `url`; devuelve la clave del host."""
+        state = self._host(host_key(url), policy)
+        state.queue.append(item)
+        self._queued += 1
+        self._schedule(state)
+        return state.key
+
+    def release(self, key: str) -> None:
+        """Marca como terminado un trabajo de `key` entregado por get()."""
+        self.active -= 1
+        state = self._hosts.get(key)
+        if state is not None:
+            state.active -= 1
+            state.last_used = time.monotonic()
+            self._schedule(state)
+        self._wakeup.set()
+
+    def set_crawl_delay(self, key: str, delay: Optional[float]) -> None:
+        """Aplica el crawl-delay de robots.txt y libera la concurrencia del host."""
+        state = self._hosts.get(key)
+        if state is None:
+            return
+        if not state.robots_checked or state.crawl_delay != delay:
+            first_check = not state.robots_checked
+            state.robots_checked = True
+            state.crawl_delay = delay
+            state.configure()
+            if first_check and delay:
+                # El fetch que descargó robots.txt ya gastó el turno del host
+                state.bucket.try_acquire()
+            self._schedule(state)
+
+    def drain_queued(self) -> List[T]:
+        """Vacía las colas (apagado): devuelve los trabajos que no llegaron a empezar."""
+        items = list(self.queued_items())
+        for state in self._hosts.values():
+            state.queue.clear()
+        self._queued = 0
+        return items
+
+    def _next_item(self, now: float) -> Optional[Tuple[str, T]]:
+        while self._delayed and self._delayed[0][0] <= now:
+            self._ready.append(heapq.heappop(self._delayed)[2])
+        while self._ready:
+            state = self._ready.popleft()
+            if not state.queue or state.active >= state.limit():
+                # release() o set_crawl_delay() lo vuelven a programar
+                state.scheduled = False
+                continue
+            wait = state.bucket.try_acquire()
+            if wait > 0:
+                heapq.heappush(self._delayed, (now + wait, next(self._sequence), state))
+                continue
+            item = state.queue.popleft()
+            state.active += 1
+            state.last_used = now
+            self.active += 1
+            self._queued -= 1
+            if state.queue:
+                self._ready.append(state)
+            else:
+                state.scheduled = False
+            return state.key, item
+        return None
+
+    def _prune(self, now: float) -> None:
+        """Olvida los hosts inactivos cuyo bucket ya se habría rellenado del todo."""
+        self._last_prune = now
+        for key, state in list(self._hosts.items()):
+            idle = state.idle_for(now)
+            if idle is not None and idle * state.bucket.rate >= state.bucket.capacity:
+                del self._hosts[key]
+
+    async def get(self) -> Tuple[str, T]:
+        """Espera al siguiente trabajo que puede empezar; devuelve (host, item)."""
+        while True:
+            self._wakeup.clear()
+            now = time.monotonic()
+            if now - self._last_prune >= PRUNE_INTERVAL:
+                self._prune(now)
+            timeout = None
+            if self.active < self.max_active:
+                next_item = self._next_item(now)
+                if next_item is not None:
+                    return next_item
+                if self._delayed:
+                    timeout = self._delayed[0][0] - now
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,65 @@
+import asyncio
+import time
+from typing import Optional
+
+
+class AsyncTokenBucket:
+    """
+    Limitador de ritmo (token bucket) para corrutinas de un mismo event loop.
+
+    Se rellena a `rate` unidades por segundo hasta `capacity`; acquire(n) espera
+    hasta que haya n unidades disponibles. Las esperas se sirven por orden de
+    llegada, de modo que una petición grande no queda bloqueada por pequeñas.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def per_minute(cls, amount: float) -> "AsyncTokenBucket":
+        """Bucket de `amount` unidades por minuto con ráfaga de un minuto."""
+        return cls(rate=amount / 60.0, capacity=amount)
+
+    def configure(self, rate: float, capacity: Optional[float] = None) -> None:
+        """Cambia ritmo y capacidad conservando los tokens ya acumulados."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self._refill()
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = min(self._tokens, self.capacity)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        # Una petición mayor que la capacidad nunca cabría: se limita a un bucket lleno
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self._tokens < amount:
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= amount
+
+    def try_acquire(self, amount: float = 1.0) -> float:
+        """
+        Variante sin espera: consume `amount` si hay tokens y devuelve 0; si no,
+        devuelve los segundos que faltan para tenerlos, sin consumir nada.
+        """
+        amount = min(amount, self.capacity)
+        self._refill()
+        if self._tokens >= amount:
+            self._tokens -= amount
+            return 0.0
+        return (amount - self._tokens) / self.rate
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+from infrastructure.cache.lru import LRUCache
+from infrastructure.config.settings import settings
+from infrastructure.observability.metrics import ROBOTS_TXT_FETCHES_TOTAL
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RobotsRules:
+    """
+    Reglas de robots.txt de un host; parser=None con allow_all decide sin reglas.
+    `unreachable` indica que no se pudo descargar (bloqueo temporal).
+    """
+
+    parser: Optional[RobotFileParser] = None
+    allow_all: bool = True
+    unreachable: bool = False
+
+    def allowed(self, url: str, user_agent: str = settings.HTTP_USER_AGENT) -> bool:
+        if self.parser is None:
+            return self.allow_all
+        return self.parser.can_fetch(user_agent, url)
+
+    def crawl_delay(
+        self, user_agent: str = settings.HTTP_USER_AGENT
+    ) -> Optional[float]:
+        if self.parser is None:
+            return None
+        delay = self.parser.crawl_delay(user_agent)
+        if delay is None:
+            rate = self.parser.request_rate(user_agent)
+            if rate is not None and rate.requests:
+                return rate.seconds / rate.requests
+            return None
+        return float(delay)
+
+
+ALLOW_ALL = RobotsRules()
+UNREACHABLE = RobotsRules(allow_all=False, unreachable=True)
+
+
+class RobotsCache:
+    """
+    Caché en memoria de robots.txt por host (LRU con caducidad por entrada).
+
+    Cada host se descarga una sola vez aunque lleguen muchas URLs a la vez: las
+    peticiones concurrentes esperan a la misma descarga. Siguiendo RFC 9309, un
+    4xx equivale a no tener reglas y un 5xx (o 429, o un error de red) a no poder
+    rastrear el host; ese último resultado caduca antes (`error_ttl`) para
+    reintentarlo pronto.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = settings.ROBOTS_TXT_TTL,
+        error_ttl: float = settings.ROBOTS_TXT_ERROR_TTL,
+        maxsize: int = settings.ROBOTS_TXT_CACHE_SIZE,
+        max_bytes: int = settings.ROBOTS_TXT_MAX_BYTES,
+    ):
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.max_bytes = max_bytes
+        self._cache: LRUCache[str, Tuple[RobotsRules, float]] = LRUCache(maxsize)
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    def stats(self):
+        return self._cache.stats()
+
+    async def get(self, client: httpx.AsyncClient, url: str) -> RobotsRules:
+        """Reglas del host de `url`, descargándolas si no están en caché o caducaron."""
+        parts = urlsplit(url)
+        host = parts.netloc.lower()
+        cached = self._cache.get(host)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+        pending = self._pending.get(host)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[host] = future
+        try:
+            rules, ttl = await self._fetch(
+                client, f"{parts.scheme}://{host}/robots.txt"
+            )
+            self._cache.set(host, (rules, time.monotonic() + ttl))
+            future.set_result(rules)
+            return rules
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Evita el aviso de excepción no recuperada si nadie más esperaba
+            future.exception()
+            raise
+        finally:
+            del self._pending[host]
+
+    async def _fetch(
+        self, client: httpx.AsyncClient, robots_url: str
+    ) -> Tuple[RobotsRules, float]:
+        try:
+            response = await client.get(robots_url, timeout=settings.ROBOTS_TXT_TIMEOUT)
+        except httpx.HTTPError as e:
+            logger.warning("Could not fetch %s: %s", robots_url, e)
+            ROBOTS_TXT_FETCHES_TOTAL.labels("error").inc()
+            return UNREACHABLE, self.error_ttl
+        if response.status_code == 429 or response.status_code >= 500:
+            logger.warning(
+                "robots.txt unavailable at %s (HTTP %s)",
+                robots_url,
+                response.status_code,
+            )
+            ROBOTS_TXT_FETCHES_TOTAL.labels("error").inc()
+            return UNREACHABLE, self.error_ttl
+        if response.status_code >= 400:
+            ROBOTS_TXT_FETCHES_TOTAL.labels("missing").inc()
+            return ALLOW_ALL, self.ttl
+        parser = RobotFileParser(robots_url)
+        body = response.content[: self.max_bytes].decode("utf-8", errors="replace")
+        parser.parse(body.splitlines())
+        ROBOTS_TXT_FETCHES_TOTAL.labels("ok").inc()
+        return RobotsRules(parser=parser), self.ttl
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Protocol
+
+import httpx
+
+from domain.exceptions import LLMError
+from infrastructure.config.settings import settings
+from infrastructure.observability.metrics import (
+    LLM_REQUEST_DURATION_SECONDS,
+    LLM_REQUESTS_TOTAL,
+    LLM_TOKENS_TOTAL,
+)
+
+logger = logging.getLogger(__name__)
+
+# Respuestas que merece la pena reintentar (límite de ritmo y errores del servidor)
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+@dataclass
+class LLMCompletion:
+    content: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+class LLMBackend(Protocol):
+    """Modelo de lenguaje al que el pipeline de insights envía los prompts."""
+
+    model: str
+
+    async def complete(
+        self, messages: List[Dict[str, str]], *, max_tokens: int
+    ) -> LLMCompletion: ...
+
+    async def aclose(self) -> None: ...
+
+
+class OpenAICompatibleBackend:
+    """
+    Backend para cualquier endpoint compatible con POST {base_url}/chat/completions
+    (OpenAI, vLLM, llama.cpp, Ollama, o un servidor stub en pruebas).
+
+    Reintenta con backoff exponencial los 429/5xx y errores de red, respetando la
+    cabecera Retry-After si el servidor la envía. `transport` permite inyectar
+    httpx.MockTransport o similar.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str = settings.LLM_BASE_URL,
+        api_key: str = settings.LLM_API_KEY,
+        model: str = settings.LLM_MODEL,
+        json_mode: bool = settings.LLM_JSON_MODE,
+        max_retries: int = settings.LLM_MAX_RETRIES,
+        timeout: float = settings.LLM_TIMEOUT,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.model = model
+        self.json_mode = json_mode
+        self.max_retries = max_retries
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            headers=headers,
+            timeout=httpx.Timeout(timeout),
+            transport=transport,
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    @staticmethod
+    def _retry_delay(attempt: int, response: Optional[httpx.Response]) -> float:
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            if retry_after:
+                try:
+                    return max(float(retry_after), 0.0)
+                except ValueError:
+                    pass  # Fecha HTTP: se usa el backoff exponencial
+        return min(2.0**attempt, 30.0)
+
+    async def complete(
+        self, messages: List[Dict[str, str]], *, max_tokens: int
+    ) -> LLMCompletion:
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": 0,
+        }
+        if self.json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        attempt = 0
+        while True:
+            response: Optional[httpx.Response] = None
+            start = time.perf_counter()
+            try:
+                response = await self._client.post("/chat/completions", json=payload)
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    response.raise_for_status()
+                    break
+                error = f"HTTP {response.status_code}"
+            except httpx.HTTPStatusError as e:
+                LLM_REQUESTS_TOTAL.labels("error").inc()
+                raise LLMError(
+                    f"LLM request failed with HTTP {e.response.status_code}: "
+                    f"{e.response.text[:200]}"
+                )
+            except httpx.HTTPError as e:
+                error = f"{type(e).__name__}: {e}"
+            finally:
+                LLM_REQUEST_DURATION_SECONDS.observe(time.perf_counter() - start)
+            if attempt >= self.max_retries:
+                LLM_REQUESTS_TOTAL.labels("error").inc()
+                raise LLMError(
+                    f"LLM request failed after {attempt + 1} attempts: {error}"
+                )
+            delay = self._retry_delay(attempt, response)
+            LLM_REQUESTS_TOTAL.labels("retry").inc()
+            logger.warning("LLM request failed (%s), retrying in %.1fs", error, delay)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+        LLM_REQUESTS_TOTAL.labels("ok").inc()
+        try:
+            body = response.json()
+            content = body["choices"][0]["message"]["content"] or ""
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise LLMError(f"Unexpected LLM response format: {e}")
+        usage = body.get("usage") or {}
+        completion = LLMCompletion(
+            content=content,
+            prompt_tokens=int(usage.get("prompt_tokens") or 0),
+            completion_tokens=int(usage.get("completion_tokens") or 0),
+        )
+        LLM_TOKENS_TOTAL.labels("prompt").inc(completion.prompt_tokens)
+        LLM_TOKENS_TOTAL.labels("completion").inc(completion.completion_tokens)
+        return completion
@@ -0,0 +1,163 @@
+from typing import Any, Dict
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Buckets de latencia compartidos (segundos), afinados para p50/p99 de API y queries
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+
+# --- HTTP ---
+HTTP_REQUEST_DURATION_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Latencia de las peticiones HTTP por plantilla de ruta y código de estado",
+    ["method", "route", "status_code"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# --- Repositorios ---
+DB_QUERY_DURATION_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "Duración de las operaciones de repositorio por modelo y operación",
+    ["model", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# --- Pool de conexiones a la base de datos ---
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections", "Conexiones del pool actualmente en uso"
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections", "Conexiones abiertas por encima de pool_size"
+)
+DB_POOL_WAIT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Tiempo para obtener una conexión del pool (incluye abrirla si hace falta)",
+    buckets=(
+        0.0005,
+        0.001,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1,
+        2.5,
+        5,
+        10,
+        30,
+    ),
+)
+DB_POOL_PRE_PING_FAILURES = Counter(
+    "db_pool_pre_ping_failures_total",
+    "Conexiones descartadas porque falló el pre-ping al sacarlas del pool",
+)
+DB_POOL_HEALTHCHECK_FAILURES = Counter(
+    "db_pool_healthcheck_failures_total",
+    "Fallos del health check periódico del pool",
+)
+
+# --- Cachés de sentencias ---
+DB_COMPILED_CACHE_TOTAL = Counter(
+    "db_compiled_cache_total",
+    "Sentencias ejecutadas según la caché de SQL compilado (hit, miss, uncached)",
+    ["result"],
+)
+DB_PREPARED_CACHE_TOTAL = Counter(
+    "db_prepared_cache_total",
+    "Sentencias ejecutadas según la caché de sentencias preparadas (hit, miss)",
+    ["result"],
+)
+
+# --- Worker ---
+SCRAPE_FETCHES_TOTAL = Counter(
+    "scrape_fetches_total",
+    "Fetches del worker por resultado "
+    "(changed, not_modified, same_hash, failed, robots_disallowed)",
+    ["result"],
+)
+SCRAPE_FAILURES_TOTAL = Counter(
+    "scrape_failures_total",
+    "URLs fallidas según su destino (retry, dead_letter)",
+    ["outcome"],
+)
+SELECTOR_CACHE_TOTAL = Counter(
+    "selector_cache_total",
+    "Consultas a la caché de selectores compilados, sumando los procesos de "
+    "extracción (hit, miss, eviction)",
+    ["result"],
+)
+ROBOTS_TXT_FETCHES_TOTAL = Counter(
+    "robots_txt_fetches_total",
+    "Descargas de robots.txt por resultado (ok, missing, error)",
+    ["result"],
+)
+
+# --- Análisis con modelo de lenguaje ---
+LLM_REQUESTS_TOTAL = Counter(
+    "llm_requests_total",
+    "Peticiones al modelo de lenguaje por resultado (ok, retry, error)",
+    ["result"],
+)
+LLM_REQUEST_DURATION_SECONDS = Histogram(
+    "llm_request_duration_seconds",
+    "Latencia de cada intento de petición al modelo de lenguaje",
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120),
+)
+LLM_TOKENS_TOTAL = Counter(
+    "llm_tokens_total",
+    "Tokens consumidos según el modelo (prompt, completion)",
+    ["kind"],
+)
+INSIGHT_DOCUMENTS_TOTAL = Counter(
+    "insight_documents_total",
+    "Documentos del pipeline de insights por origen (cache, model, failed)",
+    ["source"],
+)
+
+
+def histogram_snapshot(histogram: Histogram) -> Dict[str, Any]:
+    """Resumen {count, sum, buckets{le: acumulado}} de un histograma sin labels."""
+    snapshot: Dict[str, Any] = {"count": 0, "sum": 0.0, "buckets": {}}
+    for metric in histogram.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_bucket"):
+                snapshot["buckets"][sample.labels["le"]] = int(sample.value)
+            elif sample.name.endswith("_count"):
+                snapshot["count"] = int(sample.value)
+            elif sample.name.endswith("_sum"):
+                snapshot["sum"] = sample.value
+    return snapshot
+
+
+def counter_value(counter: Counter) -> float:
+    """Valor actual de un contador sin labels."""
+    for metric in counter.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_total"):
+                return sample.value
+    return 0.0
+
+
+def labeled_counter_values(counter: Counter) -> Dict[str, float]:
+    """Valor actual por label de un contador con un único label."""
+    values: Dict[str, float] = {}
+    for metric in counter.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_total"):
+                values[next(iter(sample.labels.values()))] = sample.value
+    return values
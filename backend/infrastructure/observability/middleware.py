@@ -0,0 +1,69 @@
+import time
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infrastructure.observability.metrics import HTTP_REQUEST_DURATION_SECONDS
+
+
+def route_template(scope: Scope) -> Optional[str]:
+    """
+    Plantilla completa de la ruta resuelta (p. ej. /api/v1/jobs/{job_id}).
+
+    scope["route"].path es relativa a su router: no incluye los prefijos de
+    include_router ni de los Mount. El prefijo es la parte de la ruta pedida que
+    queda delante del tramo final que casa con la ruta, y se antepone a su
+    path_format. Los prefijos de esta aplicación son fijos, así que la
+    cardinalidad sigue acotada por el número de rutas.
+    """
+    route = scope.get("route")
+    path_regex = getattr(route, "path_regex", None)
+    path_format = getattr(route, "path_format", None)
+    if path_regex is None or path_format is None:
+        return None
+    path = scope["path"]
+    root_path = scope.get("root_path", "")
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path) :]
+    # El tramo más corto que casa con la ruta: el resto es el prefijo del router
+    start = path.rfind("/")
+    while start >= 0:
+        if path_regex.match(path[start:]):
+            return path[:start] + path_format
+        start = path.rfind("/", 0, start)
+    return path_format
+
+
+class RequestMetricsMiddleware:
+    """
+    Middleware ASGI que registra la latencia de cada petición HTTP etiquetada por
+    método, plantilla de ruta (p. ej. /api/v1/configs/{config_id}) y código de
+    estado. Usar la plantilla y no la ruta concreta mantiene acotada la
+    cardinalidad de las series.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # El router deja la ruta resuelta en el scope
+            template = route_template(scope) or "unmatched"
+            HTTP_REQUEST_DURATION_SECONDS.labels(
+                scope["method"], template, str(status_code)
+            ).observe(time.perf_counter() - start)
@@ -1,16 +1,30 @@
+import asyncio
 import logging
 from fastapi import APIRouter, FastAPI
 from contextlib import asynccontextmanager
 from infrastructure.config.logger import setup_logging
 from application.services.error_handler import register_exception_handlers
+from infrastructure.observability.middleware import RequestMetricsMiddleware
 
 from infrastructure.config.settings import settings
+from infrastructure.database.notifications import pg_listener
+from infrastructure.database.pool import pool_health_check_loop
+from infrastructure.database.session import async_engine
+from infrastructure.database.repositories.config_repo import (
+    CONFIG_INVALIDATION_CHANNEL,
+    config_repo,
+)
+from application.services.job_progress import job_progress_hub
 from application.api.v1 import (
     # auth,
     jobs as url_jobs,  # Renombrar para claridad
     # results,
     configs as config_jobs,  # Nuevo
     scraping_jobs as job_jobs,  # Nuevo
+    health,
+    metrics,
+    analytics,
+    schedules,
 )
 
 setup_logging()
@@ -23,8 +37,24 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     logger.info("Application startup...")
     # await connect_to_db()
+    if settings.CONFIG_CACHE_NOTIFY:
+        pg_listener.subscribe(
+            CONFIG_INVALIDATION_CHANNEL, config_repo.handle_invalidation
+        )
+    if settings.JOB_PROGRESS_STREAM:
+        # Una sola conexión LISTEN por proceso, repartida a todos los clientes SSE
+        job_progress_hub.attach(pg_listener)
+    pg_listener.start()
+    health_check_task = None
+    if settings.DB_HEALTHCHECK_INTERVAL > 0:
+        health_check_task = asyncio.create_task(
+            pool_health_check_loop(async_engine, settings.DB_HEALTHCHECK_INTERVAL)
+        )
     yield
     logger.info("Application shutdown...")
+    if health_check_task is not None:
+        health_check_task.cancel()
+    await pg_listener.stop()
     # await close_db_connection()
 
 
@@ -36,14 +66,19 @@ app = FastAPI(
 )
 
 register_exception_handlers(app)
+app.add_middleware(RequestMetricsMiddleware)
 
 api_router = APIRouter(prefix=settings.API_V1_STR)
 
 api_router.include_router(config_jobs.router, prefix="/configs", tags=["configs"])
 api_router.include_router(job_jobs.router, prefix="/jobs", tags=["jobs"])
 api_router.include_router(url_jobs.router, prefix="/urls", tags=["urls"])
+api_router.include_router(health.router, prefix="/health", tags=["health"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
+api_router.include_router(schedules.router, prefix="/schedules", tags=["schedules"])
 
 app.include_router(api_router)
+app.include_router(metrics.router)  # /metrics, fuera del prefijo versionado
 
 
 # --- Ruta Raíz (Opcional) ---
@@ -0,0 +1,235 @@
+import asyncio
+import os
+import threading
+import time
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Tuple, Union
+
+import pytest
+
+# Los tests nunca usan la base de datos de la aplicación. Los de integración
+# necesitan TEST_DATABASE_URL: una base desechable con init_supabase_db.sql
+# aplicado, que se vacía antes de cada test. Sin ella se saltan.
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+os.environ["DATABASE_URL"] = (
+    TEST_DATABASE_URL or "postgresql+asyncpg://localhost/unused"
+)
+# Extracción en el propio proceso: sin arrancar un pool de procesos en cada test
+os.environ.setdefault("EXTRACTION_PROCESSES", "-1")
+
+TEST_TABLES = (
+    "scraping_schedule",
+    "scrape_config",
+    "scraping_job",
+    "scrape_url",
+    "scraped_data",
+    "scrape_result",
+    "scrape_error",
+    "field_rollup",
+    "insight_cache",
+)
+
+# Política de cortesía sin esperas para las configs de los tests
+FAST_POLITENESS = {
+    "requests_per_second": 1000.0,
+    "burst": 1000.0,
+    "max_concurrency": 50,
+}
+
+StubResponse = Tuple[int, Dict[str, str], bytes]
+StubRoute = Union[StubResponse, Callable[[Dict[str, str]], StubResponse]]
+
+
+@pytest.fixture
+def run():
+    """
+    Ejecuta una corrutina en un event loop nuevo. El pool de conexiones queda atado
+    al loop que lo usó, así que se cierra antes de salir.
+    """
+    from infrastructure.database.session import async_engine
+
+    def _run(coro):
+        async def main():
+            try:
+                return await coro
+            finally:
+                await async_engine.dispose()
+
+        return asyncio.run(main())
+
+    return _run
+
+
+@pytest.fixture
+def database(run):
+    """Base de datos de pruebas vacía."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    import asyncpg
+
+    from infrastructure.database.notifications import asyncpg_dsn
+
+    async def truncate():
+        conn = await asyncpg.connect(asyncpg_dsn(TEST_DATABASE_URL))
+        try:
+            await conn.execute(f"TRUNCATE {', '.join(TEST_TABLES)} CASCADE")
+        finally:
+            await conn.close()
+
+    run(truncate())
+    return TEST_DATABASE_URL
+
+
+@pytest.fixture
+def fast_worker(monkeypatch):
+    """Intervalos del worker cortos para que los tests no esperen."""
+    from infrastructure.config.settings import settings
+
+    monkeypatch.setattr(settings, "WORKER_POLL_INTERVAL", 0.05)
+    monkeypatch.setattr(settings, "WORKER_RESULT_FLUSH_INTERVAL", 0.05)
+    return settings
+
+
+class FakeClock:
+    """time.monotonic controlado por el test; sleep() adelanta el reloj."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps: List[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Reloj falso para los token buckets y el reparto entre hosts."""
+    from infrastructure.http import politeness, rate_limit
+
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    monkeypatch.setattr(politeness, "time", clock)
+    # Las esperas de acquire() adelantan el reloj en lugar de dormir
+    monkeypatch.setattr(
+        rate_limit,
+        "asyncio",
+        types.SimpleNamespace(sleep=clock.sleep, Lock=asyncio.Lock),
+    )
+    return clock
+
+
+class StubServer:
+    """
+    Servidor HTTP local que sustituye a los sitios scrapeados: responde a cada ruta
+    con una respuesta fija (status, cabeceras, cuerpo) o calculada a partir de las
+    cabeceras de la petición, y registra las rutas pedidas. Las rutas sin respuesta
+    devuelven 404 (robots.txt incluido: todo permitido).
+    """
+
+    def __init__(self):
+        self.routes: Dict[str, StubRoute] = {}
+        self.requests: List[str] = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append(self.path)
+                route = stub.routes.get(self.path)
+                if callable(route):
+                    route = route(dict(self.headers))
+                status, headers, body = route or (404, {}, b"")
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def html(self, path: str, body: str, **headers: str) -> None:
+        self.routes[path] = (
+            200,
+            {"Content-Type": "text/html; charset=utf-8", **headers},
+            body.encode(),
+        )
+
+    def slow(self, path: str, body: str, delay: float) -> None:
+        def respond(_headers):
+            time.sleep(delay)
+            return 200, {"Content-Type": "text/html"}, body.encode()
+
+        self.routes[path] = respond
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def make_job():
+    """
+    Crea una config con `selectors` y un job con sus URLs por la misma vía que
+    POST /jobs; devuelve (job_id, config_id).
+    """
+    from application.schemas.config import ConfigCreate
+    from application.schemas.url import UrlCreate
+    from infrastructure.database.repositories.config_repo import config_repo
+    from infrastructure.database.repositories.job_repo import job_repo
+    from infrastructure.database.repositories.url_repo import url_repo
+    from infrastructure.database.session import AsyncSessionFactory
+    from infrastructure.database.unit_of_work import unit_of_work
+
+    async def _make_job(urls, *, selectors=None, max_retries=0, politeness=None):
+        async with AsyncSessionFactory() as db:
+            config = await config_repo.create(
+                db,
+                obj_in=ConfigCreate(
+                    site_name=f"test-{time.monotonic_ns()}",
+                    selectors=selectors or {"title": "h1"},
+                    max_retries=max_retries,
+                    politeness=politeness or FAST_POLITENESS,
+                ),
+            )
+            async with unit_of_work(db):
+                job = await job_repo.create(db, obj_in={"total_urls": len(urls)})
+                await url_repo.create_bulk(
+                    db,
+                    objs_in=[
+                        UrlCreate(url=url, config_id=config.id, job_id=job.id)
+                        for url in urls
+                    ],
+                    count_in_jobs=False,
+                )
+            return job.id, config.id
+
+    return _make_job
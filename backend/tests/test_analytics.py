@@ -0,0 +1,53 @@
+import uuid
+from datetime import date
+
+from application.services.analytics import compute_field_rollups, merge_rollups
+from infrastructure.database.repositories.field_rollup_repo import FieldRollupDelta
+
+CONFIG_A, CONFIG_B = uuid.uuid4(), uuid.uuid4()
+MONDAY, TUESDAY = date(2024, 1, 1), date(2024, 1, 2)
+
+
+def _counters(deltas):
+    return {
+        (d.config_id, d.field, d.day): (d.result_count, d.match_count, d.value_count)
+        for d in deltas
+    }
+
+
+def test_rollups_count_results_matches_and_values_per_field_and_day():
+    results = [
+        (CONFIG_A, MONDAY, {"title": "Lamp", "tags": ["a", "", "b"]}),
+        (CONFIG_A, MONDAY, {"title": None, "tags": []}),
+        (CONFIG_A, MONDAY, {"title": "Desk", "tags": [None]}),
+        (CONFIG_A, TUESDAY, {"title": ""}),
+        (CONFIG_B, MONDAY, {"price": "10", "tags": ("x",)}),
+    ]
+
+    assert _counters(compute_field_rollups(results)) == {
+        # result_count: resultados del grupo; match_count: con algún valor;
+        # value_count: valores no vacíos (las listas cuentan sus elementos)
+        (CONFIG_A, "title", MONDAY): (3, 2, 2),
+        (CONFIG_A, "tags", MONDAY): (3, 1, 2),
+        (CONFIG_A, "title", TUESDAY): (1, 0, 0),
+        (CONFIG_B, "price", MONDAY): (1, 1, 1),
+        (CONFIG_B, "tags", MONDAY): (1, 1, 1),
+    }
+
+
+def test_rollups_of_an_empty_batch():
+    assert compute_field_rollups([]) == []
+    assert compute_field_rollups([(CONFIG_A, MONDAY, {})]) == []
+
+
+def test_merge_rollups_adds_deltas_with_the_same_key():
+    deltas = [
+        FieldRollupDelta(CONFIG_A, "title", MONDAY, 2, 1, 1),
+        FieldRollupDelta(CONFIG_A, "title", TUESDAY, 1, 1, 1),
+        FieldRollupDelta(CONFIG_A, "title", MONDAY, 3, 3, 5),
+    ]
+
+    assert _counters(merge_rollups(deltas)) == {
+        (CONFIG_A, "title", MONDAY): (5, 4, 6),
+        (CONFIG_A, "title", TUESDAY): (1, 1, 1),
+    }
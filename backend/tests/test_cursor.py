@@ -0,0 +1,54 @@
+import base64
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from domain.exceptions import ValidationError
+from domain.models.config import ScrapeConfig
+from domain.models.job import ScrapingJob
+from infrastructure.database.repositories.config_repo import config_repo
+from infrastructure.database.repositories.job_repo import job_repo
+
+MOMENT = datetime(2024, 5, 6, 7, 8, 9, 123456, tzinfo=timezone(timedelta(hours=2)))
+
+
+def _cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def test_cursor_round_trips_the_order_column_and_id():
+    config = ScrapeConfig(id=uuid.uuid4(), created_at=MOMENT)
+
+    cursor = config_repo.encode_cursor(config)
+
+    assert config_repo.decode_cursor(cursor) == (MOMENT, config.id)
+    # Apto para una query string: sin relleno ni caracteres reservados
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+
+
+def test_cursor_uses_the_repository_order_column():
+    job = ScrapingJob(id=uuid.uuid4(), started_at=MOMENT)
+
+    assert job_repo.decode_cursor(job_repo.encode_cursor(job)) == (MOMENT, job.id)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not a cursor",
+        "ñ",
+        base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+        _cursor({"created_at": "2024-01-01"}),
+        _cursor(["2024-01-01T00:00:00"]),
+        _cursor([1, str(uuid.uuid4())]),
+        _cursor(["yesterday", str(uuid.uuid4())]),
+        _cursor(["2024-01-01T00:00:00", "not-a-uuid"]),
+        _cursor(["2024-01-01T00:00:00", str(uuid.uuid4()), "extra"]),
+    ],
+)
+def test_bad_cursors_are_rejected(cursor):
+    with pytest.raises(ValidationError, match="Invalid pagination cursor"):
+        config_repo.decode_cursor(cursor)
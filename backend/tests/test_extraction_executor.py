@@ -0,0 +1,42 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from application.services.extraction_executor import ExtractionExecutor
+from infrastructure.observability.metrics import (
+    SELECTOR_CACHE_TOTAL,
+    labeled_counter_values,
+)
+
+PAGE = b"<html><body><h1>Title</h1></body></html>"
+
+
+def test_pool_reports_selector_cache_stats_of_its_processes():
+    config_id = uuid.uuid4()
+    updated_at = datetime.now(timezone.utc)
+    executor = ExtractionExecutor(processes=2)
+    before = labeled_counter_values(SELECTOR_CACHE_TOTAL)
+
+    async def scenario():
+        executor.start()
+        try:
+            return await asyncio.gather(
+                *(
+                    executor.extract(config_id, updated_at, {"title": "h1"}, PAGE)
+                    for _ in range(20)
+                )
+            )
+        finally:
+            executor.shutdown()
+
+    results = asyncio.run(scenario())
+
+    assert results == [{"title": "Title"}] * 20
+    cache = executor.stats()["selector_cache"]
+    assert 1 <= cache["processes"] <= 2
+    assert cache["hits"] + cache["misses"] == 20
+    # Cada proceso compila la config una vez y después la reutiliza
+    assert cache["misses"] == cache["processes"] == cache["size"]
+    after = labeled_counter_values(SELECTOR_CACHE_TOTAL)
+    assert after.get("hit", 0) - before.get("hit", 0) == cache["hits"]
+    assert after.get("miss", 0) - before.get("miss", 0) == cache["misses"]
@@ -0,0 +1,325 @@
+import asyncio
+import json
+import re
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from application.schemas.scraped_data import ScrapedDataCreate
+from application.services.insights import (
+    SYSTEM_PROMPT,
+    InsightDocument,
+    InsightPipeline,
+    InsightRunStats,
+    estimate_tokens,
+    pack_batches,
+    parse_response,
+)
+from domain.exceptions import LLMError
+from domain.models.scraped_data import ScrapedData
+from infrastructure.database.repositories.scraped_data_repo import scraped_data_repo
+from infrastructure.database.repositories.url_repo import url_repo
+from infrastructure.database.session import AsyncSessionFactory
+from infrastructure.database.unit_of_work import unit_of_work
+from infrastructure.llm.client import OpenAICompatibleBackend
+
+_DOCUMENT_RE = re.compile(
+    r"^### Document (\d+)\n(.*?)(?=\n\n### Document |\Z)", re.M | re.S
+)
+
+
+def _document(text: str) -> InsightDocument:
+    return InsightDocument(
+        url_id=uuid.uuid4(),
+        scraped_at=datetime.now(timezone.utc),
+        text=text,
+        content_hash=f"hash-{text}",
+    )
+
+
+class StubModel:
+    """
+    Endpoint /chat/completions compatible con OpenAI para httpx.MockTransport:
+    responde un análisis por documento (su texto como summary) y registra las
+    peticiones. `delay` simula la latencia del modelo.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        self.requests.append(body)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        user = body["messages"][-1]["content"]
+        results = [
+            {"id": doc_id, "insights": {"summary": text}}
+            for doc_id, text in _DOCUMENT_RE.findall(user)
+        ]
+        return httpx.Response(
+            200,
+            json={
+                "choices": [{"message": {"content": json.dumps({"results": results})}}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 5},
+            },
+        )
+
+    def backend(self, **kwargs) -> OpenAICompatibleBackend:
+        return OpenAICompatibleBackend(
+            base_url="http://llm.test/v1",
+            api_key="test",
+            transport=httpx.MockTransport(self),
+            **kwargs,
+        )
+
+
+# --- Empaquetado y respuesta ---
+
+
+def test_pack_batches_respects_token_budget_and_document_limit():
+    documents = [_document("x" * 400) for _ in range(5)]  # 100 + 8 tokens cada uno
+    budget = estimate_tokens(SYSTEM_PROMPT) + 250
+
+    batches = pack_batches(documents, token_budget=budget, max_documents=10)
+    assert [len(b) for b in batches] == [2, 2, 1]
+
+    batches = pack_batches(documents, token_budget=10_000, max_documents=3)
+    assert [len(b) for b in batches] == [3, 2]
+    # El orden de entrada se conserva
+    assert [d for b in batches for d in b] == documents
+
+
+def test_pack_batches_sends_an_oversized_document_alone():
+    small, huge = _document("a"), _document("x" * 10_000)
+    budget = estimate_tokens(SYSTEM_PROMPT) + 100
+
+    batches = pack_batches([small, huge, small], token_budget=budget, max_documents=10)
+    assert batches == [[small], [huge], [small]]
+
+
+def test_parse_response_maps_results_to_content_hashes():
+    batch = [_document("a"), _document("b"), _document("c")]
+    content = json.dumps(
+        {
+            "results": [
+                {"id": "0", "insights": {"summary": "A"}},
+                {"id": 2, "insights": {"summary": "C"}},
+                {"id": "7", "insights": {"summary": "out of range"}},
+                {"id": "1", "insights": "not an object"},
+                "garbage",
+            ]
+        }
+    )
+
+    assert parse_response(content, batch) == {
+        "hash-a": {"summary": "A"},
+        "hash-c": {"summary": "C"},
+    }
+
+
+@pytest.mark.parametrize("content", ["not json", "{}", "[]"])
+def test_parse_response_rejects_content_without_results(content):
+    with pytest.raises(LLMError):
+        parse_response(content, [_document("a")])
+
+
+def test_parse_response_ignores_results_that_are_not_a_list():
+    assert parse_response('{"results": 3}', [_document("a")]) == {}
+
+
+# --- Cliente HTTP ---
+
+
+def test_backend_sends_openai_payload_and_reads_usage():
+    model = StubModel()
+
+    async def scenario():
+        backend = model.backend(model="stub-model", json_mode=True)
+        try:
+            return await backend.complete(
+                [{"role": "user", "content": "### Document 0\nhello"}], max_tokens=64
+            )
+        finally:
+            await backend.aclose()
+
+    completion = asyncio.run(scenario())
+
+    request = model.requests[0]
+    assert request["model"] == "stub-model"
+    assert request["max_tokens"] == 64
+    assert request["response_format"] == {"type": "json_object"}
+    assert json.loads(completion.content)["results"][0]["insights"] == {
+        "summary": "hello"
+    }
+    assert (completion.prompt_tokens, completion.completion_tokens) == (10, 5)
+
+
+def test_backend_retries_rate_limits_and_fails_on_client_errors():
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(200, json={"choices": [{"message": {"content": "{}"}}]}),
+        httpx.Response(400, text="bad request"),
+    ]
+
+    async def scenario():
+        backend = OpenAICompatibleBackend(
+            base_url="http://llm.test/v1",
+            transport=httpx.MockTransport(lambda request: responses.pop(0)),
+            max_retries=2,
+        )
+        try:
+            first = await backend.complete([], max_tokens=1)
+            with pytest.raises(LLMError, match="HTTP 400"):
+                await backend.complete([], max_tokens=1)
+            return first
+        finally:
+            await backend.aclose()
+
+    assert asyncio.run(scenario()).content == "{}"
+    assert responses == []
+
+
+# --- Límites del pipeline ---
+
+
+def _run_batches(pipeline, batches, timeout=None):
+    async def scenario():
+        stats = InsightRunStats()
+        gathered = asyncio.gather(*(pipeline._analyze(b, stats) for b in batches))
+        try:
+            await asyncio.wait_for(gathered, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            await pipeline.backend.aclose()
+        return stats
+
+    return asyncio.run(scenario())
+
+
+def test_pipeline_caps_concurrent_requests():
+    model = StubModel(delay=0.05)
+    pipeline = InsightPipeline(
+        model.backend(), concurrency=2, requests_per_minute=0, tokens_per_minute=0
+    )
+
+    stats = _run_batches(pipeline, [[_document(str(i))] for i in range(6)])
+
+    assert stats.requests == 6
+    assert model.max_in_flight == 2
+
+
+def test_pipeline_waits_for_the_request_rate_limit():
+    model = StubModel()
+    # Ráfaga de 3 peticiones y después una cada 20 segundos
+    pipeline = InsightPipeline(
+        model.backend(), concurrency=10, requests_per_minute=3, tokens_per_minute=0
+    )
+
+    _run_batches(pipeline, [[_document(str(i))] for i in range(5)], timeout=0.5)
+
+    assert len(model.requests) == 3
+
+
+def test_pipeline_waits_for_the_token_rate_limit():
+    model = StubModel()
+    document = _document("x" * 400)
+    prompt_tokens = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(
+        f"### Document 0\n{document.text}"
+    )
+    # Solo cabe una petición en el minuto
+    pipeline = InsightPipeline(
+        model.backend(),
+        concurrency=10,
+        requests_per_minute=0,
+        tokens_per_minute=prompt_tokens + 1,
+    )
+
+    _run_batches(pipeline, [[document], [_document("y" * 400)]], timeout=0.5)
+
+    assert len(model.requests) == 1
+
+
+# --- Caché (con base de datos) ---
+
+
+async def _store_results(job_id, texts):
+    """Un resultado en scraped_data por cada URL del job, con los textos dados."""
+    async with AsyncSessionFactory() as db:
+        urls = await url_repo.get_multi(db, limit=100)
+        urls = [u for u in urls if u.job_id == job_id]
+        async with unit_of_work(db):
+            await scraped_data_repo.upsert_many(
+                db,
+                [
+                    ScrapedDataCreate(
+                        url_id=u.id, job_id=job_id, raw_payload={}, cleaned_text=text
+                    )
+                    for u, text in zip(urls, texts)
+                ],
+            )
+
+
+async def _insights(job_id):
+    async with AsyncSessionFactory() as db:
+        rows = await db.execute(
+            select(ScrapedData.cleaned_text, ScrapedData.insights).where(
+                ScrapedData.job_id == job_id
+            )
+        )
+        return sorted(rows.all(), key=lambda row: row[0])
+
+
+def test_pipeline_caches_by_content_prompt_version_and_model(database, run, make_job):
+    model = StubModel()
+
+    async def analyze(job_id, **kwargs):
+        pipeline = InsightPipeline(
+            model.backend(model=kwargs.pop("model", "stub-model")),
+            requests_per_minute=0,
+            tokens_per_minute=0,
+            **kwargs,
+        )
+        try:
+            return await pipeline.run_job(job_id)
+        finally:
+            await pipeline.backend.aclose()
+
+    async def scenario():
+        jobs = []
+        for n in range(4):
+            job_id, _ = await make_job(
+                [f"http://site{n}.test/a", f"http://site{n}.test/b"]
+            )
+            await _store_results(job_id, ["same text", "same text"])
+            jobs.append(job_id)
+        return (
+            # Dos URLs con el mismo contenido: un solo documento al modelo
+            await analyze(jobs[0]),
+            # Mismo contenido, versión y modelo: todo de la caché
+            await analyze(jobs[1]),
+            # Otra versión del prompt u otro modelo no reutilizan el análisis
+            await analyze(jobs[2], prompt_version="v-test"),
+            await analyze(jobs[3], model="other-model"),
+            await _insights(jobs[1]),
+        )
+
+    first, cached, new_prompt, new_model, stored = run(scenario())
+
+    assert (first.analyzed, first.cached, first.requests) == (1, 1, 1)
+    assert (cached.analyzed, cached.cached, cached.requests) == (0, 2, 0)
+    assert (new_prompt.analyzed, new_prompt.requests) == (1, 1)
+    assert (new_model.analyzed, new_model.requests) == (1, 1)
+    assert len(model.requests) == 3
+    assert stored == [("same text", {"summary": "same text"})] * 2
@@ -0,0 +1,63 @@
+import asyncio
+import json
+
+from application.services.job_progress import JobProgressHub, job_progress_events
+from infrastructure.database.notifications import PgNotificationListener
+from worker.engine import ScrapeWorker
+
+
+async def _wait_listening(listener: PgNotificationListener) -> None:
+    while listener._connection is None:
+        await asyncio.sleep(0.01)
+    # add_listener termina justo después de asignar la conexión
+    await asyncio.sleep(0.1)
+
+
+async def _collect(stream):
+    return [event async for event in stream]
+
+
+def test_job_stream_ends_when_the_worker_closes_the_last_url(
+    database, run, stub_server, fast_worker, make_job
+):
+    stub_server.html("/a", "<h1>A</h1>")
+    stub_server.html("/b", "<h1>B</h1>")
+    stub_server.routes["/gone"] = (404, {}, b"")
+
+    async def scenario():
+        job_id, _ = await make_job([stub_server.url(p) for p in ("/a", "/b", "/gone")])
+        hub = JobProgressHub()
+        listener = PgNotificationListener()
+        hub.attach(listener)
+        listener.start()
+        await _wait_listening(listener)
+        # final_wait alto: el stream solo puede terminar por un job ya contado
+        stream = asyncio.create_task(
+            _collect(job_progress_events(job_id, hub=hub, final_wait=60))
+        )
+        worker = ScrapeWorker(concurrency=4)
+        worker_task = asyncio.create_task(worker.run())
+        try:
+            return await asyncio.wait_for(stream, timeout=15)
+        finally:
+            worker.stop()
+            await worker_task
+            await listener.stop()
+
+    events = run(scenario())
+
+    jobs = [
+        json.loads(line[len("data: ") :])
+        for event in events
+        for line in event.splitlines()
+        if line.startswith("data: ")
+    ]
+    assert jobs[0]["status"] == "pending"
+    final = jobs[-1]
+    assert final["status"] == "completed"
+    assert final["finished_at"] is not None
+    assert (final["total_urls"], final["success_count"], final["error_count"]) == (
+        3,
+        2,
+        1,
+    )
@@ -0,0 +1,161 @@
+import asyncio
+
+from infrastructure.http.politeness import (
+    PRUNE_INTERVAL,
+    HostPolicy,
+    HostScheduler,
+    host_key,
+)
+
+# Sin límite de ritmo ni robots.txt pendiente
+OPEN = HostPolicy(
+    requests_per_second=1000.0, burst=1000.0, max_concurrency=10, respect_robots=False
+)
+
+
+async def _take(hosts: HostScheduler, timeout: float = 0.05):
+    """(host, item) si get() entrega algo ya, o None si tendría que esperar."""
+    try:
+        return await asyncio.wait_for(hosts.get(), timeout)
+    except asyncio.TimeoutError:
+        return None
+
+
+def test_host_key_is_the_lowercased_netloc():
+    assert host_key("https://Example.COM:8443/a?b") == "example.com:8443"
+    assert host_key("http://example.com/") == "example.com"
+
+
+def test_hosts_take_turns(clock):
+    hosts = HostScheduler(max_active=100)
+    for item in ("a1", "a2", "a3"):
+        hosts.submit("http://a.test/", item, OPEN)
+    hosts.submit("http://b.test/", "b1", OPEN)
+    hosts.submit("http://c.test/", "c1", OPEN)
+
+    async def scenario():
+        return [(await _take(hosts))[1] for _ in range(5)]
+
+    # Un host con muchas URLs no acapara los huecos: se alterna con los demás
+    assert asyncio.run(scenario()) == ["a1", "b1", "c1", "a2", "a3"]
+    assert (hosts.active, hosts.queued) == (5, 0)
+
+
+def test_host_and_global_concurrency_limits(clock):
+    one_at_a_time = HostPolicy(
+        requests_per_second=1000.0,
+        burst=1000.0,
+        max_concurrency=1,
+        respect_robots=False,
+    )
+    hosts = HostScheduler(max_active=2)
+    hosts.submit("http://a.test/", "a1", one_at_a_time)
+    hosts.submit("http://a.test/", "a2", one_at_a_time)
+    hosts.submit("http://b.test/", "b1", OPEN)
+    hosts.submit("http://b.test/", "b2", OPEN)
+
+    async def scenario():
+        taken = [await _take(hosts), await _take(hosts)]
+        # Dos activos: el máximo global
+        blocked = await _take(hosts)
+        hosts.release("b.test")
+        taken.append(await _take(hosts))
+        # a.test sigue con su único hueco ocupado
+        hosts.release("b.test")
+        blocked_host = await _take(hosts)
+        hosts.release("a.test")
+        taken.append(await _take(hosts))
+        return taken, blocked, blocked_host
+
+    taken, blocked, blocked_host = asyncio.run(scenario())
+
+    assert taken == [
+        ("a.test", "a1"),
+        ("b.test", "b1"),
+        ("b.test", "b2"),
+        ("a.test", "a2"),
+    ]
+    assert blocked is None
+    assert blocked_host is None
+
+
+def test_one_fetch_at_a_time_until_robots_txt_is_known(clock):
+    policy = HostPolicy(
+        requests_per_second=1000.0, burst=1000.0, max_concurrency=5, respect_robots=True
+    )
+    hosts = HostScheduler(max_active=100)
+    for item in ("a1", "a2", "a3"):
+        hosts.submit("http://a.test/", item, policy)
+
+    async def scenario():
+        first = await _take(hosts)
+        waiting = await _take(hosts)
+        # robots.txt sin crawl-delay: el host pasa a su concurrencia normal
+        hosts.set_crawl_delay("a.test", None)
+        return first, waiting, [await _take(hosts), await _take(hosts)]
+
+    first, waiting, rest = asyncio.run(scenario())
+
+    assert first == ("a.test", "a1")
+    assert waiting is None
+    assert rest == [("a.test", "a2"), ("a.test", "a3")]
+
+
+def test_crawl_delay_spaces_fetches_without_bursts(clock):
+    policy = HostPolicy(
+        requests_per_second=1000.0, burst=1000.0, max_concurrency=5, respect_robots=True
+    )
+    hosts = HostScheduler(max_active=100)
+    hosts.submit("http://a.test/", "a1", policy)
+    hosts.submit("http://a.test/", "a2", policy)
+    hosts.submit("http://b.test/", "b1", OPEN)
+    # La descarga de robots.txt ya gastó el turno del host
+    hosts.set_crawl_delay("a.test", 2.0)
+
+    async def scenario():
+        taken = [await _take(hosts)]  # solo b.test puede empezar
+        blocked = await _take(hosts)
+        clock.now += 2.0
+        taken.append(await _take(hosts))
+        clock.now += 1.0
+        blocked_again = await _take(hosts)
+        clock.now += 1.0
+        taken.append(await _take(hosts))
+        return taken, blocked, blocked_again
+
+    taken, blocked, blocked_again = asyncio.run(scenario())
+
+    assert taken == [("b.test", "b1"), ("a.test", "a1"), ("a.test", "a2")]
+    assert blocked is None
+    assert blocked_again is None
+    assert hosts.stats()["delayed_hosts"] == 0
+
+
+def test_idle_hosts_are_pruned_once_their_bucket_is_full(clock):
+    slow = HostPolicy(
+        requests_per_second=0.001, burst=1.0, max_concurrency=1, respect_robots=False
+    )
+    hosts = HostScheduler(max_active=100)
+    for url, policy in (
+        ("http://fast.test/", OPEN),
+        ("http://slow.test/", slow),
+        ("http://busy.test/", OPEN),
+    ):
+        hosts.submit(url, "first", policy)
+    hosts.submit("http://busy.test/", "second", OPEN)
+
+    async def scenario():
+        for _ in range(3):
+            await _take(hosts)
+        hosts.release("fast.test")
+        hosts.release("slow.test")
+        clock.now += PRUNE_INTERVAL
+        # busy.test aún tiene trabajo: get() lo entrega tras podar
+        return await _take(hosts)
+
+    taken = asyncio.run(scenario())
+
+    assert taken == ("busy.test", "second")
+    # fast.test rellenó su bucket y se olvida; slow.test tardaría 1.000 s
+    assert set(hosts._hosts) == {"slow.test", "busy.test"}
+    assert hosts.stats()["hosts"] == 2
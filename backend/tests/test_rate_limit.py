@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from infrastructure.http.rate_limit import AsyncTokenBucket
+
+
+def test_bucket_starts_full_and_reports_the_wait_for_the_next_token(clock):
+    bucket = AsyncTokenBucket(rate=2.0, capacity=3.0)
+
+    assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Sin tokens: falta 1 token a 2 por segundo
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    # La consulta fallida no consume nada
+    assert bucket.try_acquire(2.0) == pytest.approx(1.0)
+
+
+def test_bucket_refills_at_its_rate_up_to_its_capacity(clock):
+    bucket = AsyncTokenBucket(rate=2.0, capacity=3.0)
+    bucket.try_acquire(3.0)
+
+    clock.now += 0.25
+    assert bucket.try_acquire() == pytest.approx(0.25)  # medio token acumulado
+    clock.now += 0.25
+    assert bucket.try_acquire() == 0.0
+
+    clock.now += 3600
+    assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_acquire() > 0
+
+
+def test_requests_larger_than_the_capacity_wait_for_a_full_bucket(clock):
+    bucket = AsyncTokenBucket(rate=1.0, capacity=2.0)
+
+    assert bucket.try_acquire(5.0) == 0.0
+    assert bucket.try_acquire(5.0) == pytest.approx(2.0)
+
+
+def test_per_minute_allows_a_burst_of_one_minute(clock):
+    bucket = AsyncTokenBucket.per_minute(30)
+
+    assert (bucket.rate, bucket.capacity) == (0.5, 30)
+    assert all(bucket.try_acquire() == 0.0 for _ in range(30))
+    assert bucket.try_acquire() == pytest.approx(2.0)
+
+
+def test_configure_keeps_the_accumulated_tokens(clock):
+    bucket = AsyncTokenBucket(rate=10.0, capacity=10.0)
+    bucket.try_acquire(4.0)
+
+    bucket.configure(rate=1.0, capacity=3.0)
+    assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_acquire() == pytest.approx(1.0)
+
+    with pytest.raises(ValueError):
+        bucket.configure(rate=0)
+
+
+def test_acquire_sleeps_until_the_tokens_are_there(clock):
+    bucket = AsyncTokenBucket(rate=4.0, capacity=2.0)
+
+    async def scenario():
+        for _ in range(4):
+            await bucket.acquire()
+
+    asyncio.run(scenario())
+
+    # Dos de la ráfaga inicial y después un token cada 0,25 s
+    assert clock.sleeps == pytest.approx([0.25, 0.25])
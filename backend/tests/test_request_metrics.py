@@ -0,0 +1,75 @@
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from infrastructure.observability.metrics import HTTP_REQUEST_DURATION_SECONDS
+from infrastructure.observability.middleware import RequestMetricsMiddleware
+
+
+def _build_app() -> FastAPI:
+    configs = APIRouter()
+    jobs = APIRouter()
+
+    @configs.get("/")
+    async def list_configs():
+        return []
+
+    @configs.get("/{config_id}")
+    async def read_config(config_id: str):
+        return {"id": config_id}
+
+    @jobs.get("/")
+    async def list_jobs():
+        return []
+
+    @jobs.get("/export")
+    async def export_jobs():
+        return []
+
+    @jobs.get("/{job_id}")
+    async def read_job(job_id: str):
+        return {"id": job_id}
+
+    app = FastAPI()
+    app.add_middleware(RequestMetricsMiddleware)
+    api = APIRouter(prefix="/api/v1")
+    api.include_router(configs, prefix="/configs")
+    api.include_router(jobs, prefix="/jobs")
+    app.include_router(api)
+    return app
+
+
+def _observed_routes() -> set:
+    return {
+        sample.labels["route"]
+        for metric in HTTP_REQUEST_DURATION_SECONDS.collect()
+        for sample in metric.samples
+        if sample.name.endswith("_count")
+    }
+
+
+def test_routes_of_different_routers_get_distinct_labels():
+    with TestClient(_build_app()) as client:
+        assert client.get("/api/v1/configs/").status_code == 200
+        assert client.get("/api/v1/jobs/").status_code == 200
+        assert client.get("/api/v1/configs/abc").status_code == 200
+        assert client.get("/api/v1/jobs/42").status_code == 200
+        assert client.get("/api/v1/jobs/export").status_code == 200
+
+    routes = _observed_routes()
+    assert {
+        "/api/v1/configs/",
+        "/api/v1/jobs/",
+        "/api/v1/configs/{config_id}",
+        "/api/v1/jobs/{job_id}",
+        "/api/v1/jobs/export",
+    } <= routes
+    # Las rutas relativas a su router no deben aparecer como etiqueta
+    assert "/" not in routes
+    assert "/{job_id}" not in routes
+
+
+def test_unmatched_requests_share_one_label():
+    with TestClient(_build_app()) as client:
+        assert client.get("/does/not/exist").status_code == 404
+
+    assert "unmatched" in _observed_routes()
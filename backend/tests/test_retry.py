@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from application.services.retry import (
+    backoff_delay,
+    is_retryable_status,
+    retry_after_seconds,
+)
+
+
+def test_backoff_doubles_from_base_up_to_the_cap():
+    delays = [
+        backoff_delay(attempt, base=10, cap=100, jitter=0.5, rng=lambda: 0.0)
+        for attempt in range(0, 7)
+    ]
+
+    assert delays == [10, 10, 20, 40, 80, 100, 100]
+
+
+@pytest.mark.parametrize("attempt", [1, 3, 30])
+def test_jitter_only_shortens_the_wait_and_by_at_most_its_fraction(attempt):
+    full = backoff_delay(attempt, base=10, cap=1000, jitter=0.5, rng=lambda: 0.0)
+    shortest = backoff_delay(attempt, base=10, cap=1000, jitter=0.5, rng=lambda: 1.0)
+
+    assert shortest == pytest.approx(full * 0.5)
+    for _ in range(200):
+        assert shortest <= backoff_delay(attempt, base=10, cap=1000, jitter=0.5) <= full
+
+
+def test_without_jitter_the_wait_is_deterministic():
+    assert backoff_delay(3, base=2, cap=60, jitter=0.0) == 8
+
+
+def test_jitter_spreads_urls_that_failed_together():
+    delays = {backoff_delay(2, base=60, cap=3600, jitter=0.5) for _ in range(50)}
+
+    assert len(delays) > 1
+
+
+def test_retryable_statuses():
+    assert all(is_retryable_status(code) for code in (408, 429, 500, 503))
+    assert not any(is_retryable_status(code) for code in (200, 400, 403, 404, 410))
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    now = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+    assert retry_after_seconds(" 120 ") == 120.0
+    assert retry_after_seconds("Mon, 01 Jan 2024 12:01:30 GMT", now) == 90.0
+    # Una fecha ya pasada no espera
+    assert retry_after_seconds("Mon, 01 Jan 2024 11:00:00 GMT", now) == 0.0
+    assert retry_after_seconds("soon", now) is None
+    assert retry_after_seconds("-5", now) is None
+    assert retry_after_seconds(None) is None
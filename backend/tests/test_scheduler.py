@@ -0,0 +1,30 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from infrastructure.database.repositories.schedule_repo import schedule_repo
+from worker.scheduler import Scheduler
+
+
+def test_a_failing_fire_does_not_abort_the_others(monkeypatch):
+    broken, ok = uuid.uuid4(), uuid.uuid4()
+    due_at = datetime.now(timezone.utc)
+    claimed = []
+
+    async def claim_due(db, schedule_id, due):
+        claimed.append(schedule_id)
+        if schedule_id == broken:
+            raise RuntimeError("boom")
+        return None  # Ya reclamado por otro líder
+
+    monkeypatch.setattr(schedule_repo, "claim_due", claim_due)
+    scheduler = Scheduler(scheduler_id="test")
+
+    asyncio.run(scheduler._fire_all([(broken, due_at), (ok, due_at)]))
+
+    assert sorted(claimed) == sorted([broken, ok])
+    # El disparo fallido se reintenta más tarde con el mismo scheduled_at
+    wake_at, retry_due = scheduler._next[broken]
+    assert wake_at > due_at
+    assert retry_due == due_at
+    assert scheduler._next[ok][1] is None
@@ -0,0 +1,85 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from application.services.selector_cache import SelectorCache
+from infrastructure.cache.lru import LRUCache, TTLCache
+
+V1 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+V2 = V1 + timedelta(minutes=1)
+
+
+def test_lru_evicts_the_least_recently_used_entry():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" pasa a ser la menos usada
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert cache.stats() == {
+        "size": 2,
+        "maxsize": 2,
+        "hits": 3,
+        "misses": 1,
+        "evictions": 1,
+        "hit_ratio": 0.75,
+    }
+
+
+def test_lru_pop_is_not_counted_as_an_eviction():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+
+    assert cache.pop("a") == 1
+    assert cache.stats()["evictions"] == 0
+    assert len(cache) == 0
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("infrastructure.cache.lru.time.monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+
+    now[0] = 109.0
+    assert cache.get("a") == 1
+    now[0] = 110.0
+    assert cache.get("a") is None
+    assert (cache.stats()["expirations"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_selector_cache_reuses_compiled_selectors_of_the_same_version():
+    cache = SelectorCache(maxsize=4)
+    config_id = uuid.uuid4()
+
+    first = cache.get_compiled(config_id, V1, {"title": "h1"})
+    again = cache.get_compiled(config_id, V1, {"title": "h1"})
+
+    assert again is first
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_selector_cache_replaces_the_previous_version_of_a_config():
+    cache = SelectorCache(maxsize=4)
+    config_id = uuid.uuid4()
+
+    old = cache.get_compiled(config_id, V1, {"title": "h1"})
+    new = cache.get_compiled(config_id, V2, {"title": "h2"})
+
+    assert new is not old
+    assert set(new) == {"title"}
+    # Solo queda la versión nueva, y no cuenta como desalojo
+    assert cache.stats()["size"] == 1
+    assert cache.stats()["evictions"] == 0
+    assert cache.get_compiled(config_id, V2, {"title": "h2"}) is new
+
+
+def test_selector_cache_evicts_configs_beyond_its_size():
+    cache = SelectorCache(maxsize=2)
+    ids = [uuid.uuid4() for _ in range(3)]
+    for config_id in ids:
+        cache.get_compiled(config_id, V1, {"title": "h1"})
+
+    stats = cache.stats()
+    assert (stats["size"], stats["evictions"], stats["misses"]) == (2, 1, 3)
@@ -0,0 +1,167 @@
+import asyncio
+import csv
+import json
+
+import pytest
+from starlette.requests import Request
+
+from application.services.url_ingestion import (
+    ingest_urls,
+    iter_request_rows,
+    validate_row,
+)
+from domain.exceptions import ValidationError
+from infrastructure.database.session import AsyncSessionFactory
+
+
+def _request(body: bytes, content_type: str, chunk_size: int = 5) -> Request:
+    """Petición cuyo cuerpo llega en trozos de `chunk_size` bytes."""
+    chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+
+    async def receive():
+        chunk = chunks.pop(0) if chunks else b""
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/",
+        "headers": [(b"content-type", content_type.encode())],
+    }
+    return Request(scope, receive)
+
+
+def _rows(body: bytes, content_type: str, **kwargs):
+    async def collect():
+        return [
+            row
+            async for row in iter_request_rows(_request(body, content_type, **kwargs))
+        ]
+
+    return asyncio.run(collect())
+
+
+def _validate(rows):
+    """(urls válidas, {índice: tipos de error}) como los reporta ingest_urls."""
+    urls, errors = [], {}
+    for index, row in enumerate(rows):
+        obj_in, error = validate_row(index, row)
+        if error is not None:
+            errors[error.index] = [e["type"] for e in error.errors]
+        else:
+            urls.append(str(obj_in.url))
+    return urls, errors
+
+
+def test_json_array():
+    body = json.dumps(
+        [{"url": "https://a.test/"}, {"url": "not a url"}, {"url": "https://b.test/"}]
+    ).encode()
+
+    urls, errors = _validate(_rows(body, "application/json"))
+
+    assert urls == ["https://a.test/", "https://b.test/"]
+    assert errors == {1: ["url_parsing"]}
+
+
+@pytest.mark.parametrize(
+    "body, content_type",
+    [
+        (b"[1, 2", "application/json"),
+        (b'{"url": "https://a.test/"}', "application/json"),
+        (b'[{"url": "https://a.test/\xff"}]', "application/json"),
+        (b"url\n", "application/xml"),
+    ],
+)
+def test_rejects_bodies_that_cannot_be_read(body, content_type):
+    with pytest.raises(ValidationError):
+        _rows(body, content_type)
+
+
+def test_ndjson_reports_bad_lines_by_index():
+    body = (
+        '{"url": "https://a.test/café"}\n'
+        "\n"
+        "{broken\n"
+        '{"url": "https://b.test/", "priority": 11}\r\n'
+        '{"url": "https://c.test/"}'
+    ).encode()
+
+    # Trozos de 5 bytes: la "é" (2 bytes en UTF-8) queda partida entre dos
+    urls, errors = _validate(_rows(body, "application/x-ndjson"))
+
+    assert urls == ["https://a.test/caf%C3%A9", "https://c.test/"]
+    assert errors == {1: ["json_invalid"], 2: ["less_than_equal"]}
+
+
+def test_csv_keeps_newlines_inside_quoted_fields():
+    body = (
+        "url,priority\r\n"
+        "https://a.test/,3\r\n"
+        '"not a\nurl",\r\n'
+        "\r\n"
+        'https://c.test/,"1\r\n0"\r\n'
+        "https://d.test/,\r\n"
+    ).encode()
+
+    rows = _rows(body, "text/csv")
+
+    assert rows == [
+        {"url": "https://a.test/", "priority": "3"},
+        {"url": "not a\nurl"},
+        {"url": "https://c.test/", "priority": "1\r\n0"},
+        {"url": "https://d.test/"},
+    ]
+    urls, errors = _validate(rows)
+    assert urls == ["https://a.test/", "https://d.test/"]
+    assert errors == {1: ["url_parsing"], 2: ["int_parsing"]}
+
+
+def test_csv_reports_unparseable_records_and_keeps_going():
+    limit = csv.field_size_limit(100)
+    try:
+        body = f"url\nhttps://{'x' * 200}.test/\nhttps://b.test/\n".encode()
+        urls, errors = _validate(_rows(body, "text/csv"))
+    finally:
+        csv.field_size_limit(limit)
+
+    assert urls == ["https://b.test/"]
+    assert errors == {0: ["csv_invalid"]}
+
+
+@pytest.mark.parametrize("content_type", ["text/csv", "application/x-ndjson"])
+def test_streamed_bodies_must_be_utf8(content_type):
+    body = b"url\nhttps://a.test/\xe9\n"
+
+    with pytest.raises(ValidationError, match="UTF-8"):
+        _rows(body, content_type)
+
+
+def test_csv_skips_a_byte_order_mark():
+    rows = _rows("﻿url\nhttps://a.test/\n".encode(), "text/csv")
+
+    assert rows == [{"url": "https://a.test/"}]
+
+
+def test_ingest_inserts_valid_rows_and_reports_the_rest(database, run):
+    body = (
+        "url,priority\n"
+        "https://a.test/,1\n"
+        "not a url,2\n"
+        "https://a.test/,3\n"
+        "https://b.test/,\n"
+    ).encode()
+
+    async def scenario():
+        async with AsyncSessionFactory() as db:
+            return await ingest_urls(db, _request(body, "text/csv"))
+
+    result = run(scenario())
+
+    assert (result.inserted, result.duplicates) == (2, 1)
+    assert [(e.index, e.errors[0]["type"]) for e in result.errors] == [
+        (1, "url_parsing")
+    ]
+    # El duplicado devuelve el id de la URL existente
+    assert len(result.ids) == 3
+    assert result.ids[0] == result.ids[1]
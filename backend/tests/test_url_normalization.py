@@ -0,0 +1,83 @@
+import pytest
+
+from application.services.url_normalization import (
+    URL_HASH_SIZE,
+    normalize_url,
+    strip_fragment,
+    url_hash,
+)
+
+# Cada grupo es una clase de equivalencia: todas sus URLs son la misma página
+EQUIVALENT = [
+    [
+        "https://example.com",
+        "https://example.com/",
+        "HTTPS://EXAMPLE.com:443/",
+        "  https://example.com/#top  ",
+    ],
+    [
+        "http://example.com/a?b=2&a=1",
+        "http://example.com:80/a?a=1&b=2",
+        "http://Example.COM/a?a=1&utm_source=news&b=2&gclid=xyz",
+        "http://example.com/a?UTM_Campaign=x&a=1&b=2#section",
+    ],
+    [
+        "http://[::1]:8080/x",
+        "HTTP://[::1]:8080/x#frag",
+    ],
+    [
+        "https://user:pw@example.com/private",
+        "https://user:pw@EXAMPLE.com:443/private",
+    ],
+]
+
+# Parejas que parecen iguales pero son páginas distintas
+DIFFERENT = [
+    ("http://example.com/", "https://example.com/"),
+    ("https://example.com:8443/", "https://example.com/"),
+    ("https://example.com/Path", "https://example.com/path"),
+    ("https://example.com/a/", "https://example.com/a"),
+    ("https://example.com/?a=1", "https://example.com/?a=2"),
+    ("https://example.com/?a=", "https://example.com/"),
+    ("https://example.com/?a=1&a=2", "https://example.com/?a=1"),
+    ("https://user@example.com/", "https://example.com/"),
+]
+
+
+@pytest.mark.parametrize("urls", EQUIVALENT, ids=lambda urls: urls[0])
+def test_equivalent_urls_share_normal_form_and_hash(urls):
+    normalized = {normalize_url(url) for url in urls}
+
+    assert len(normalized) == 1
+    assert len({url_hash(n) for n in normalized}) == 1
+
+
+@pytest.mark.parametrize("first, second", DIFFERENT)
+def test_distinct_urls_keep_distinct_forms(first, second):
+    assert normalize_url(first) != normalize_url(second)
+    assert url_hash(normalize_url(first)) != url_hash(normalize_url(second))
+
+
+def test_normalization_is_idempotent():
+    for urls in EQUIVALENT:
+        for url in urls:
+            assert normalize_url(normalize_url(url)) == normalize_url(url)
+
+
+def test_normal_form():
+    assert (
+        normalize_url("HTTP://Example.com:80?z=1&utm_medium=x&a=2&a=1#f")
+        == "http://example.com/?a=1&a=2&z=1"
+    )
+
+
+def test_strip_fragment_keeps_the_url_as_requested():
+    assert (
+        strip_fragment(" https://Example.com/a?utm_source=x#f ")
+        == "https://Example.com/a?utm_source=x"
+    )
+
+
+def test_url_hash_has_a_fixed_width():
+    assert len(url_hash("https://example.com/")) == URL_HASH_SIZE
+    assert len(url_hash("https://example.com/" + "x" * 5000)) == URL_HASH_SIZE
@@ -0,0 +1,194 @@
+import asyncio
+
+from sqlalchemy import select
+
+from domain.models.scrape_url import ScrapeUrl
+from domain.models.scraped_data import ScrapedData
+from infrastructure.database.repositories.scrape_result_repo import scrape_result_repo
+from infrastructure.database.session import AsyncSessionFactory
+from worker.engine import ScrapeWorker
+
+
+async def _urls_by_path(job_id, base_url):
+    async with AsyncSessionFactory() as db:
+        rows = (
+            await db.execute(select(ScrapeUrl).where(ScrapeUrl.job_id == job_id))
+        ).scalars()
+        return {row.url[len(base_url) :]: row for row in rows}
+
+
+async def _payloads(job_id):
+    async with AsyncSessionFactory() as db:
+        rows = (
+            await db.execute(
+                select(ScrapeUrl.url, ScrapedData.raw_payload)
+                .join(ScrapedData, ScrapedData.url_id == ScrapeUrl.id)
+                .where(ScrapeUrl.job_id == job_id)
+            )
+        ).all()
+        return {url: payload for url, payload in rows}
+
+
+async def _wait_for(predicate, timeout=10.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not await predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.05)
+
+
+async def _run_until(worker: ScrapeWorker, predicate, timeout=10.0):
+    task = asyncio.create_task(worker.run())
+    try:
+        await _wait_for(predicate, timeout)
+    finally:
+        worker.stop()
+        await task
+
+
+def _job_closed(job_id, base_url):
+    async def predicate():
+        urls = await _urls_by_path(job_id, base_url)
+        return all(u.status not in ("pending", "in_progress") for u in urls.values())
+
+    return predicate
+
+
+def test_worker_fetches_from_local_server_and_extracts_fields(
+    database, run, stub_server, fast_worker, make_job
+):
+    stub_server.html(
+        "/product",
+        "<h1> Lamp </h1><a class='tag' href='/t/1'>home</a>"
+        "<a class='tag' href='/t/2'>light</a>",
+    )
+    stub_server.routes["/missing"] = (404, {}, b"")
+    selectors = {
+        "title": "h1",
+        "tags": {"css": "a.tag", "multiple": True},
+        "first_link": "a.tag::attr(href)",
+    }
+
+    async def scenario():
+        job_id, _ = await make_job(
+            [stub_server.url("/product"), stub_server.url("/missing")],
+            selectors=selectors,
+        )
+        await _run_until(
+            ScrapeWorker(concurrency=4), _job_closed(job_id, stub_server.base_url)
+        )
+        urls = await _urls_by_path(job_id, stub_server.base_url)
+        async with AsyncSessionFactory() as db:
+            history = await scrape_result_repo.get_history(
+                db, url_id=urls["/product"].id
+            )
+        return urls, await _payloads(job_id), history
+
+    urls, payloads, history = run(scenario())
+
+    assert "/robots.txt" in stub_server.requests
+    assert urls["/product"].status == "success"
+    assert urls["/product"].content_hash is not None
+    assert urls["/product"].lease_owner is None
+    # 404 no es recuperable: sin reintentos
+    assert urls["/missing"].status == "dead_letter"
+    assert "404" in urls["/missing"].last_error
+    assert payloads == {
+        stub_server.url("/product"): {
+            "title": "Lamp",
+            "tags": ["home", "light"],
+            "first_link": "/t/1",
+        }
+    }
+    assert len(history) == 1
+
+
+def test_drain_waits_for_in_flight_fetches_on_shutdown(
+    database, run, stub_server, fast_worker, make_job
+):
+    stub_server.slow("/slow", "<h1>Slow</h1>", delay=1.0)
+
+    async def scenario():
+        job_id, _ = await make_job([stub_server.url("/slow")])
+        worker = ScrapeWorker(concurrency=4)
+        task = asyncio.create_task(worker.run())
+
+        async def fetch_started():
+            return "/slow" in stub_server.requests
+
+        await _wait_for(fetch_started)
+        worker.stop()
+        await task
+        return await _urls_by_path(job_id, stub_server.base_url)
+
+    urls = run(scenario())
+
+    # El fetch en curso al pedir el apagado se completa y se escribe
+    assert urls["/slow"].status == "success"
+    assert urls["/slow"].lease_owner is None
+
+
+def test_drain_releases_fetches_that_outlive_the_timeout(
+    database, run, stub_server, fast_worker, make_job, monkeypatch
+):
+    monkeypatch.setattr(fast_worker, "WORKER_DRAIN_TIMEOUT", 0.2)
+    stub_server.slow("/stuck", "<h1>Stuck</h1>", delay=3.0)
+
+    async def scenario():
+        job_id, _ = await make_job([stub_server.url("/stuck")])
+        worker = ScrapeWorker(concurrency=4)
+        task = asyncio.create_task(worker.run())
+
+        async def fetch_started():
+            return "/stuck" in stub_server.requests
+
+        await _wait_for(fetch_started)
+        worker.stop()
+        await task
+        return await _urls_by_path(job_id, stub_server.base_url)
+
+    urls = run(scenario())
+
+    # Cancelada al vencer WORKER_DRAIN_TIMEOUT: vuelve a la cola sin lease
+    assert urls["/stuck"].status == "pending"
+    assert urls["/stuck"].lease_owner is None
+    assert urls["/stuck"].attempts == 0
+
+
+def test_writer_survives_an_unexpected_error(
+    database, run, stub_server, fast_worker, make_job, monkeypatch
+):
+    stub_server.html("/first", "<h1>First</h1>")
+    stub_server.html("/second", "<h1>Second</h1>")
+    insert_many = scrape_result_repo.insert_many
+    calls = []
+
+    async def fail_once(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return await insert_many(*args, **kwargs)
+
+    monkeypatch.setattr(scrape_result_repo, "insert_many", fail_once)
+
+    async def scenario():
+        first_job, _ = await make_job([stub_server.url("/first")])
+        worker = ScrapeWorker(concurrency=4)
+        task = asyncio.create_task(worker.run())
+        try:
+            await _wait_for(lambda: asyncio.sleep(0, result=bool(calls)))
+            # Un segundo job después del lote fallido: el writer sigue escribiendo
+            second_job, _ = await make_job([stub_server.url("/second")])
+            await _wait_for(_job_closed(second_job, stub_server.base_url))
+        finally:
+            worker.stop()
+            await task
+        return (
+            await _urls_by_path(first_job, stub_server.base_url),
+            await _urls_by_path(second_job, stub_server.base_url),
+        )
+
+    first, second = run(scenario())
+
+    assert second["/second"].status == "success"
+    # El lote fallido no se escribió: su URL espera a que venza el lease
+    assert first["/first"].status == "in_progress"
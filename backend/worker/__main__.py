@@ -0,0 +1,54 @@
+import argparse
+import asyncio
+import logging
+import signal
+
+from prometheus_client import start_http_server
+
+from infrastructure.config.logger import setup_logging
+from infrastructure.config.settings import settings
+from worker.engine import ScrapeWorker
+
+setup_logging()
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Worker de scraping asíncrono.")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.WORKER_CONCURRENCY,
+        help="Máximo de fetches simultáneos en este proceso",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.WORKER_BATCH_SIZE,
+        help="URLs reclamadas por cada dequeue",
+    )
+    parser.add_argument("--worker-id", default=None, help="Identificador del worker")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    if settings.WORKER_METRICS_PORT:
+        # Expone las métricas del worker (p. ej. latencias de la cola de URLs)
+        start_http_server(settings.WORKER_METRICS_PORT)
+        logger.info("Worker metrics available on port %s", settings.WORKER_METRICS_PORT)
+    worker = ScrapeWorker(
+        worker_id=args.worker_id,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+    )
+    loop = asyncio.get_running_loop()
+    # SIGINT/SIGTERM disparan un apagado ordenado (drenaje de fetches en curso)
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    await worker.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,647 @@
+import asyncio
+import hashlib
+import logging
+import os
+import socket
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.schemas.scraped_data import ScrapedDataCreate, ScrapeResultCreate
+from application.services.compression import ZSTD, compress
+from application.services.analytics import FieldRollupAccumulator
+from application.services.extraction_executor import extraction_executor
+from application.services.job_counters import job_counter_deltas
+from application.services.retry import (
+    backoff_delay,
+    is_retryable_status,
+    retry_after_seconds,
+)
+from domain.exceptions import AppException
+from domain.models.config import ScrapeConfig
+from domain.models.scrape_url import ScrapeUrl
+from infrastructure.config.settings import settings
+from infrastructure.database.notifications import pg_listener
+from infrastructure.database.repositories.config_repo import (
+    CONFIG_INVALIDATION_CHANNEL,
+    config_repo,
+)
+from infrastructure.database.repositories.job_repo import job_repo
+from infrastructure.database.repositories.scrape_result_repo import scrape_result_repo
+from infrastructure.database.repositories.scraped_data_repo import scraped_data_repo
+from infrastructure.database.repositories.url_repo import UrlFailure, url_repo
+from infrastructure.database.pool import pool_health_check_loop, pool_status
+from infrastructure.database.session import AsyncSessionFactory, async_engine
+from infrastructure.database.unit_of_work import unit_of_work
+from infrastructure.http.client import create_http_client
+from infrastructure.http.politeness import HostPolicy, HostScheduler
+from infrastructure.http.robots import RobotsCache
+from infrastructure.observability.metrics import (
+    SCRAPE_FAILURES_TOTAL,
+    SCRAPE_FETCHES_TOTAL,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_id() -> str:
+    """Identificador del worker usado como dueño de los leases."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+@dataclass
+class ScrapeOutcome:
+    """Resultado de procesar una URL, pendiente de escribirse en la base de datos."""
+
+    url_id: uuid.UUID
+    job_id: Optional[uuid.UUID]
+    config_id: Optional[uuid.UUID]
+    status: str  # 'success' | 'failed' (el destino del fallo va en `failure`)
+    fields: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    # False si la página no cambió (304 o mismo hash): no se re-extrae ni se guarda
+    changed: bool = True
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    # HTML comprimido para el histórico (solo si cambió y RESULT_STORE_HTML)
+    html_compressed: Optional[bytes] = None
+    html_size: Optional[int] = None
+    # Fallos: si merece reintento, la espera que pidió el servidor (Retry-After) y
+    # el destino calculado ('retry' o 'dead_letter')
+    retryable: bool = True
+    retry_after: Optional[float] = None
+    failure: Optional[UrlFailure] = None
+
+    def validators(self) -> Dict[str, Optional[str]]:
+        return {
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "content_hash": self.content_hash,
+        }
+
+
+class RobotsUnavailable(Exception):
+    """robots.txt no se pudo descargar: el host no se rastrea hasta reintentarlo."""
+
+
+_QueuedUrl = Tuple[ScrapeUrl, Optional[ScrapeConfig], HostPolicy]
+
+
+class ScrapeWorker:
+    """
+    Motor de scraping asíncrono.
+
+    Reclama URLs de la cola (claim_pending_urls), las descarga con un cliente HTTP
+    compartido, aplica los selectores de su ScrapeConfig y escribe los resultados
+    y transiciones de estado en lotes. Mantiene como máximo `concurrency` fetches
+    en curso y, al detenerse, deja de reclamar y espera a los que están en vuelo.
+
+    Las URLs reclamadas pasan por un HostScheduler que limita el ritmo y la
+    concurrencia por host (y aplica robots.txt): el despacho reclama mientras el
+    búfer de URLs en espera no supere `concurrency`, y un segundo bucle lanza los
+    fetches en cuanto su host lo permite.
+    """
+
+    def __init__(
+        self,
+        *,
+        worker_id: Optional[str] = None,
+        concurrency: int = settings.WORKER_CONCURRENCY,
+        batch_size: int = settings.WORKER_BATCH_SIZE,
+        http_client: Optional[httpx.AsyncClient] = None,
+        session_factory=AsyncSessionFactory,
+    ):
+        self.worker_id = worker_id or default_worker_id()
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.session_factory = session_factory
+        self._http_client = http_client
+        self._owns_http_client = http_client is None
+        self._stopping = asyncio.Event()
+        self._in_flight: Dict[uuid.UUID, asyncio.Task] = {}
+        # Items: (URL reclamada, su config, política de cortesía resuelta)
+        self.hosts: HostScheduler[_QueuedUrl] = HostScheduler(max_active=concurrency)
+        self.robots = RobotsCache()
+        self._outcomes: asyncio.Queue = asyncio.Queue()
+        self._slot_freed = asyncio.Event()
+        self.field_rollups = FieldRollupAccumulator(session_factory=session_factory)
+
+    def stop(self) -> None:
+        """Solicita un apagado ordenado: no se reclaman más URLs y se drena lo pendiente."""
+        if not self._stopping.is_set():
+            logger.info(
+                "Worker %s stopping, draining in-flight fetches", self.worker_id
+            )
+            self._stopping.set()
+            self._slot_freed.set()
+
+    async def run(self) -> None:
+        if self._http_client is None:
+            self._http_client = create_http_client()
+        logger.info(
+            "Worker %s started (concurrency=%s, batch_size=%s)",
+            self.worker_id,
+            self.concurrency,
+            self.batch_size,
+        )
+        self.field_rollups.start()
+        extraction_executor.start()
+        if settings.CONFIG_CACHE_NOTIFY:
+            pg_listener.subscribe(
+                CONFIG_INVALIDATION_CHANNEL, config_repo.handle_invalidation
+            )
+        pg_listener.start()
+        background = [
+            asyncio.create_task(self._writer_loop(), name="writer"),
+            asyncio.create_task(self._heartbeat_loop(), name="heartbeat"),
+            asyncio.create_task(self._reclaim_loop(), name="reclaimer"),
+            asyncio.create_task(
+                self._partition_maintenance_loop(), name="partition-maintenance"
+            ),
+        ]
+        if settings.DB_HEALTHCHECK_INTERVAL > 0:
+            background.append(
+                asyncio.create_task(
+                    pool_health_check_loop(
+                        async_engine, settings.DB_HEALTHCHECK_INTERVAL
+                    ),
+                    name="db-health-check",
+                )
+            )
+        fetcher = asyncio.create_task(self._fetch_loop(), name="fetcher")
+        try:
+            await self._dispatch_loop()
+        finally:
+            fetcher.cancel()
+            await asyncio.gather(fetcher, return_exceptions=True)
+            await self._drain()
+            # El writer termina al recibir el centinela tras el drenaje
+            await self._outcomes.put(None)
+            await background[0]
+            for task in background[1:]:
+                task.cancel()
+            await asyncio.gather(*background[1:], return_exceptions=True)
+            await self.field_rollups.stop()
+            await pg_listener.stop()
+            if self._owns_http_client:
+                await self._http_client.aclose()
+            extraction_executor.shutdown()
+            logger.info(
+                "Worker %s stopped (extraction: %s, robots.txt cache: %s)",
+                self.worker_id,
+                extraction_executor.stats(),
+                self.robots.stats(),
+            )
+
+    # --- Dequeue y despacho ---
+
+    async def _dispatch_loop(self) -> None:
+        while not self._stopping.is_set():
+            # Las URLs en espera de su host también ocupan hueco: el búfer es acotado
+            free_slots = self.concurrency - self.hosts.queued
+            if free_slots <= 0:
+                self._slot_freed.clear()
+                await self._slot_freed.wait()
+                continue
+
+            try:
+                async with self.session_factory() as db:
+                    # Los hosts con la cola local llena no reciben más URLs: un
+                    # host lento no debe llenar el búfer de todo el worker
+                    claimed = await url_repo.claim_pending_urls(
+                        db,
+                        worker_id=self.worker_id,
+                        limit=min(free_slots, self.batch_size),
+                        lease_seconds=settings.WORKER_LEASE_SECONDS,
+                        exclude_hosts=self.hosts.saturated_hosts(),
+                    )
+                    configs = await self._load_configs(db, claimed)
+            except AppException as e:
+                logger.error("Could not claim URLs: %s", e.detail)
+                await self._sleep(settings.WORKER_POLL_INTERVAL)
+                continue
+
+            if not claimed:
+                await self._sleep(settings.WORKER_POLL_INTERVAL)
+                continue
+
+            policies: Dict[Optional[uuid.UUID], HostPolicy] = {}
+            for scrape_url in claimed:
+                config = configs.get(scrape_url.config_id)
+                policy = policies.get(scrape_url.config_id)
+                if policy is None:
+                    policy = policies[scrape_url.config_id] = HostPolicy.from_overrides(
+                        config.politeness if config is not None else None
+                    )
+                self.hosts.submit(scrape_url.url, (scrape_url, config, policy), policy)
+
+    async def _fetch_loop(self) -> None:
+        """Lanza cada fetch cuando su host tiene tokens y concurrencia libres."""
+        while True:
+            host, (scrape_url, config, policy) = await self.hosts.get()
+            task = asyncio.create_task(self._process(scrape_url, config, host, policy))
+            self._in_flight[scrape_url.id] = task
+            task.add_done_callback(
+                lambda _t, url_id=scrape_url.id, host=host: self._on_task_done(
+                    url_id, host
+                )
+            )
+            self._slot_freed.set()
+
+    def _on_task_done(self, url_id: uuid.UUID, host: str) -> None:
+        self._in_flight.pop(url_id, None)
+        self.hosts.release(host)
+        self._slot_freed.set()
+
+    async def _load_configs(
+        self, db: AsyncSession, urls: List[ScrapeUrl]
+    ) -> Dict[uuid.UUID, ScrapeConfig]:
+        config_ids = {u.config_id for u in urls if u.config_id is not None}
+        configs = await config_repo.get_many(db, list(config_ids))
+        return {config.id: config for config in configs}
+
+    async def _sleep(self, seconds: float) -> None:
+        """Espera interrumpible por stop()."""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    # --- Fetch y extracción ---
+
+    @staticmethod
+    def _can_reuse_previous(
+        scrape_url: ScrapeUrl, config: Optional[ScrapeConfig]
+    ) -> bool:
+        """
+        True si el último resultado guardado sigue siendo válido cuando la página no
+        cambió: existe un contenido previo y los selectores no se modificaron después.
+        last_scraped_at solo avanza con los éxitos, así que un fallo posterior a un
+        cambio de selectores no hace pasar por válido el contenido anterior.
+        """
+        if scrape_url.content_hash is None or scrape_url.last_scraped_at is None:
+            return False
+        return config is None or config.updated_at <= scrape_url.last_scraped_at
+
+    @staticmethod
+    def _conditional_headers(scrape_url: ScrapeUrl) -> Dict[str, str]:
+        headers = {}
+        if scrape_url.etag:
+            headers["If-None-Match"] = scrape_url.etag
+        if scrape_url.last_modified:
+            headers["If-Modified-Since"] = scrape_url.last_modified
+        return headers
+
+    async def _process(
+        self,
+        scrape_url: ScrapeUrl,
+        config: Optional[ScrapeConfig],
+        host: str,
+        policy: HostPolicy,
+    ) -> None:
+        outcome = ScrapeOutcome(
+            url_id=scrape_url.id,
+            job_id=scrape_url.job_id,
+            config_id=scrape_url.config_id,
+            status="failed",
+        )
+        reusable = self._can_reuse_previous(scrape_url, config)
+        try:
+            if policy.respect_robots:
+                rules = await self.robots.get(self._http_client, scrape_url.url)
+                self.hosts.set_crawl_delay(host, rules.crawl_delay())
+                if rules.unreachable:
+                    raise RobotsUnavailable()
+                if not rules.allowed(scrape_url.url):
+                    outcome.error = "Disallowed by robots.txt"
+                    outcome.retryable = False
+                    outcome.failure = self._failure(scrape_url, config, outcome)
+                    SCRAPE_FETCHES_TOTAL.labels("robots_disallowed").inc()
+                    SCRAPE_FAILURES_TOTAL.labels("dead_letter").inc()
+                    logger.info(
+                        "Skipping URL %s: disallowed by robots.txt", scrape_url.id
+                    )
+                    await self._outcomes.put(outcome)
+                    return
+            response = await self._http_client.get(
+                scrape_url.url,
+                headers=self._conditional_headers(scrape_url) if reusable else None,
+            )
+            if reusable and response.status_code == 304:
+                # El servidor confirma que no hay cambios: se conservan hash y
+                # validadores (salvo los que la respuesta 304 renueve)
+                outcome.changed = False
+                outcome.etag = response.headers.get("etag", scrape_url.etag)
+                outcome.last_modified = response.headers.get(
+                    "last-modified", scrape_url.last_modified
+                )
+                outcome.content_hash = scrape_url.content_hash
+                outcome.status = "success"
+                SCRAPE_FETCHES_TOTAL.labels("not_modified").inc()
+                await self._outcomes.put(outcome)
+                return
+            response.raise_for_status()
+            outcome.etag = response.headers.get("etag")
+            outcome.last_modified = response.headers.get("last-modified")
+            outcome.content_hash = hashlib.sha256(response.content).hexdigest()
+            if reusable and outcome.content_hash == scrape_url.content_hash:
+                outcome.changed = False
+            elif config is not None:
+                # Parseo y selectores en el pool de procesos (CPU fuera del loop)
+                outcome.fields = await extraction_executor.extract(
+                    config.id,
+                    config.updated_at,
+                    config.selectors,
+                    response.content,
+                    base_url=str(response.url),
+                )
+            if outcome.changed and settings.RESULT_STORE_HTML:
+                outcome.html_compressed = compress(response.content)
+                outcome.html_size = len(response.content)
+            outcome.status = "success"
+            SCRAPE_FETCHES_TOTAL.labels(
+                "changed" if outcome.changed else "same_hash"
+            ).inc()
+        except RobotsUnavailable:
+            outcome.error = "robots.txt unavailable"
+        except httpx.HTTPStatusError as e:
+            outcome.error = f"{type(e).__name__}: {e}"
+            outcome.retryable = is_retryable_status(e.response.status_code)
+            outcome.retry_after = retry_after_seconds(
+                e.response.headers.get("retry-after")
+            )
+        except httpx.HTTPError as e:
+            outcome.error = f"{type(e).__name__}: {e}"
+        except AppException as e:
+            # Selectores o extracción: repetir el fetch daría el mismo resultado
+            outcome.error = e.detail
+            outcome.retryable = False
+        except Exception as e:  # Un fallo inesperado no debe tumbar el worker
+            logger.error(
+                "Unexpected error processing URL %s: %s",
+                scrape_url.id,
+                e,
+                exc_info=True,
+            )
+            outcome.error = f"{type(e).__name__}: {e}"
+        if outcome.error:
+            outcome.failure = self._failure(scrape_url, config, outcome)
+            SCRAPE_FETCHES_TOTAL.labels("failed").inc()
+            SCRAPE_FAILURES_TOTAL.labels(outcome.failure.status).inc()
+            logger.warning(
+                "Scrape failed for URL %s (attempt %s, next: %s): %s",
+                scrape_url.id,
+                outcome.failure.attempts,
+                outcome.failure.next_attempt_at or outcome.failure.status,
+                outcome.error,
+            )
+        await self._outcomes.put(outcome)
+
+    @staticmethod
+    def _failure(
+        scrape_url: ScrapeUrl, config: Optional[ScrapeConfig], outcome: ScrapeOutcome
+    ) -> UrlFailure:
+        """
+        Destino de una URL fallida: otro intento con backoff exponencial (base
+        retry_interval de su config) mientras no supere max_retries y el fallo sea
+        recuperable; si no, 'dead_letter'.
+        """
+        attempts = scrape_url.attempts + 1
+        max_retries = settings.RETRY_DEFAULT_MAX_RETRIES
+        base = settings.RETRY_DEFAULT_INTERVAL
+        if config is not None:
+            if config.max_retries is not None:
+                max_retries = config.max_retries
+            if config.retry_interval is not None:
+                base = config.retry_interval.total_seconds()
+        if not outcome.retryable or attempts > max_retries:
+            return UrlFailure(
+                url_id=scrape_url.id,
+                status="dead_letter",
+                attempts=attempts,
+                error=outcome.error,
+            )
+        delay = backoff_delay(attempts, base=base)
+        if outcome.retry_after is not None:
+            delay = max(delay, outcome.retry_after)
+        return UrlFailure(
+            url_id=scrape_url.id,
+            status="retry",
+            attempts=attempts,
+            next_attempt_at=datetime.now(timezone.utc) + timedelta(seconds=delay),
+            error=outcome.error,
+        )
+
+    # --- Escritura de resultados ---
+
+    async def _writer_loop(self) -> None:
+        """Agrupa resultados y los escribe en una transacción por lote."""
+        finished = False
+        while not finished:
+            batch: List[ScrapeOutcome] = []
+            item = await self._outcomes.get()
+            if item is None:
+                break
+            batch.append(item)
+            deadline = (
+                asyncio.get_running_loop().time()
+                + settings.WORKER_RESULT_FLUSH_INTERVAL
+            )
+            while len(batch) < settings.WORKER_RESULT_BATCH_SIZE:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._outcomes.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    finished = True
+                    break
+                batch.append(item)
+            await self._write_batch(batch)
+
+    async def _write_batch(self, batch: List[ScrapeOutcome]) -> None:
+        """Resultados y transiciones de estado de todo el lote en una transacción."""
+        changed = [o for o in batch if o.status == "success" and o.changed]
+        unchanged = [o for o in batch if o.status == "success" and not o.changed]
+        failed = [o for o in batch if o.status != "success"]
+        try:
+            async with self.session_factory() as db:
+                async with unit_of_work(db):
+                    # Primero el histórico; scraped_data apunta a la fila recién creada
+                    result_keys = await scrape_result_repo.insert_many(
+                        db,
+                        [
+                            ScrapeResultCreate(
+                                url_id=o.url_id,
+                                job_id=o.job_id,
+                                fields=o.fields,
+                                content_hash=o.content_hash,
+                                html_compressed=o.html_compressed,
+                                html_size=o.html_size,
+                                compression=ZSTD if o.html_compressed else None,
+                            )
+                            for o in changed
+                        ],
+                    )
+                    await scraped_data_repo.upsert_many(
+                        db,
+                        [
+                            ScrapedDataCreate(
+                                url_id=o.url_id,
+                                job_id=o.job_id,
+                                raw_payload=o.fields,
+                                result_id=result_id,
+                                result_scraped_at=result_scraped_at,
+                            )
+                            for o, (result_id, result_scraped_at) in zip(
+                                changed, result_keys
+                            )
+                        ],
+                    )
+                    changed_closed = await url_repo.finish_urls(
+                        db,
+                        worker_id=self.worker_id,
+                        url_ids=[o.url_id for o in changed],
+                        status="success",
+                        validators={o.url_id: o.validators() for o in changed},
+                    )
+                    # Sin cambios: solo se actualizan validadores y last_scraped_at
+                    unchanged_closed = await url_repo.finish_urls(
+                        db,
+                        worker_id=self.worker_id,
+                        url_ids=[o.url_id for o in unchanged],
+                        status="success",
+                        validators={o.url_id: o.validators() for o in unchanged},
+                    )
+                    failed_jobs = await url_repo.fail_urls(
+                        db,
+                        worker_id=self.worker_id,
+                        failures=[o.failure for o in failed],
+                    )
+                    # Contadores en la misma transacción que cierra las URLs: cuando
+                    # el job pasa a un estado final, sus totales ya están escritos.
+                    # Solo cuentan las URLs cerradas por este worker (no las de
+                    # leases perdidos)
+                    deltas = job_counter_deltas(
+                        changed_jobs=[job_id for _, job_id in changed_closed],
+                        unchanged_jobs=[job_id for _, job_id in unchanged_closed],
+                        failed_jobs=failed_jobs,
+                    )
+                    await job_repo.increment_counters_many(db, deltas, commit=False)
+                    # Solo pueden terminar los jobs de las URLs que este lote cerró
+                    await job_repo.complete_finished(db, list(deltas), commit=False)
+        except AppException as e:
+            # Los leases vencerán y el reclaimer devolverá las URLs a la cola
+            logger.error("Could not write %s scrape results: %s", len(batch), e.detail)
+            return
+        except Exception as e:
+            # Un fallo inesperado (al obtener la conexión, al mapear los resultados)
+            # tampoco debe terminar el writer: los resultados se acumularían en la
+            # cola sin escribirse. Las URLs del lote vuelven con el reclaimer.
+            logger.error(
+                "Unexpected error writing %s scrape results: %s",
+                len(batch),
+                e,
+                exc_info=True,
+            )
+            return
+        # Agregados por campo solo de resultados con contenido nuevo (los extraídos)
+        # de URLs que este worker cerró, igual que los contadores del job
+        closed_ids = {url_id for url_id, _ in changed_closed}
+        for o in changed:
+            if o.url_id in closed_ids:
+                self.field_rollups.add(o.config_id, o.fields)
+
+    # --- Leases ---
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.WORKER_HEARTBEAT_INTERVAL)
+            # Diagnóstico periódico: el pool y la caché de selectores ya están en
+            # /metrics, así que en INFO solo añadiría ruido a cada latido
+            logger.debug("Extraction stats: %s", extraction_executor.stats())
+            logger.debug("DB pool status: %s", pool_status(async_engine))
+            logger.debug("Host scheduler stats: %s", self.hosts.stats())
+            # Las URLs que esperan turno de su host también conservan el lease
+            url_ids = list(self._in_flight) + [
+                scrape_url.id for scrape_url, _, _ in self.hosts.queued_items()
+            ]
+            if not url_ids:
+                continue
+            try:
+                async with self.session_factory() as db:
+                    await url_repo.renew_leases(
+                        db,
+                        worker_id=self.worker_id,
+                        url_ids=url_ids,
+                        lease_seconds=settings.WORKER_LEASE_SECONDS,
+                    )
+            except AppException as e:
+                logger.error("Lease heartbeat failed: %s", e.detail)
+
+    async def _reclaim_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.WORKER_RECLAIM_INTERVAL)
+            try:
+                async with self.session_factory() as db:
+                    await url_repo.reclaim_expired_leases(db)
+            except AppException as e:
+                logger.error("Lease reclaim failed: %s", e.detail)
+
+    # --- Histórico de resultados ---
+
+    async def _partition_maintenance_loop(self) -> None:
+        """Crea por adelantado las particiones mensuales y aplica la retención."""
+        while True:
+            try:
+                async with self.session_factory() as db:
+                    await scrape_result_repo.maintain_partitions(
+                        db,
+                        months_ahead=settings.RESULT_PARTITIONS_AHEAD,
+                        retention_months=settings.RESULT_RETENTION_MONTHS,
+                    )
+            except AppException as e:
+                logger.error("Scrape result partition maintenance failed: %s", e.detail)
+            await asyncio.sleep(settings.RESULT_PARTITION_MAINTENANCE_INTERVAL)
+
+    async def _drain(self) -> None:
+        """
+        Devuelve a la cola las URLs que no llegaron a empezar y espera a los fetches
+        en curso; cancela y devuelve también los que no acaben a tiempo.
+        """
+        queued = [scrape_url.id for scrape_url, _, _ in self.hosts.drain_queued()]
+        if queued:
+            await self._release_leases(queued)
+        if not self._in_flight:
+            return
+        pending_tasks = dict(self._in_flight)
+        logger.info("Draining %s in-flight fetches", len(pending_tasks))
+        _, not_done = await asyncio.wait(
+            pending_tasks.values(), timeout=settings.WORKER_DRAIN_TIMEOUT
+        )
+        if not not_done:
+            return
+        for task in not_done:
+            task.cancel()
+        await asyncio.gather(*not_done, return_exceptions=True)
+        abandoned = [
+            url_id for url_id, task in pending_tasks.items() if task in not_done
+        ]
+        await self._release_leases(abandoned)
+
+    async def _release_leases(self, url_ids: List[uuid.UUID]) -> None:
+        try:
+            async with self.session_factory() as db:
+                released = await url_repo.release_leases(
+                    db, worker_id=self.worker_id, url_ids=url_ids
+                )
+            logger.warning("Released %s unfinished URLs back to the queue", released)
+        except AppException as e:
+            logger.error("Could not release unfinished URLs: %s", e.detail)
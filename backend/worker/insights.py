@@ -0,0 +1,64 @@
+import argparse
+import asyncio
+import json
+import logging
+import uuid
+
+from application.services.insights import PROMPT_VERSION, InsightPipeline
+from infrastructure.config.logger import setup_logging
+from infrastructure.config.settings import settings
+from infrastructure.database.session import async_engine
+from infrastructure.llm.client import OpenAICompatibleBackend
+
+setup_logging()
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Analiza con un modelo de lenguaje los resultados de un job."
+    )
+    parser.add_argument("job_id", type=uuid.UUID, help="ID del ScrapingJob")
+    parser.add_argument(
+        "--model", default=settings.LLM_MODEL, help="Modelo (default: LLM_MODEL)"
+    )
+    parser.add_argument(
+        "--base-url",
+        default=settings.LLM_BASE_URL,
+        help="Endpoint compatible con OpenAI (default: LLM_BASE_URL)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.LLM_MAX_CONCURRENCY,
+        help="Peticiones simultáneas al modelo",
+    )
+    parser.add_argument(
+        "--token-budget",
+        type=int,
+        default=settings.LLM_PROMPT_TOKEN_BUDGET,
+        help="Tokens de entrada por petición",
+    )
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    backend = OpenAICompatibleBackend(base_url=args.base_url, model=args.model)
+    pipeline = InsightPipeline(
+        backend, concurrency=args.concurrency, token_budget=args.token_budget
+    )
+    logger.info(
+        "Analyzing job %s with %s (prompt %s)", args.job_id, args.model, PROMPT_VERSION
+    )
+    try:
+        stats = await pipeline.run_job(args.job_id)
+        print(json.dumps(stats.as_dict()))
+    finally:
+        await backend.aclose()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,372 @@
+import asyncio
+import heapq
+import logging
+import signal
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from application.schemas.url import UrlCreate
+from domain.exceptions import AppException
+from domain.models.schedule import ScrapingSchedule
+from infrastructure.config.logger import setup_logging
+from infrastructure.config.settings import settings
+from infrastructure.database.notifications import PgNotificationListener, pg_listener
+from infrastructure.database.repositories.job_repo import job_repo
+from infrastructure.database.repositories.schedule_repo import (
+    SCHEDULE_CHANGED_CHANNEL,
+    SCHEDULER_LEADER_LOCK,
+    schedule_repo,
+)
+from infrastructure.database.repositories.url_repo import url_repo
+from infrastructure.database.session import AsyncSessionFactory, async_engine
+from infrastructure.database.unit_of_work import unit_of_work
+from worker.engine import default_worker_id
+
+setup_logging()
+
+logger = logging.getLogger(__name__)
+
+
+class Scheduler:
+    """
+    Dispara las programaciones (ScrapingSchedule): en cada disparo crea un
+    ScrapingJob y encola sus URLs en bloque.
+
+    En lugar de recorrer todas las programaciones en cada tick, mantiene en memoria
+    un heap con el próximo disparo de cada una y duerme hasta el primero, hasta que
+    llega una notificación de cambio (SCHEDULE_CHANGED_CHANNEL) o hasta la
+    siguiente relectura completa; sin disparos cercanos el proceso no consume CPU.
+    Las entradas obsoletas del heap no se eliminan: se descartan al salir si no
+    coinciden con `_next`.
+
+    Varias réplicas pueden ejecutarse a la vez: solo la que obtiene el advisory
+    lock de sesión SCHEDULER_LEADER_LOCK actúa como líder, y las demás lo
+    reintentan cada SCHEDULER_LEADER_RETRY segundos. El lock se libera solo si la
+    conexión se cierra, así que la caída del líder no deja el puesto bloqueado.
+    Además, cada disparo se reclama con un compare-and-set sobre scheduled_at
+    (schedule_repo.claim_due), por lo que ni dos líderes momentáneos crean dos jobs
+    para el mismo disparo.
+    """
+
+    def __init__(
+        self,
+        *,
+        scheduler_id: Optional[str] = None,
+        max_concurrent_fires: int = settings.SCHEDULER_MAX_CONCURRENT_FIRES,
+        engine: AsyncEngine = async_engine,
+        session_factory=AsyncSessionFactory,
+        listener: PgNotificationListener = pg_listener,
+    ):
+        self.scheduler_id = scheduler_id or default_worker_id()
+        self.max_concurrent_fires = max_concurrent_fires
+        self.engine = engine
+        self.session_factory = session_factory
+        self.listener = listener
+        # Heap de (despertar, id) y, por id, (despertar, disparo a reclamar); un
+        # disparo None indica que hay que releer la fila antes de dispararla
+        self._heap: List[Tuple[datetime, uuid.UUID]] = []
+        self._next: Dict[uuid.UUID, Tuple[datetime, Optional[datetime]]] = {}
+        self._changed: Set[uuid.UUID] = set()
+        self._wakeup = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._leader_conn: Optional[AsyncConnection] = None
+
+    def stop(self) -> None:
+        if not self._stopping.is_set():
+            logger.info("Scheduler %s stopping", self.scheduler_id)
+            self._stopping.set()
+            self._wakeup.set()
+
+    def handle_change(self, channel: str, payload: str) -> None:
+        """Callback del listener LISTEN/NOTIFY: el payload es el ID de la programación."""
+        try:
+            self._changed.add(uuid.UUID(payload))
+        except ValueError:
+            logger.warning("Ignoring malformed schedule change payload: %s", payload)
+            return
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        self.listener.subscribe(SCHEDULE_CHANGED_CHANNEL, self.handle_change)
+        self.listener.start()
+        logger.info("Scheduler %s started", self.scheduler_id)
+        try:
+            while not self._stopping.is_set():
+                if not await self._acquire_leadership():
+                    await self._sleep(settings.SCHEDULER_LEADER_RETRY)
+                    continue
+                try:
+                    await self._lead()
+                finally:
+                    await self._release_leadership()
+        finally:
+            await self.listener.stop()
+            logger.info("Scheduler %s stopped", self.scheduler_id)
+
+    async def _sleep(self, seconds: float) -> None:
+        """Espera interrumpible por stop() o por una notificación de cambio."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    # --- Elección de líder ---
+
+    async def _acquire_leadership(self) -> bool:
+        """
+        Intenta tomar el advisory lock en una conexión dedicada (en autocommit, para
+        no dejar una transacción abierta) que se conserva mientras se es líder.
+        """
+        try:
+            conn = await self.engine.connect()
+        except (SQLAlchemyError, OSError) as e:
+            logger.error("Scheduler could not connect to elect a leader: %s", e)
+            return False
+        try:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            result = await conn.execute(
+                text("SELECT pg_try_advisory_lock(:key)"),
+                {"key": SCHEDULER_LEADER_LOCK},
+            )
+            acquired = bool(result.scalar())
+        except SQLAlchemyError as e:
+            logger.error("Scheduler leader election failed: %s", e)
+            await conn.invalidate()
+            await conn.close()
+            return False
+        if not acquired:
+            await conn.close()
+            return False
+        self._leader_conn = conn
+        logger.info("Scheduler %s is now the leader", self.scheduler_id)
+        return True
+
+    async def _check_leadership(self) -> bool:
+        """False si se perdió la conexión que mantiene el lock (y con ella el lock)."""
+        try:
+            await self._leader_conn.execute(text("SELECT 1"))
+            return True
+        except SQLAlchemyError as e:
+            logger.warning(
+                "Scheduler %s lost its leader connection: %s", self.scheduler_id, e
+            )
+            return False
+
+    async def _release_leadership(self) -> None:
+        conn, self._leader_conn = self._leader_conn, None
+        if conn is None:
+            return
+        try:
+            await conn.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": SCHEDULER_LEADER_LOCK}
+            )
+            await conn.close()
+        except SQLAlchemyError:
+            # Sin unlock la conexión no puede volver al pool con el lock tomado
+            await conn.invalidate()
+            await conn.close()
+        logger.info("Scheduler %s released leadership", self.scheduler_id)
+
+    # --- Heap de próximos disparos ---
+
+    def _schedule(
+        self,
+        schedule_id: uuid.UUID,
+        wake_at: datetime,
+        due_at: Optional[datetime] = None,
+    ) -> None:
+        self._next[schedule_id] = (wake_at, due_at)
+        heapq.heappush(self._heap, (wake_at, schedule_id))
+
+    def _pop_due(self, now: datetime) -> List[Tuple[uuid.UUID, Optional[datetime]]]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            wake_at, schedule_id = heapq.heappop(self._heap)
+            entry = self._next.get(schedule_id)
+            if entry is None or entry[0] != wake_at:
+                continue  # Entrada obsoleta: la programación cambió o se borró
+            del self._next[schedule_id]
+            due.append((schedule_id, entry[1]))
+        return due
+
+    def _seconds_until_next(self) -> float:
+        # Descarta las entradas obsoletas de la cabeza para no despertar por ellas
+        while self._heap:
+            wake_at, schedule_id = self._heap[0]
+            entry = self._next.get(schedule_id)
+            if entry is not None and entry[0] == wake_at:
+                delta = wake_at - datetime.now(timezone.utc)
+                return max(delta.total_seconds(), 0.0)
+            heapq.heappop(self._heap)
+        return float("inf")
+
+    async def _resync(self) -> None:
+        """Reconstruye el heap con los próximos disparos de todas las programaciones."""
+        async with self.session_factory() as db:
+            fire_times = await schedule_repo.get_fire_times(db)
+        self._changed.clear()
+        self._next = {
+            schedule_id: (fire_at, fire_at) for schedule_id, fire_at in fire_times
+        }
+        self._heap = [(fire_at, schedule_id) for schedule_id, fire_at in fire_times]
+        heapq.heapify(self._heap)
+        logger.info("Scheduler loaded %s active schedules", len(self._next))
+
+    async def _reload(self) -> None:
+        """Relee solo las programaciones notificadas como cambiadas."""
+        changed, self._changed = self._changed, set()
+        async with self.session_factory() as db:
+            fire_times = dict(await schedule_repo.get_fire_times(db, list(changed)))
+        for schedule_id in changed:
+            fire_at = fire_times.get(schedule_id)
+            if fire_at is None:
+                # Borrada, desactivada o ya procesada
+                self._next.pop(schedule_id, None)
+            else:
+                self._schedule(schedule_id, fire_at, fire_at)
+
+    async def _lead(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._heap, self._next = [], {}
+        next_resync = loop.time()  # Carga completa al asumir el liderazgo
+        next_check = loop.time() + settings.SCHEDULER_LEADER_CHECK_INTERVAL
+        while not self._stopping.is_set():
+            # Se limpia antes de leer _changed: una notificación posterior vuelve a
+            # despertar el bucle
+            self._wakeup.clear()
+            try:
+                if loop.time() >= next_resync:
+                    await self._resync()
+                    next_resync = loop.time() + settings.SCHEDULER_RESYNC_INTERVAL
+                elif self._changed:
+                    await self._reload()
+            except AppException as e:
+                logger.error("Scheduler could not load schedules: %s", e.detail)
+                # Los cambios pendientes se recuperan con una relectura completa
+                next_resync = loop.time() + settings.SCHEDULER_LEADER_RETRY
+            due = self._pop_due(datetime.now(timezone.utc))
+            if due:
+                await self._fire_all(due)
+                continue
+            if loop.time() >= next_check:
+                if not await self._check_leadership():
+                    return
+                next_check = loop.time() + settings.SCHEDULER_LEADER_CHECK_INTERVAL
+            now = loop.time()
+            await self._sleep(
+                min(self._seconds_until_next(), next_resync - now, next_check - now)
+            )
+
+    # --- Disparos ---
+
+    async def _fire_all(self, due: List[Tuple[uuid.UUID, Optional[datetime]]]) -> None:
+        semaphore = asyncio.Semaphore(self.max_concurrent_fires)
+
+        async def _bounded(schedule_id: uuid.UUID, due_at: datetime) -> None:
+            async with semaphore:
+                await self._fire(schedule_id, due_at)
+
+        tasks = []
+        for schedule_id, due_at in due:
+            if due_at is None:
+                self._changed.add(schedule_id)
+            else:
+                tasks.append(_bounded(schedule_id, due_at))
+        await asyncio.gather(*tasks)
+
+    async def _fire(self, schedule_id: uuid.UUID, due_at: datetime) -> None:
+        retry_at = datetime.now(timezone.utc) + timedelta(
+            seconds=settings.SCHEDULER_LEADER_RETRY
+        )
+        try:
+            async with self.session_factory() as db:
+                async with unit_of_work(db):
+                    schedule = await schedule_repo.claim_due(db, schedule_id, due_at)
+                    if schedule is not None:
+                        job_id, enqueued = await self._create_job(db, schedule)
+        except AppException as e:
+            logger.error("Could not fire schedule %s: %s", schedule_id, e.detail)
+            self._schedule(schedule_id, retry_at, due_at)
+            return
+        except Exception as e:
+            # Un disparo fallido no debe tumbar al resto del gather ni al líder
+            logger.error(
+                "Unexpected error firing schedule %s: %s", schedule_id, e, exc_info=True
+            )
+            self._schedule(schedule_id, retry_at, due_at)
+            return
+        if schedule is None:
+            # Ya reclamado, bloqueado o modificado: se relee más tarde (antes si
+            # llega la notificación del cambio)
+            self._schedule(schedule_id, retry_at)
+            return
+        logger.info(
+            "Schedule %s fired job %s with %s URLs (next fire: %s)",
+            schedule_id,
+            job_id,
+            enqueued,
+            None if schedule.is_processed else schedule.scheduled_at,
+        )
+        if not schedule.is_processed:
+            self._schedule(schedule_id, schedule.scheduled_at, schedule.scheduled_at)
+
+    async def _create_job(
+        self, db: AsyncSession, schedule: ScrapingSchedule
+    ) -> Tuple[uuid.UUID, int]:
+        """Crea el job del disparo y encola sus URLs; devuelve (job_id, URLs encoladas)."""
+        job = await job_repo.create(
+            db,
+            obj_in={
+                "schedule_id": schedule.id,
+                "status": "running",
+                "total_urls": len(schedule.urls),
+            },
+        )
+        if not schedule.urls:
+            result_count = 0
+        else:
+            result = await url_repo.create_bulk(
+                db,
+                objs_in=(
+                    UrlCreate(
+                        url=item["url"],
+                        priority=item.get("priority"),
+                        config_id=item.get("config_id") or schedule.config_id,
+                        job_id=job.id,
+                    )
+                    for item in schedule.urls
+                ),
+                count_in_jobs=False,
+                # Las URLs ya scrapeadas en disparos anteriores vuelven a la cola
+                requeue=True,
+            )
+            result_count = result.inserted
+        if result_count != len(schedule.urls):
+            update_data = {"total_urls": result_count}
+            if result_count == 0:
+                # Nada que scrapear (URLs aún en cola de un disparo anterior)
+                update_data.update(
+                    status="completed", finished_at=datetime.now(timezone.utc)
+                )
+            await job_repo.update(db, db_obj=job, obj_in=update_data)
+        return job.id, result_count
+
+
+async def main() -> None:
+    scheduler = Scheduler()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, scheduler.stop)
+    try:
+        await scheduler.run()
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())